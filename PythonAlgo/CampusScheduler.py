@@ -0,0 +1,242 @@
+import os
+import sys
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import List, Dict, Any, Tuple, Optional
+
+try:
+    from .PortfolioScheduler import ENGINES, solve_engine
+    from .GeneticScheduler import read_input
+    from .DayScheduler import DAYS, day_indices, clock_minutes, minutes_to_clock
+    from .RoomScheduler import is_room_suitable_for_course_dict
+    from .export import apply_output_mode
+    from .check import apply_post_check, check_schedules
+    from .Profiling import profile_run
+except ImportError:
+    from PortfolioScheduler import ENGINES, solve_engine
+    from GeneticScheduler import read_input
+    from DayScheduler import DAYS, day_indices, clock_minutes, minutes_to_clock
+    from RoomScheduler import is_room_suitable_for_course_dict
+    from export import apply_output_mode
+    from check import apply_post_check, check_schedules
+    from Profiling import profile_run
+
+
+# Extra solves a department gets when blocks committed meanwhile clash with its result
+DEFAULT_RETRIES = 2
+
+
+def _meetings(schedule: Dict[str, Any]) -> List[Tuple[Any, int, int, int]]:
+    """(room_id, day index, start, end) of every meeting and day of a schedule dict"""
+    blocks = []
+    for meeting in schedule.get("meetings") or [schedule]:
+        start, end = clock_minutes(meeting.get("start_time") or ""), clock_minutes(meeting.get("end_time") or "")
+        room_id = meeting.get("room_id", schedule.get("room_id"))
+        if start is None or end is None or room_id is None:
+            continue
+        for d in day_indices(meeting.get("day") or ""):
+            blocks.append((room_id, d, min(start, end), max(start, end)))
+    return blocks
+
+
+class RoomLedger:
+    """Room-time blocks committed by department solves.
+
+    Departments solve against snapshot() (passed as the payload's
+    "reservedRooms", which every engine prunes), then settle() their result:
+    meetings that clash with blocks committed in the meantime are moved to
+    another free suitable room at the same time, or left without a room.
+    """
+
+    def __init__(self, blocks: Optional[List[Dict[str, Any]]] = None):
+        # (room_id, day index) -> [(start, end, owner)]
+        self.blocks: Dict[Tuple[Any, int], List[Tuple[int, int, str]]] = {}
+        for block in blocks or []:
+            for room_id, d, start, end in _meetings(block):
+                self.blocks.setdefault((room_id, d), []).append((start, end, str(block.get("department", "reserved"))))
+
+    def free(self, room_id: Any, day: int, start: int, end: int) -> bool:
+        return all(e <= start or s >= end for s, e, _ in self.blocks.get((room_id, day), ()))
+
+    def clashes(self, schedules: List[Dict[str, Any]]) -> List[int]:
+        """Indices of schedules with a meeting in an already committed block"""
+        return [i for i, schedule in enumerate(schedules)
+                if not all(self.free(*block) for block in _meetings(schedule))]
+
+    def commit(self, owner: str, schedule: Dict[str, Any]) -> None:
+        for room_id, d, start, end in _meetings(schedule):
+            self.blocks.setdefault((room_id, d), []).append((start, end, owner))
+
+    def settle(self, owner: str, schedules: List[Dict[str, Any]], rooms: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """Commit a department's schedules; returns (meetings moved, meetings left without a room).
+
+        Schedules are updated in place when their room changes.
+        """
+        clashing = set(self.clashes(schedules))
+        for i, schedule in enumerate(schedules):
+            if i not in clashing:
+                self.commit(owner, schedule)
+        moved = unresolved = 0
+        for i in sorted(clashing):
+            schedule = schedules[i]
+            course = {"unit": schedule.get("unit", 3),
+                      "requires_lab": str(schedule.get("sessionType", "")).strip().lower() == "lab session"}
+            times = [(d, start, end) for _, d, start, end in _meetings(schedule)]
+            room = next((room for room in rooms if is_room_suitable_for_course_dict(room, course)
+                         and all(self.free(room.get("room_id"), d, start, end) for d, start, end in times)), None)
+            for meeting in schedule.get("meetings") or [schedule]:
+                meeting["room_id"] = room.get("room_id") if room is not None else None
+            if room is not None:
+                self.commit(owner, schedule)
+                moved += 1
+            else:
+                unresolved += 1
+        return moved, unresolved
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Committed blocks as "reservedRooms" records"""
+        return [
+            {"room_id": room_id, "day": DAYS[d], "start_time": minutes_to_clock(start),
+             "end_time": minutes_to_clock(end), "department": owner}
+            for (room_id, d), blocks in self.blocks.items() for start, end, owner in blocks
+        ]
+
+    def __len__(self) -> int:
+        return sum(len(blocks) for blocks in self.blocks.values())
+
+
+def _solve_department(engine: str, payload: Dict[str, Any], budget: float) -> Dict[str, Any]:
+    """Worker process: solve one department payload"""
+    # stdout carries only the campus result
+    sys.stdout = sys.stderr
+    return solve_engine(engine, payload, budget)
+
+
+def solve_campus(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Schedule several department payloads against one room ledger.
+
+    payload: "departments" (solver payloads; each may set "name" and
+    "engine", and inherits the campus "rooms"), "engine" (default cp_sat),
+    "timeLimitSec" per department (default 60), "workers" (parallel solves,
+    default one per department up to the CPU count), "retries" (default 2)
+    and "reservedRooms" (blocks already booked, e.g. other schedule groups).
+
+    Departments are solved in parallel, each against the ledger snapshot at
+    submission. A finished department whose rooms clash with blocks committed
+    since is solved again with a fresh snapshot, up to the retry limit; then
+    the clashing meetings are moved to another free room. Committed
+    departments never share a room-time block.
+    """
+    departments = payload.get("departments") or []
+    engine = str(payload.get("engine", "cp_sat")).lower()
+    budget = float(payload.get("timeLimitSec", 60))
+    retries = max(0, int(payload.get("retries", DEFAULT_RETRIES)))
+    workers = int(payload.get("workers", 0) or 0) or min(len(departments), os.cpu_count() or 1)
+    campus_rooms = payload.get("rooms") or []
+
+    names, payloads, engines = [], [], []
+    for i, department in enumerate(departments):
+        names.append(str(department.get("name") or department.get("department") or f"department_{i + 1}"))
+        payloads.append(dict(department, rooms=department.get("rooms") or campus_rooms))
+        engines.append(str(department.get("engine") or engine).lower())
+        if engines[-1] not in ENGINES:
+            raise ValueError(f"Unknown engine for {names[-1]}: {engines[-1]}")
+
+    start = time.time()
+    ledger = RoomLedger(payload.get("reservedRooms"))
+    attempts = [0] * len(departments)
+    # Last successful result per department, kept in case a retry fails
+    previous: List[Optional[Dict[str, Any]]] = [None] * len(departments)
+    report: List[Dict[str, Any]] = [{} for _ in departments]
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as pool:
+        def submit(i: int):
+            attempts[i] += 1
+            return pool.submit(_solve_department, engines[i], dict(payloads[i], reservedRooms=ledger.snapshot()), budget)
+
+        running = {submit(i): i for i in range(len(departments))}
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                i = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {"success": False, "message": f"{names[i]} error: {e}", "schedules": [], "errors": [str(e)]}
+                if not result.get("success") and previous[i] is not None:
+                    print(f"Campus: {names[i]} retry failed, settling its previous result", file=sys.stderr)
+                    result = previous[i]
+                schedules = result.get("schedules") or []
+                if result.get("success") and result is not previous[i] and ledger.clashes(schedules) \
+                        and attempts[i] <= retries:
+                    print(f"Campus: {names[i]} clashes with newer bookings, re-solving", file=sys.stderr)
+                    previous[i] = result
+                    running[submit(i)] = i
+                    continue
+                moved, unresolved = ledger.settle(names[i], schedules, payloads[i]["rooms"]) if result.get("success") else (0, 0)
+                for schedule in schedules:
+                    schedule["department"] = names[i]
+                report[i] = {
+                    "name": names[i],
+                    "engine": engines[i],
+                    "success": bool(result.get("success")),
+                    "message": result.get("message", ""),
+                    "attempts": attempts[i],
+                    "rooms_moved": moved,
+                    "rooms_unresolved": unresolved,
+                    "elapsed_sec": round(time.time() - start, 2),
+                    "schedules": schedules,
+                }
+                print(f"Campus: {names[i]} committed after {time.time() - start:.1f}s "
+                      f"({len(schedules)} sessions, {moved} moved, {unresolved} without room)", file=sys.stderr)
+
+    combined = [schedule for department in report for schedule in department["schedules"]]
+    own_pairs = sum(check_schedules(department["schedules"])["room"]["pairs"] for department in report
+                    if department["schedules"])
+    solved = sum(1 for department in report if department["success"])
+    return {
+        "success": solved == len(departments) and solved > 0,
+        "message": f"Scheduled {solved} of {len(departments)} departments",
+        "schedules": combined,
+        "departments": report,
+        "ledger": {
+            "blocks": len(ledger),
+            "cross_department_room_conflicts": (check_schedules(combined)["room"]["pairs"] - own_pairs) if combined else 0,
+            "elapsed_sec": round(time.time() - start, 2),
+        },
+    }
+
+
+def main() -> None:
+    try:
+        payload = read_input()
+        if not payload:
+            print(json.dumps({"success": False, "message": "Empty input"}))
+            return
+        if not payload.get("departments"):
+            print(json.dumps({
+                "success": False,
+                "message": "Missing departments",
+                "schedules": [],
+                "errors": ["Invalid input"]
+            }))
+            return
+
+        with profile_run(payload, "campus") as profiler:
+            result = solve_campus(payload)
+        result = apply_post_check(profiler.attach(result), payload.get("check"), payload.get("rooms"))
+        result = apply_output_mode(result, payload)
+        print(json.dumps(result), flush=True)
+
+    except Exception as e:
+        error_result = {
+            "success": False,
+            "message": f"Campus error: {str(e)}",
+            "schedules": [],
+            "errors": [str(e)]
+        }
+        print(json.dumps(error_result), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,9 @@
-from typing import List, Dict, Any, Iterable
+import re
+import sys
+import json
+from functools import lru_cache
+from itertools import combinations
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 
 
 # Canonical day ordering used across the project
@@ -11,6 +16,29 @@ DAYS: List[str] = [
     "Saturday",
 ]
 
+# Compact labels per canonical day (MWF, TTh, MThF)
+DAY_ABBREVIATIONS: Dict[str, str] = {
+    "Monday": "M",
+    "Tuesday": "T",
+    "Wednesday": "W",
+    "Thursday": "Th",
+    "Friday": "F",
+    "Saturday": "Sat",
+}
+
+_DAY_ALIASES: Dict[str, str] = {
+    "m": "Monday", "mon": "Monday", "monday": "Monday",
+    "t": "Tuesday", "tue": "Tuesday", "tues": "Tuesday", "tuesday": "Tuesday",
+    "w": "Wednesday", "wed": "Wednesday", "wednesday": "Wednesday",
+    "th": "Thursday", "thu": "Thursday", "thur": "Thursday", "thurs": "Thursday", "thursday": "Thursday",
+    "f": "Friday", "fri": "Friday", "friday": "Friday",
+    "s": "Saturday", "sat": "Saturday", "saturday": "Saturday",
+}
+
+_DAY_INDEX: Dict[str, int] = {d: i for i, d in enumerate(DAYS)}
+
+_DAY_TOKEN = re.compile(r"(mon|tue|wed|thu|fri|sat)", re.IGNORECASE)
+
 
 def all_days() -> List[str]:
     """Return the canonical ordered list of days (Mon-Sat)."""
@@ -33,16 +61,21 @@ def normalize_day(day: str) -> str:
     if not isinstance(day, str):
         return day
 
-    trimmed = day.strip().lower()
-    mapping = {
-        "m": "Monday", "mon": "Monday", "monday": "Monday",
-        "t": "Tuesday", "tue": "Tuesday", "tues": "Tuesday", "tuesday": "Tuesday",
-        "w": "Wednesday", "wed": "Wednesday", "wednesday": "Wednesday",
-        "th": "Thursday", "thu": "Thursday", "thur": "Thursday", "thurs": "Thursday", "thursday": "Thursday",
-        "f": "Friday", "fri": "Friday", "friday": "Friday",
-        "s": "Saturday", "sat": "Saturday", "saturday": "Saturday",
-    }
-    return mapping.get(trimmed, day.strip())
+    return _DAY_ALIASES.get(day.strip().lower(), day.strip())
+
+
+def split_combined_days(day: str) -> List[str]:
+    """Split a combined day string such as "MonWed", "Mon/Thu" or "Tuesday" into
+    canonical day names in weekly order (mirrors DayScheduler::splitCombinedDays
+    in PHP). Single unrecognized values are returned unchanged."""
+    if not isinstance(day, str) or not day.strip():
+        return []
+    nd = normalize_day(day)
+    if nd in DAYS:
+        return [nd]
+    found = {normalize_day(token) for token in _DAY_TOKEN.findall(day)}
+    days = [d for d in DAYS if d in found]
+    return days or [day.strip()]
 
 
 def day_index(day: str) -> int:
@@ -68,12 +101,8 @@ def sort_by_day_then_time(schedules: List[Dict[str, Any]]) -> List[Dict[str, Any
     def sort_key(item: Dict[str, Any]):
         day_val = item.get("day", "")
         time_val = item.get("start_time", "00:00:00")
-        nd = normalize_day(day_val)
-        try:
-            d_idx = DAYS.index(nd)
-        except ValueError:
-            d_idx = 999  # unknown days last
-        return (d_idx, str(time_val))
+        # unknown days last
+        return (_DAY_INDEX.get(normalize_day(day_val), 999), str(time_val))
 
     return sorted(schedules, key=sort_key)
 
@@ -90,7 +119,7 @@ def group_by_day(schedules: Iterable[Dict[str, Any]]) -> Dict[str, List[Dict[str
             continue
     # Ensure each bucket is sorted by time for consistency
     for d in DAYS:
-        grouped[d] = sort_by_day_then_time(grouped[d])
+        grouped[d].sort(key=lambda item: str(item.get("start_time", "00:00:00")))
     return grouped
 
 
@@ -99,19 +128,8 @@ def to_compact_day_label(days: Iterable[str]) -> str:
 
     Ordering follows canonical Mon-Sat. Duplicates ignored. Unknown days skipped.
     """
-    abbrev_map = {
-        "Monday": "M",
-        "Tuesday": "T",
-        "Wednesday": "W",
-        "Thursday": "Th",
-        "Friday": "F",
-        "Saturday": "Sat",
-    }
-    seen = []
-    for d in DAYS:
-        if any(normalize_day(x) == d for x in days):
-            seen.append(abbrev_map[d])
-    return "".join(seen)
+    present = {normalize_day(x) for x in days}
+    return "".join(DAY_ABBREVIATIONS[d] for d in DAYS if d in present)
 
 
 def preferred_two_day_patterns() -> List[List[str]]:
@@ -126,6 +144,37 @@ def preferred_two_day_patterns() -> List[List[str]]:
     ]
 
 
+@lru_cache(maxsize=None)
+def day_indices(day: str) -> Tuple[int, ...]:
+    """Canonical day indices (0=Mon) of a single or combined day string; () if unrecognized.
+
+    Cached, so each distinct day string in a schedule is parsed once.
+    """
+    return tuple(_DAY_INDEX[d] for d in split_combined_days(day) if d in _DAY_INDEX)
+
+
+@lru_cache(maxsize=None)
+def clock_minutes(value: str) -> Optional[int]:
+    """Minutes since midnight of "HH:MM" or "HH:MM:SS"; None if malformed."""
+    try:
+        parts = str(value).split(":")
+        return int(parts[0]) * 60 + int(parts[1])
+    except (ValueError, IndexError):
+        return None
+
+
+def minutes_to_clock(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}:00"
+
+
+def schedule_section(schedule: Dict[str, Any]) -> str:
+    """Section of a schedule dict: "section", else "<year_level> <block>"."""
+    section = schedule.get("section")
+    if section:
+        return str(section)
+    return f"{schedule.get('year_level', '')} {schedule.get('block', '')}".strip()
+
+
 def choose_days_for_sessions(num_sessions: int) -> List[str]:
     """Suggest days for the given number of sessions, preferring spread across the week."""
     if num_sessions <= 0:
@@ -148,16 +197,206 @@ def choose_days_for_sessions(num_sessions: int) -> List[str]:
     return result
 
 
+@lru_cache(maxsize=None)
+def meeting_patterns(num_sessions: int) -> Tuple[Tuple[str, ...], ...]:
+    """Acceptable day patterns for a course meeting num_sessions times a week, best first.
+
+    Patterns use distinct days with at least one free day between meetings
+    (any distinct days from four sessions up). They are led by
+    preferred_two_day_patterns() for two sessions and choose_days_for_sessions()
+    otherwise. Empty for one session or more sessions than days.
+    """
+    if num_sessions < 2 or num_sessions > len(DAYS):
+        return ()
+    gap = min(2, len(DAYS) // num_sessions)
+    spread = [tuple(DAYS[i] for i in combo) for combo in combinations(range(len(DAYS)), num_sessions)
+              if all(b - a >= gap for a, b in zip(combo, combo[1:]))]
+    if num_sessions == 2:
+        lead = [tuple(days) for days in preferred_two_day_patterns()]
+    else:
+        lead = [tuple(choose_days_for_sessions(num_sessions))]
+    lead = [days for days in lead if days in spread]
+    return tuple(lead) + tuple(days for days in spread if days not in lead)
+
+
+# ----------------------------------------------------------------------
+# Bulk timetable views
+# ----------------------------------------------------------------------
+
+VIEW_KINDS = ("section", "instructor", "room")
+
+
+def iter_meetings(schedules: Iterable[Dict[str, Any]]
+                  ) -> Iterator[Tuple[int, int, int, int, int, Dict[str, Any], Dict[str, Any]]]:
+    """Yield (schedule index, meeting index, day index, start minute, end minute,
+    schedule, meeting) for every meeting and day of every schedule.
+
+    A schedule is one meeting itself or carries a "meetings" list; combined
+    days ("MonWed") yield one tuple per day. Meetings without times or with
+    unrecognized days are skipped; reversed times are swapped.
+    """
+    for index, schedule in enumerate(schedules):
+        for m, meeting in enumerate(schedule.get("meetings") or [schedule]):
+            start = clock_minutes(meeting.get("start_time") or "")
+            end = clock_minutes(meeting.get("end_time") or "")
+            if start is None or end is None:
+                continue
+            if start > end:
+                start, end = end, start
+            for d in day_indices(meeting.get("day") or ""):
+                yield index, m, d, start, end, schedule, meeting
+
+
+def _view_key(kind: str, schedule: Dict[str, Any], meeting: Dict[str, Any]) -> Any:
+    if kind == "section":
+        return schedule_section(schedule)
+    if kind == "instructor":
+        return schedule.get("instructor") or schedule.get("instructor_name") or ""
+    return meeting.get("room_id", schedule.get("room_id"))
+
+
+def index_timetable(schedules: List[Dict[str, Any]], kinds: Iterable[str] = VIEW_KINDS
+                    ) -> Dict[str, Dict[Any, List[List[Tuple[int, int, int, int]]]]]:
+    """One pass over the schedules: per view kind and key, six day buckets of
+    (start minute, end minute, schedule index, meeting index) sorted by time.
+
+    Only integers are stored; the schedule dicts are not copied.
+    """
+    kinds = tuple(kinds)
+    for kind in kinds:
+        if kind not in VIEW_KINDS:
+            raise ValueError(f"Unknown timetable view: {kind}")
+    index: Dict[str, Dict[Any, List[List[Tuple[int, int, int, int]]]]] = {kind: {} for kind in kinds}
+    for s, m, d, start, end, schedule, meeting in iter_meetings(schedules):
+        for kind in kinds:
+            key = _view_key(kind, schedule, meeting)
+            grid = index[kind].get(key)
+            if grid is None:
+                grid = index[kind][key] = [[] for _ in DAYS]
+            grid[d].append((start, end, s, m))
+    for grids in index.values():
+        for grid in grids.values():
+            for bucket in grid:
+                bucket.sort()
+    return index
+
+
+def _cell(schedule: Dict[str, Any], meeting: Dict[str, Any], start: int, end: int, s: int) -> Dict[str, Any]:
+    return {
+        "schedule": s,
+        "subject_code": schedule.get("subject_code", ""),
+        "section": schedule_section(schedule),
+        "instructor": schedule.get("instructor") or schedule.get("instructor_name") or "",
+        "room_id": meeting.get("room_id", schedule.get("room_id")),
+        "start_time": minutes_to_clock(start),
+        "end_time": minutes_to_clock(end),
+    }
+
+
+def iter_timetable_views(schedules: List[Dict[str, Any]],
+                         kinds: Iterable[str] = VIEW_KINDS) -> Iterator[Dict[str, Any]]:
+    """Weekly grids per section, instructor and room, one view at a time.
+
+    Each view is {"view", "key", "days": {day: [cells]}, "patterns",
+    "weekly_minutes"}. Cells are sorted by start time; patterns merge the
+    same subject, section, instructor, room and time across days into a
+    compact label ("MWF 08:00-09:30"). Views are built lazily from the
+    integer index, so only the view being consumed is materialized.
+    """
+    index = index_timetable(schedules, kinds)
+    for kind, grids in index.items():
+        for key, grid in grids.items():
+            days: Dict[str, List[Dict[str, Any]]] = {}
+            patterns: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+            weekly = 0
+            for d, bucket in enumerate(grid):
+                cells = []
+                for start, end, s, m in bucket:
+                    schedule = schedules[s]
+                    meeting = (schedule.get("meetings") or [schedule])[m]
+                    cell = _cell(schedule, meeting, start, end, s)
+                    cells.append(cell)
+                    weekly += end - start
+                    signature = (cell["subject_code"], cell["section"], cell["instructor"], cell["room_id"], start, end)
+                    pattern = patterns.get(signature)
+                    if pattern is None:
+                        pattern = patterns[signature] = dict(cell, days=[])
+                        del pattern["schedule"]
+                    if DAYS[d] not in pattern["days"]:
+                        pattern["days"].append(DAYS[d])
+                if cells:
+                    days[DAYS[d]] = cells
+            labelled = []
+            for pattern in patterns.values():
+                pattern["label"] = (f"{to_compact_day_label(pattern['days'])} "
+                                    f"{pattern['start_time'][:5]}-{pattern['end_time'][:5]}")
+                labelled.append(pattern)
+            labelled.sort(key=lambda p: (_DAY_INDEX[p["days"][0]], p["start_time"]))
+            yield {"view": kind, "key": key, "days": days, "patterns": labelled, "weekly_minutes": weekly}
+
+
+def write_timetable_views(schedules: List[Dict[str, Any]], out=None, kinds: Iterable[str] = VIEW_KINDS) -> int:
+    """Write iter_timetable_views as JSON Lines (one view per line); returns the view count."""
+    out = out or sys.stdout
+    count = 0
+    for view in iter_timetable_views(schedules, kinds):
+        out.write(json.dumps(view))
+        out.write("\n")
+        count += 1
+    out.flush()
+    return count
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """python -m PythonAlgo.DayScheduler [--views section,instructor,room] [file]
+
+    Reads a schedule list or {"schedules": [...]} (a solver result or stored
+    schedule) and streams its timetable views as JSON Lines.
+    """
+    import argparse
+    parser = argparse.ArgumentParser(prog="python -m PythonAlgo.DayScheduler", description="Build timetable views")
+    parser.add_argument("file", nargs="?", help="JSON input (default: stdin)")
+    parser.add_argument("--views", default=",".join(VIEW_KINDS), help="comma-separated view kinds")
+    args = parser.parse_args(argv)
+    try:
+        if args.file:
+            with open(args.file) as handle:
+                data = json.load(handle)
+        else:
+            raw = sys.stdin.read()
+            data = json.loads(raw) if raw else []
+        schedules = data if isinstance(data, list) else data.get("schedules", [])
+        write_timetable_views(schedules, kinds=[k.strip() for k in args.views.split(",") if k.strip()])
+    except Exception as e:
+        print(json.dumps({"success": False, "message": f"Timetable view error: {e}", "errors": [str(e)]}), flush=True)
+
+
 __all__ = [
     "DAYS",
+    "DAY_ABBREVIATIONS",
+    "VIEW_KINDS",
     "all_days",
     "is_valid_day",
     "normalize_day",
+    "split_combined_days",
     "day_index",
+    "day_indices",
+    "clock_minutes",
+    "minutes_to_clock",
+    "schedule_section",
     "next_day",
     "sort_by_day_then_time",
     "group_by_day",
     "to_compact_day_label",
     "preferred_two_day_patterns",
     "choose_days_for_sessions",
+    "meeting_patterns",
+    "iter_meetings",
+    "index_timetable",
+    "iter_timetable_views",
+    "write_timetable_views",
 ]
+
+
+if __name__ == "__main__":
+    main()
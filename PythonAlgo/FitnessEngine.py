@@ -0,0 +1,718 @@
+import numpy as np
+from typing import List, Dict, Any, Tuple, Optional
+from collections import defaultdict
+
+try:
+    from .DayScheduler import DAYS
+except ImportError:
+    from DayScheduler import DAYS
+
+
+# Time resolution of the occupancy tensor. All generated slots start on the
+# hour or half hour, so 10-minute buckets keep overlap detection exact.
+BUCKET_MINUTES = 10
+BUCKETS_PER_DAY = 24 * 60 // BUCKET_MINUTES
+
+# Lunch break window (12:00 PM - 12:59 PM) in minutes since midnight
+LUNCH_START_MIN = 12 * 60
+LUNCH_END_MIN = 12 * 60 + 59
+
+# Penalty per conflict found by detect_conflicts()
+CONFLICT_WEIGHTS: Dict[str, int] = {
+    'instructor_conflicts': 200,      # Instructor double-booking
+    'room_conflicts': 200,            # Room double-booking
+    'student_conflicts': 400,         # Same section at same time
+    'cross_section_conflicts': 300,   # Same subject at same time
+    'section_time_overlaps': 500,     # Same section with overlapping times
+    'lunch_break_violations': 300,    # Lunch break violations
+    'employment_violations': 100,     # Wrong time slots for employment type
+    'capacity_violations': 50,        # Room capacity issues
+}
+
+# Conflicts that make a schedule unusable as-is
+HARD_CONFLICT_KEYS: Tuple[str, ...] = (
+    'instructor_conflicts',
+    'room_conflicts',
+    'student_conflicts',
+    'cross_section_conflicts',
+    'section_time_overlaps',
+    'lunch_break_violations',
+)
+
+# Weights for the schedule quality metrics
+PENALTY_WEIGHTS: Dict[str, int] = {
+    'time_distribution': 20,
+    'instructor_load': 30,
+    'room_utilization': 15,
+    'meeting_pattern': 25,
+    'units_coverage': 100,
+}
+
+# Fitness bonus when every required session is present
+COMPLETE_SCHEDULE_BONUS = 100
+
+
+def estimated_students(units: int) -> int:
+    """Estimate enrolment from course units (same heuristic as RoomScheduler)."""
+    return min(50, max(20, units * 10))
+
+
+def time_to_minutes(time_str: str) -> int:
+    parts = time_str.split(':')
+    return int(parts[0]) * 60 + int(parts[1])
+
+
+class OccupancyFitnessEngine:
+    """Vectorized conflict and penalty evaluation for GeneticScheduler individuals.
+
+    A schedule is projected onto resource x day x time-bucket occupancy counts
+    for instructors, sections and rooms. Overlapping pairs are then counted in
+    one pass per resource kind: two intervals overlap iff one starts while the
+    other is running, so pairs = sum over entries of (occupancy at own start -
+    entries starting in the same bucket) + same-start pairs.
+    """
+
+    def __init__(self, courses: List[Any], rooms: List[Any], instructors: List[Any],
+                 required_sessions: int = 0):
+        self.courses = courses
+        self.rooms = rooms
+        self.instructors = instructors
+        self.required_sessions = required_sessions
+
+        self.day_index: Dict[str, int] = {d: i for i, d in enumerate(DAYS)}
+        self.room_index: Dict[Any, int] = {}
+        self.room_capacity: List[int] = []
+        for room in rooms:
+            self._intern_room(room)
+        self.instructor_index: Dict[Any, int] = {
+            ins.instructor_id: i for i, ins in enumerate(instructors)
+        }
+        self.section_index: Dict[str, int] = {}
+        self.code_index: Dict[str, int] = {}
+
+        # Per course object: (course code index, units, employment code, estimated students)
+        self._course_rows: Dict[int, Tuple[int, int, int, int]] = {}
+        for course in courses:
+            self._course_row(course)
+        self.course_code_idx = np.array(
+            [self.code_index[c.course_code] for c in courses], dtype=np.int64)
+        self.course_units = np.array([c.units for c in courses], dtype=np.float64)
+        # Units of the first course carrying each code (meeting pattern penalty)
+        self.code_units = np.zeros(len(self.code_index), dtype=np.int64)
+        for course in reversed(courses):
+            self.code_units[self.code_index[course.course_code]] = course.units
+        # Required units of every course carrying each code (units coverage penalty)
+        self.code_course_units: Dict[int, List[int]] = defaultdict(list)
+        for course in courses:
+            self.code_course_units[self.code_index[course.course_code]].append(course.units)
+
+        # Interval table: (start, end) strings -> interval id with start/end minutes
+        self._interval_ids: Dict[Tuple[str, str], int] = {}
+        self._iv_start: List[int] = []
+        self._iv_end: List[int] = []
+        self._slot_geometry: Dict[Tuple[str, str, str], Tuple[int, int, int, bool]] = {}
+
+        # Room blocks booked outside this schedule: (room, day, start bucket, end bucket)
+        self.reserved: List[Tuple[int, int, int, int]] = []
+        self._reserved_pairs = 0
+
+    def set_reservations(self, blocks: List[Tuple[Any, int, int, int]]) -> None:
+        """Treat (room_id, day index, start minute, end minute) blocks as occupied.
+
+        Entries overlapping a block count as room conflicts, so repair and
+        free placement steer away from them. Blocks on unknown rooms are ignored.
+        """
+        self.reserved = []
+        for room_id, day, start, end in blocks:
+            room = self.room_index.get(room_id)
+            if room is not None:
+                self.reserved.append((room, day) + _buckets(start, end))
+        self._reserved_pairs = self.overlap_pairs(self._reserved_columns(), 'room') if self.reserved else 0
+
+    def _reserved_columns(self) -> Dict[str, np.ndarray]:
+        cols = np.array(self.reserved, dtype=np.int64).reshape(len(self.reserved), 4).T
+        return {'room': cols[0], 'day': cols[1], 'start_bucket': cols[2], 'end_bucket': cols[3]}
+
+    # ------------------------------------------------------------------
+    # Interning helpers
+    # ------------------------------------------------------------------
+    def _intern_room(self, room: Any) -> int:
+        idx = self.room_index.get(room.room_id)
+        if idx is None:
+            idx = len(self.room_index)
+            self.room_index[room.room_id] = idx
+            self.room_capacity.append(getattr(room, 'capacity', 30))
+        return idx
+
+    def _course_row(self, course: Any) -> Tuple[int, int, int, int]:
+        row = self._course_rows.get(id(course))
+        if row is None:
+            code = self.code_index.setdefault(course.course_code, len(self.code_index))
+            emp = {'FULL-TIME': 0, 'PART-TIME': 1}.get(course.employment_type, 2)
+            row = (code, course.units, emp, estimated_students(course.units))
+            self._course_rows[id(course)] = row
+        return row
+
+    def _interval(self, start: str, end: str) -> int:
+        key = (start, end)
+        iv = self._interval_ids.get(key)
+        if iv is None:
+            iv = len(self._iv_start)
+            start_min = time_to_minutes(start)
+            end_min = time_to_minutes(end)
+            self._interval_ids[key] = iv
+            self._iv_start.append(start_min)
+            self._iv_end.append(end_min)
+        return iv
+
+    # ------------------------------------------------------------------
+    # Encoding
+    # ------------------------------------------------------------------
+    def gene_row(self, entry: Any) -> Tuple[int, ...]:
+        """Intern one schedule entry as (day, interval, instructor, section, room,
+        code, employment, evening, students); missing instructor/room map to -1."""
+        ts = entry.time_slot
+        course_row = self._course_rows.get(id(entry.course))
+        if course_row is None:
+            course_row = self._course_row(entry.course)
+        code, _, emp, students = course_row
+        day = self.day_index.get(ts.day)
+        if day is None:
+            day = self.day_index[ts.day] = len(self.day_index)
+        section = self.section_index.get(entry.section)
+        if section is None:
+            section = self.section_index[entry.section] = len(self.section_index)
+        instructor = -1
+        if entry.instructor is not None:
+            instructor = self.instructor_index.get(entry.instructor.instructor_id)
+            if instructor is None:
+                instructor = self.instructor_index[entry.instructor.instructor_id] = len(self.instructor_index)
+        room = -1
+        if entry.room is not None:
+            room = self.room_index.get(entry.room.room_id)
+            if room is None:
+                room = self._intern_room(entry.room)
+        iv = self._interval_ids.get((ts.start_time, ts.end_time))
+        if iv is None:
+            iv = self._interval(ts.start_time, ts.end_time)
+        return (day, iv, instructor, section, room, code, emp,
+                1 if ts.period == 'evening' else 0, students)
+
+    def interval_minutes(self, iv: int) -> Tuple[int, int]:
+        return self._iv_start[iv], self._iv_end[iv]
+
+    def slot_geometry(self, time_slot: Any) -> Tuple[int, int, int, bool]:
+        """(day, start bucket, end bucket, touches lunch) of a time slot, memoized."""
+        key = (time_slot.day, time_slot.start_time, time_slot.end_time)
+        geometry = self._slot_geometry.get(key)
+        if geometry is None:
+            day = self.day_index.get(time_slot.day)
+            if day is None:
+                day = self.day_index[time_slot.day] = len(self.day_index)
+            start, end = self.interval_minutes(self._interval(time_slot.start_time, time_slot.end_time))
+            sb, eb = _buckets(start, end)
+            geometry = (day, sb, eb, not (end <= LUNCH_START_MIN or start >= LUNCH_END_MIN))
+            self._slot_geometry[key] = geometry
+        return geometry
+
+    def encode(self, individual: List[Any]) -> Dict[str, np.ndarray]:
+        """Project an individual onto interned integer columns."""
+        gene_row = self.gene_row
+        rows = [gene_row(entry) for entry in individual]
+        n = len(rows)
+        cols = np.array(rows, dtype=np.int64).reshape(n, 9).T
+        iv = cols[1]
+        start = np.asarray(self._iv_start, dtype=np.int64)[iv]
+        end = np.asarray(self._iv_end, dtype=np.int64)[iv]
+        sb = np.clip(start // BUCKET_MINUTES, 0, BUCKETS_PER_DAY - 1)
+        eb = np.maximum(np.minimum(-(-end // BUCKET_MINUTES), BUCKETS_PER_DAY), sb)
+        return {
+            'day': cols[0], 'interval': iv, 'instructor': cols[2], 'section': cols[3],
+            'room': cols[4], 'code': cols[5], 'employment': cols[6], 'evening': cols[7],
+            'students': cols[8], 'start': start, 'end': end, 'start_bucket': sb, 'end_bucket': eb,
+        }
+
+    # ------------------------------------------------------------------
+    # Vectorized evaluation
+    # ------------------------------------------------------------------
+    def overlap_pairs(self, enc: Dict[str, np.ndarray], resource: str) -> int:
+        """Count overlapping same-day interval pairs sharing a resource.
+
+        The occupancy of row (resource, day) at bucket b is the cumulative
+        count of starts <= b minus ends <= b. It is only needed at each
+        entry's own start bucket, so the cumulative counts are sampled with
+        searchsorted over the sorted start/end keys instead of materializing
+        the full resource x day x bucket tensor.
+        """
+        res = enc[resource]
+        keep = (res >= 0) & (enc['end_bucket'] > enc['start_bucket'])
+        if np.count_nonzero(keep) < 2:
+            return 0
+        width = BUCKETS_PER_DAY + 1
+        base = (res[keep] * len(self.day_index) + enc['day'][keep]) * width
+        start_keys = base + enc['start_bucket'][keep]
+        sorted_starts = np.sort(start_keys)
+        sorted_ends = np.sort(base + enc['end_bucket'][keep])
+        row_begin = np.searchsorted(sorted_starts, base, 'left')
+        started_before = np.searchsorted(sorted_starts, start_keys, 'left') - row_begin
+        ended_by = (np.searchsorted(sorted_ends, start_keys, 'right')
+                    - np.searchsorted(sorted_ends, base, 'left'))
+        running = started_before - ended_by
+        same_start = np.unique(sorted_starts, return_counts=True)[1]
+        return int(running.sum() + (same_start * (same_start - 1) // 2).sum())
+
+    def _composite_key(self, enc: Dict[str, np.ndarray], *columns: str) -> np.ndarray:
+        """Fold several interned columns into one int64 key per entry."""
+        key = np.zeros(len(enc['day']), dtype=np.int64)
+        for column in columns:
+            values = enc[column]
+            key = key * (int(values.max()) + 1) + values
+        return key
+
+    def detect_conflicts(self, enc: Dict[str, np.ndarray]) -> Dict[str, int]:
+        n = len(enc['day'])
+        conflicts = {key: 0 for key in CONFLICT_WEIGHTS}
+        if n == 0:
+            return conflicts
+
+        conflicts['instructor_conflicts'] = self.overlap_pairs(enc, 'instructor')
+        if self.reserved:
+            # Pairs among the reserved blocks themselves are not this schedule's
+            reserved = self._reserved_columns()
+            combined = {key: np.concatenate([enc[key], reserved[key]]) for key in reserved}
+            conflicts['room_conflicts'] = self.overlap_pairs(combined, 'room') - self._reserved_pairs
+        else:
+            conflicts['room_conflicts'] = self.overlap_pairs(enc, 'room')
+        conflicts['section_time_overlaps'] = self.overlap_pairs(enc, 'section')
+
+        # Same section booked twice into the identical time slot
+        section_slots = np.unique(self._composite_key(enc, 'section', 'day', 'interval'))
+        conflicts['student_conflicts'] = int(n - len(section_slots))
+
+        # Same subject at the same time in more than one section
+        subject_slots, group, sizes = np.unique(self._composite_key(enc, 'code', 'day', 'interval'),
+                                                return_inverse=True, return_counts=True)
+        if (sizes > 1).any():
+            group = group.reshape(-1)
+            pairs = np.unique(group * (int(enc['section'].max()) + 1) + enc['section'])
+            distinct_sections = np.bincount(pairs // (int(enc['section'].max()) + 1),
+                                            minlength=len(subject_slots))
+            conflicts['cross_section_conflicts'] = int((sizes - 1)[distinct_sections > 1].sum())
+
+        start, end = enc['start'], enc['end']
+        lunch = ~((end <= LUNCH_START_MIN) | (start >= LUNCH_END_MIN))
+        conflicts['lunch_break_violations'] = int(lunch.sum())
+
+        emp, evening = enc['employment'], enc['evening']
+        conflicts['employment_violations'] = int((((emp == 1) & (evening == 0)) |
+                                                  ((emp == 0) & (evening == 1))).sum())
+
+        room = enc['room']
+        has_room = room >= 0
+        if has_room.any():
+            capacity = np.asarray(self.room_capacity, dtype=np.int64)[room[has_room]]
+            conflicts['capacity_violations'] = int((capacity < enc['students'][has_room]).sum())
+        return conflicts
+
+    def quality_penalties(self, enc: Dict[str, np.ndarray]) -> Dict[str, float]:
+        n = len(enc['day'])
+        penalties = {key: 0.0 for key in PENALTY_WEIGHTS}
+        if n == 0:
+            penalties['units_coverage'] = 1000.0  # High penalty for empty schedule
+            return penalties
+
+        # Lower day-count variance = worse spread across the week
+        day_counts = np.bincount(enc['day'])
+        day_counts = day_counts[day_counts > 0]
+        penalties['time_distribution'] = float(max(0.0, 10 - day_counts.var()))
+
+        loads = np.bincount(enc['instructor'][enc['instructor'] >= 0])
+        loads = loads[loads > 0]
+        if len(loads) > 1:
+            penalties['instructor_load'] = float(loads.var())
+
+        room = enc['room'][enc['room'] >= 0]
+        usage = np.bincount(room)
+        usage = usage[usage > 0]
+        if len(usage) > 1 and self.rooms:
+            expected = usage.sum() / len(self.rooms)
+            penalties['room_utilization'] = float(np.abs(usage - expected).sum())
+
+        n_codes = len(self.code_index)
+        code = enc['code']
+        per_code = np.bincount(code, minlength=n_codes)
+        code_days = np.unique(code * len(self.day_index) + enc['day'])
+        days_per_code = np.bincount(code_days // len(self.day_index), minlength=n_codes)
+        first_units = np.zeros(n_codes, dtype=np.int64)
+        first_units[:len(self.code_units)] = self.code_units
+        single = (per_code == 1) & (first_units > 2)
+        same_day = (per_code > 1) & (days_per_code == 1)
+        penalties['meeting_pattern'] = float((first_units[single] * 5).sum() + (per_code[same_day] * 3).sum())
+
+        hours = np.bincount(code, weights=(enc['end'] - enc['start']) / 60.0, minlength=n_codes)
+        if len(self.courses):
+            actual = hours[self.course_code_idx]
+            penalties['units_coverage'] = float((np.abs(actual - self.course_units) * 10).sum())
+        return penalties
+
+    def evaluate(self, individual: List[Any]) -> Tuple[float, Dict[str, int], Dict[str, float]]:
+        """Return (fitness, conflicts, penalties) for an individual (lower fitness is better)."""
+        enc = self.encode(individual)
+        conflicts = self.detect_conflicts(enc)
+        penalties = self.quality_penalties(enc)
+        fitness = float(sum(conflicts[k] * w for k, w in CONFLICT_WEIGHTS.items()))
+        fitness += sum(penalties[k] * w for k, w in PENALTY_WEIGHTS.items())
+        if len(individual) == self.required_sessions:
+            fitness -= COMPLETE_SCHEDULE_BONUS
+        return fitness, conflicts, penalties
+
+
+# Gene tuple layout used by FitnessState
+_DAY, _IV, _INSTRUCTOR, _SECTION, _ROOM, _CODE, _EMP, _EVENING, _STUDENTS, _START, _END, _SB, _EB = range(13)
+_RESOURCES = ((_INSTRUCTOR, 'instructor_conflicts'), (_ROOM, 'room_conflicts'), (_SECTION, 'section_time_overlaps'))
+_ROW_WIDTH = BUCKETS_PER_DAY + 1
+
+
+class FitnessState:
+    """Incremental fitness bookkeeping for one individual.
+
+    Holds the individual's entries with per (resource, day) occupancy and
+    start counts plus running conflict and penalty totals. A single-gene move
+    is scored by removing the gene's old contribution and adding the new one,
+    which touches only the rows of the gene's instructor, section and room.
+    """
+
+    def __init__(self, engine: OccupancyFitnessEngine, individual: Optional[List[Any]] = None):
+        self.engine = engine
+        self.entries: List[Any] = []
+        self.genes: List[Tuple[int, ...]] = []
+        # Per resource kind: (resource, day) -> offset into flat occupancy/start lists
+        self.row_offsets: List[Dict[Tuple[int, int], int]] = [{}, {}, {}]
+        self.occupancy: List[List[int]] = [[], [], []]
+        self.starts: List[List[int]] = [[], [], []]
+        # Per resource kind: (resource, day) -> bitmask of occupied buckets
+        self.busy: List[Dict[Tuple[int, int], int]] = [{}, {}, {}]
+        self.conflicts: Dict[str, int] = {key: 0 for key in CONFLICT_WEIGHTS}
+        self.section_slots: Dict[Tuple[int, int, int], int] = defaultdict(int)
+        self.subject_slots: Dict[Tuple[int, int, int], Dict[int, int]] = defaultdict(dict)
+        self.day_counts: Dict[int, int] = defaultdict(int)
+        self.instructor_loads: Dict[int, int] = defaultdict(int)
+        self.room_usage: Dict[int, int] = defaultdict(int)
+        self.code_days: Dict[int, Dict[int, int]] = defaultdict(dict)
+        self.code_count: Dict[int, int] = defaultdict(int)
+        self.code_distinct_days: Dict[int, int] = defaultdict(int)
+        self.code_minutes: Dict[int, int] = defaultdict(int)
+        # [non-zero count, sum, sum of squares] for O(1) variance updates
+        self.day_stats = [0, 0, 0]
+        self.instructor_stats = [0, 0, 0]
+        self.meeting_pattern = 0.0
+        self.units_coverage = 0.0
+        # Moves scored on this state (a deterministic work count)
+        self.moves = 0
+        for units in engine.code_course_units.values():
+            self.units_coverage += sum(units) * 10
+        # Reserved room blocks occupy their rows without being entries
+        for room, day, sb, eb in engine.reserved:
+            block = [0] * (_EB + 1)
+            block[_ROOM], block[_DAY], block[_SB], block[_EB] = room, day, sb, eb
+            self._occupy(1, tuple(block), _ROOM, 1)
+        if individual is not None:
+            for entry in individual:
+                self.add_entry(entry)
+
+    def copy(self) -> 'FitnessState':
+        clone = FitnessState.__new__(FitnessState)
+        clone.engine = self.engine
+        clone.entries = self.entries[:]
+        clone.genes = self.genes[:]
+        clone.row_offsets = [offsets.copy() for offsets in self.row_offsets]
+        clone.occupancy = [occ[:] for occ in self.occupancy]
+        clone.starts = [starts[:] for starts in self.starts]
+        clone.busy = [busy.copy() for busy in self.busy]
+        clone.conflicts = self.conflicts.copy()
+        clone.section_slots = self.section_slots.copy()
+        clone.subject_slots = defaultdict(dict, {k: v.copy() for k, v in self.subject_slots.items()})
+        clone.day_counts = self.day_counts.copy()
+        clone.instructor_loads = self.instructor_loads.copy()
+        clone.room_usage = self.room_usage.copy()
+        clone.code_days = defaultdict(dict, {k: v.copy() for k, v in self.code_days.items()})
+        clone.code_count = self.code_count.copy()
+        clone.code_distinct_days = self.code_distinct_days.copy()
+        clone.code_minutes = self.code_minutes.copy()
+        clone.day_stats = self.day_stats[:]
+        clone.instructor_stats = self.instructor_stats[:]
+        clone.meeting_pattern = self.meeting_pattern
+        clone.units_coverage = self.units_coverage
+        clone.moves = self.moves
+        return clone
+
+    # ------------------------------------------------------------------
+    # Scoring
+    # ------------------------------------------------------------------
+    def penalties(self) -> Dict[str, float]:
+        penalties = {key: 0.0 for key in PENALTY_WEIGHTS}
+        if not self.genes:
+            penalties['units_coverage'] = 1000.0
+            return penalties
+        penalties['time_distribution'] = max(0.0, 10 - _variance(self.day_stats))
+        if self.instructor_stats[0] > 1:
+            penalties['instructor_load'] = _variance(self.instructor_stats)
+        usage = [c for c in self.room_usage.values() if c > 0]
+        if len(usage) > 1 and self.engine.rooms:
+            expected = sum(usage) / len(self.engine.rooms)
+            penalties['room_utilization'] = sum(abs(u - expected) for u in usage)
+        penalties['meeting_pattern'] = self.meeting_pattern
+        penalties['units_coverage'] = self.units_coverage
+        return penalties
+
+    def fitness(self) -> float:
+        fitness = float(sum(self.conflicts[k] * w for k, w in CONFLICT_WEIGHTS.items()))
+        penalties = self.penalties()
+        fitness += sum(penalties[k] * w for k, w in PENALTY_WEIGHTS.items())
+        if len(self.genes) == self.engine.required_sessions:
+            fitness -= COMPLETE_SCHEDULE_BONUS
+        return fitness
+
+    def hard_conflicts(self) -> int:
+        return sum(self.conflicts[k] for k in HARD_CONFLICT_KEYS)
+
+    # ------------------------------------------------------------------
+    # Moves
+    # ------------------------------------------------------------------
+    def add_entry(self, entry: Any) -> None:
+        self.entries.append(entry)
+        self.genes.append(self._gene(entry))
+        self._add(len(self.genes) - 1)
+
+    def remove_entry(self, g: int) -> Any:
+        self._remove(g)
+        del self.genes[g]
+        return self.entries.pop(g)
+
+    def move(self, g: int, entry: Any) -> float:
+        """Replace gene g with a new entry and return the resulting fitness."""
+        self.moves += 1
+        self._remove(g)
+        self.entries[g] = entry
+        self.genes[g] = self._gene(entry)
+        self._add(g)
+        return self.fitness()
+
+    def gene_conflicts(self, g: int) -> int:
+        """Hard conflicts gene g takes part in."""
+        gene = self.genes[g]
+        total = 0
+        for kind, (col, _) in enumerate(_RESOURCES):
+            total += self._overlaps(kind, gene, col) - (1 if gene[_EB] > gene[_SB] and gene[col] >= 0 else 0)
+        if self.section_slots[(gene[_SECTION], gene[_DAY], gene[_IV])] > 1:
+            total += 1
+        if _cross_section(self.subject_slots[(gene[_CODE], gene[_DAY], gene[_IV])]):
+            total += 1
+        if _is_lunch(gene):
+            total += 1
+        return total
+
+    def conflicting_genes(self) -> List[int]:
+        return [g for g in range(len(self.genes)) if self.gene_conflicts(g) > 0]
+
+    def free_placement(self, g: int, slots: List[Any], rooms: List[Any], offset: int = 0) -> Optional[Tuple[Any, Any]]:
+        """First (time slot, room) from slots, scanned cyclically from offset, where
+        gene g's instructor and section and the room are idle and lunch is clear.
+
+        Each candidate is an O(1) bitmask test against the busy masks, so the
+        scan is linear in the candidate count and independent of schedule size.
+        The gene's current room is preferred when it is free.
+        """
+        if not slots:
+            return None
+        gene = self.genes[g]
+        entry = self.entries[g]
+        room_ids = [self.engine.room_index.get(room.room_id, -1) for room in rooms]
+        current_room = gene[_ROOM]
+        instructor_busy, room_busy, section_busy = self.busy
+        self._remove(g)
+        try:
+            n = len(slots)
+            for k in range(n):
+                slot = slots[(offset + k) % n]
+                day, sb, eb, lunch = self.engine.slot_geometry(slot)
+                if lunch or eb <= sb:
+                    continue
+                mask = ((1 << (eb - sb)) - 1) << sb
+                if gene[_INSTRUCTOR] >= 0 and instructor_busy.get((gene[_INSTRUCTOR], day), 0) & mask:
+                    continue
+                if section_busy.get((gene[_SECTION], day), 0) & mask:
+                    continue
+                if current_room >= 0 and not room_busy.get((current_room, day), 0) & mask:
+                    return slot, entry.room
+                for room, room_id in zip(rooms, room_ids):
+                    if room_id >= 0 and not room_busy.get((room_id, day), 0) & mask:
+                        return slot, room
+            return None
+        finally:
+            self._add(g)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _gene(self, entry: Any) -> Tuple[int, ...]:
+        row = self.engine.gene_row(entry)
+        start, end = self.engine.interval_minutes(row[_IV])
+        return row + (start, end) + _buckets(start, end)
+
+    def _row(self, kind: int, key: Tuple[int, int]) -> int:
+        offset = self.row_offsets[kind].get(key)
+        if offset is None:
+            offset = len(self.occupancy[kind])
+            self.row_offsets[kind][key] = offset
+            self.occupancy[kind].extend([0] * _ROW_WIDTH)
+            self.starts[kind].extend([0] * _ROW_WIDTH)
+        return offset
+
+    def _overlaps(self, kind: int, gene: Tuple[int, ...], col: int) -> int:
+        """Entries in the gene's row overlapping its interval (itself included if present)."""
+        if gene[col] < 0 or gene[_EB] <= gene[_SB]:
+            return 0
+        offset = self.row_offsets[kind].get((gene[col], gene[_DAY]))
+        if offset is None:
+            return 0
+        sb, eb = offset + gene[_SB], offset + gene[_EB]
+        return self.occupancy[kind][sb] + sum(self.starts[kind][sb + 1:eb])
+
+    def _occupy(self, kind: int, gene: Tuple[int, ...], col: int, delta: int) -> None:
+        if gene[col] < 0 or gene[_EB] <= gene[_SB]:
+            return
+        key = (gene[col], gene[_DAY])
+        offset = self._row(kind, key)
+        occ = self.occupancy[kind]
+        # Buckets whose count crosses zero flip their busy bit
+        edge = 1 if delta > 0 else 0
+        flipped = 0
+        for b in range(offset + gene[_SB], offset + gene[_EB]):
+            occ[b] += delta
+            if occ[b] == edge:
+                flipped |= 1 << (b - offset)
+        self.starts[kind][offset + gene[_SB]] += delta
+        if flipped:
+            busy = self.busy[kind]
+            busy[key] = busy.get(key, 0) ^ flipped
+
+    def _code_terms(self, code: int) -> Tuple[float, float]:
+        """(meeting pattern, units coverage) contribution of one course code."""
+        count = self.code_count.get(code, 0)
+        pattern = 0.0
+        units = self.engine.code_units[code] if code < len(self.engine.code_units) else 0
+        if count == 1 and units > 2:
+            pattern = units * 5
+        elif count > 1 and self.code_distinct_days[code] == 1:
+            pattern = count * 3
+        hours = self.code_minutes.get(code, 0) / 60.0
+        coverage = sum(abs(hours - u) * 10 for u in self.engine.code_course_units.get(code, ()))
+        return pattern, coverage
+
+    def _apply(self, g: int, sign: int) -> None:
+        gene = self.genes[g]
+        day, iv, code, section = gene[_DAY], gene[_IV], gene[_CODE], gene[_SECTION]
+        conflicts = self.conflicts
+
+        for kind, (col, key) in enumerate(_RESOURCES):
+            if sign > 0:
+                conflicts[key] += self._overlaps(kind, gene, col)
+                self._occupy(kind, gene, col, 1)
+            else:
+                self._occupy(kind, gene, col, -1)
+                conflicts[key] -= self._overlaps(kind, gene, col)
+
+        slot_key = (section, day, iv)
+        if sign > 0:
+            if self.section_slots[slot_key] >= 1:
+                conflicts['student_conflicts'] += 1
+            self.section_slots[slot_key] += 1
+        else:
+            self.section_slots[slot_key] -= 1
+            if self.section_slots[slot_key] >= 1:
+                conflicts['student_conflicts'] -= 1
+
+        group = self.subject_slots[(code, day, iv)]
+        before = _cross_section(group)
+        group[section] = group.get(section, 0) + sign
+        conflicts['cross_section_conflicts'] += _cross_section(group) - before
+
+        if _is_lunch(gene):
+            conflicts['lunch_break_violations'] += sign
+        emp, evening = gene[_EMP], gene[_EVENING]
+        if (emp == 1 and not evening) or (emp == 0 and evening):
+            conflicts['employment_violations'] += sign
+        room = gene[_ROOM]
+        if room >= 0 and self.engine.room_capacity[room] < gene[_STUDENTS]:
+            conflicts['capacity_violations'] += sign
+
+        self.day_counts[day] += sign
+        _tally(self.day_stats, self.day_counts[day] - sign, self.day_counts[day])
+        if gene[_INSTRUCTOR] >= 0:
+            self.instructor_loads[gene[_INSTRUCTOR]] += sign
+            load = self.instructor_loads[gene[_INSTRUCTOR]]
+            _tally(self.instructor_stats, load - sign, load)
+        if room >= 0:
+            self.room_usage[room] += sign
+
+        pattern_before, coverage_before = self._code_terms(code)
+        days = self.code_days[code]
+        before = days.get(day, 0)
+        days[day] = before + sign
+        if before == 0 or days[day] == 0:
+            self.code_distinct_days[code] += sign
+        self.code_count[code] += sign
+        self.code_minutes[code] += sign * (gene[_END] - gene[_START])
+        pattern_after, coverage_after = self._code_terms(code)
+        self.meeting_pattern += pattern_after - pattern_before
+        self.units_coverage += coverage_after - coverage_before
+
+    def _add(self, g: int) -> None:
+        self._apply(g, 1)
+
+    def _remove(self, g: int) -> None:
+        self._apply(g, -1)
+
+
+def _buckets(start: int, end: int) -> Tuple[int, int]:
+    """[start bucket, end bucket) covering minutes [start, end) within one day."""
+    sb = min(max(start // BUCKET_MINUTES, 0), BUCKETS_PER_DAY - 1)
+    eb = max(min(-(-end // BUCKET_MINUTES), BUCKETS_PER_DAY), sb)
+    return sb, eb
+
+
+def _tally(stats: List[int], old: int, new: int) -> None:
+    """Move one value from old to new in [non-zero count, sum, sum of squares]."""
+    if old > 0:
+        stats[0] -= 1
+        stats[1] -= old
+        stats[2] -= old * old
+    if new > 0:
+        stats[0] += 1
+        stats[1] += new
+        stats[2] += new * new
+
+
+def _variance(stats: List[int]) -> float:
+    """Population variance of the non-zero values tallied in stats."""
+    count, total, squares = stats
+    if count == 0:
+        return 0.0
+    mean = total / count
+    return max(0.0, squares / count - mean * mean)
+
+
+def _cross_section(group: Dict[int, int]) -> int:
+    """Cross-section conflicts in one (subject, day, interval) group."""
+    size = 0
+    sections = 0
+    for count in group.values():
+        if count > 0:
+            size += count
+            sections += 1
+    return size - 1 if sections > 1 else 0
+
+
+def _is_lunch(gene: Tuple[int, ...]) -> bool:
+    return not (gene[_END] <= LUNCH_START_MIN or gene[_START] >= LUNCH_END_MIN)
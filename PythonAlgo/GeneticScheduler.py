@@ -1,12 +1,46 @@
+import os
 import sys
 import json
+import time
 import random
-import math
 import numpy as np
-from typing import List, Dict, Any, Tuple, Set
+from typing import List, Dict, Any, Tuple, Optional, Callable
 from datetime import datetime, timedelta
-from dataclasses import dataclass
-from collections import defaultdict
+from dataclasses import dataclass, replace
+from collections import defaultdict, OrderedDict
+
+try:
+    from .FitnessEngine import OccupancyFitnessEngine, FitnessState, HARD_CONFLICT_KEYS
+except ImportError:
+    from FitnessEngine import OccupancyFitnessEngine, FitnessState, HARD_CONFLICT_KEYS
+try:
+    from .Telemetry import PhaseTimer, open_sink, population_stats
+except ImportError:
+    from Telemetry import PhaseTimer, open_sink, population_stats
+try:
+    from .OperatorSelection import OperatorBandit
+except ImportError:
+    from OperatorSelection import OperatorBandit
+try:
+    from .export import apply_output_mode
+    from .check import apply_post_check
+    from .Profiling import profile_run
+except ImportError:
+    from export import apply_output_mode
+    from check import apply_post_check
+    from Profiling import profile_run
+try:
+    from .ProblemInstance import ProblemInstance, compile_instance
+except ImportError:
+    from ProblemInstance import ProblemInstance, compile_instance
+try:
+    from .RoomScheduler import RoomCompatibility
+except ImportError:
+    from RoomScheduler import RoomCompatibility
+try:
+    from .Termination import Progress, build_termination, scaled_population_size
+except ImportError:
+    from Termination import Progress, build_termination, scaled_population_size
 
 @dataclass
 class TimeSlot:
@@ -51,11 +85,49 @@ class ScheduleEntry:
     time_slot: TimeSlot
     section: str
 
+@dataclass
+class CourseCandidates:
+    """Per-course sampling tables built once by GeneticScheduler.build_candidate_index"""
+    instructor: Instructor
+    section: str
+    slots: List[TimeSlot]      # Employment-filtered base slots
+    rooms: List[Room]          # Suitable rooms, usage-balanced order
+    sessions: Dict[int, Tuple[List[TimeSlot], List[int]]]  # minutes -> (session slots, cumulative weights)
+    durations: List[float]     # Session hours from generate_randomized_sessions
+
+class Individual(list):
+    """Schedule entries carrying the FitnessState that scores them.
+
+    The state is shared by copies and treated as read-only once attached;
+    operators work on state.copy() and wrap the result in a new Individual.
+    """
+    genome_key = None  # Memoized GeneticScheduler.genome_key()
+
+    def __init__(self, state: FitnessState):
+        super().__init__(state.entries)
+        self.state = state
+
+    def copy(self) -> 'Individual':
+        clone = Individual(self.state)
+        clone.genome_key = self.genome_key
+        return clone
+
 class GeneticScheduler:
-    def __init__(self, courses: List[Course], rooms: List[Room], instructors: List[Instructor]):
+    def __init__(self, courses: List[Course], rooms: List[Room], instructors: List[Instructor],
+                 instance: Optional[ProblemInstance] = None):
         self.courses = courses
         self.rooms = rooms
         self.instructors = instructors
+        # Compiled payload (ProblemInstance); courses[i] and rooms[i] are its
+        # course and room i, so slot, room and session tables come from it
+        self.instance = instance
+        self.course_index = {id(course): i for i, course in enumerate(courses)} if instance is not None else {}
+        # Room suitability per (course type, room) and room equivalence classes
+        if instance is not None and len(rooms) == len(instance.rooms):
+            self.room_compatibility = instance.room_compatibility
+        else:
+            self.room_compatibility = RoomCompatibility(rooms, [(course.units, course.requires_lab) for course in courses])
+        self.room_position = {id(room): r for r, room in enumerate(rooms)}
         self.time_slots = self.generate_time_slots()
         self.sections = self.generate_sections()
         
@@ -72,14 +144,86 @@ class GeneticScheduler:
         self.convergence_threshold = 0.001
         self.stagnation_limit = 10  # Reduced stagnation limit
         
+        # Process-parallel evolution (ParallelGenetic) when workers > 1
+        self.workers = 1
+        self.seed = None
+        
+        # Island model: sub-populations in separate processes exchanging their
+        # best individuals every migration_interval generations
+        self.islands = 1
+        self.migration_interval = 5
+        self.migration_size = 2
+        self.migration_topology = 'ring'
+        
+        # Termination: payload "termination" policies (Termination.build_termination);
+        # without them evolve runs `generations` within max_runtime seconds.
+        # population_scaling sizes the population from the budget and the
+        # measured cost of one offspring.
+        self.max_runtime = 45
+        self.termination_config = None
+        self.population_scaling = False
+        
+        # Search engine: 'ga', or 'tabu' / 'annealing' for the single-solution
+        # LocalSearch on the same fitness model (options in local_search_config)
+        self.search_engine = 'ga'
+        self.local_search_config = None
+        
+        # Individuals (e.g. CP-SAT solutions) placed in the initial population
+        self.seed_individuals: List[List[ScheduleEntry]] = []
+        
+        # Optional NDJSON telemetry sink (Telemetry.TelemetrySink) and the
+        # per-phase timer feeding it
+        self.telemetry = None
+        self.timer = PhaseTimer()
+        self.duplicates_replaced = 0
+        
+        # Mutation operator registry and the bandit choosing among them
+        # (OperatorSelection); operator_bandit.adaptive=False selects uniformly
+        self.mutation_operators: Dict[str, Callable[[FitnessState], Any]] = {
+            'time': self.mutate_time,
+            'room': self.mutate_room,
+            'swap_time': self.mutate_swap_time,
+            'swap_room': self.mutate_swap_room,
+            'add_session': self.mutate_add_session,
+            'remove_session': self.mutate_remove_session,
+            'relocate_conflict': self.mutate_relocate_conflict,
+        }
+        self.operator_bandit = OperatorBandit(list(self.mutation_operators))
+        
+        # Repair: passes over conflicting sessions and candidate moves tried per session
+        self.max_repair_passes = 3
+        self.repair_candidates = 24
+        
         # Conflict tracking
         self.conflict_history = []
         self.best_fitness_history = []
         
+        # Vectorized conflict/penalty evaluation (fitness hot path)
+        if instance is not None:
+            required_sessions = len(instance.session_hours)
+        else:
+            required_sessions = sum(self.calculate_required_sessions(course.units, course.employment_type)
+                                    for course in self.courses)
+        self.fitness_engine = OccupancyFitnessEngine(courses, rooms, instructors, required_sessions)
+        if instance is not None and instance.reserved_rooms:
+            self.fitness_engine.set_reservations(instance.reserved_rooms)
+        
+        # Bounded LRU fitness cache keyed by genome hash
+        self.fitness_cache_size = 4096
+        self.fitness_cache: "OrderedDict[int, float]" = OrderedDict()
+        self.fitness_cache_hits = 0
+        self.fitness_cache_misses = 0
+        
+        # Slot/room/instructor lookup tables for create_individual, mutate and repair
+        self.build_candidate_index()
+        
     def generate_time_slots(self) -> List[TimeSlot]:
         """Generate time slots using shared TimeScheduler for consistency"""
-        from .TimeScheduler import generate_comprehensive_time_slots
-        slots = generate_comprehensive_time_slots()
+        if self.instance is not None:
+            slots = self.instance.time_slots
+        else:
+            from .TimeScheduler import generate_comprehensive_time_slots
+            slots = generate_comprehensive_time_slots()
         return [TimeSlot(day=s['day'], start_time=s['start'], end_time=s['end'], period=s['period']) for s in slots]
     
     def generate_sections(self) -> List[str]:
@@ -91,11 +235,98 @@ class GeneticScheduler:
                 sections.append(section_code)
         return sections
     
+    def build_candidate_index(self) -> None:
+        """Precompute slot, room and instructor tables so hot loops only sample.
+
+        Must be called again if time_slots, rooms or instructors are replaced.
+        """
+        self.instructor_by_id = {i.instructor_id: i for i in self.instructors}
+        self.instructor_by_name: Dict[str, Instructor] = {}
+        for instructor in self.instructors:
+            self.instructor_by_name.setdefault(instructor.name, instructor)
+        
+        self.slot_minutes = {}
+        for slot in self.time_slots:
+            key = (slot.start_time, slot.end_time)
+            if key not in self.slot_minutes:
+                self.slot_minutes[key] = self.time_to_minutes(slot.end_time) - self.time_to_minutes(slot.start_time)
+        
+        # Tables are shared by courses with the same slot/room requirements
+        self._slots_by_employment: Dict[str, List[TimeSlot]] = {}
+        self._rooms_by_type: Dict[Tuple[bool, int], List[Room]] = {}
+        self._session_tables: Dict[str, Dict[int, Tuple[List[TimeSlot], List[int]]]] = {}
+        self.course_candidates: Dict[int, CourseCandidates] = {}
+        for course in self.courses:
+            for hours in self.candidates_for(course).durations:
+                self.session_slots(course, int(round(hours * 60)))
+    
+    def candidates_for(self, course: Course) -> CourseCandidates:
+        """Sampling tables for a course (built on first use)"""
+        candidates = self.course_candidates.get(id(course))
+        if candidates is None:
+            employment = course.employment_type
+            if employment not in self._slots_by_employment:
+                self._slots_by_employment[employment] = self.filter_time_slots(course)
+                self._session_tables[employment] = {}
+            room_key = (bool(course.requires_lab), course.units)
+            if room_key not in self._rooms_by_type:
+                self._rooms_by_type[room_key] = self.filter_rooms(course)
+            candidates = CourseCandidates(
+                instructor=self.get_instructor_by_name(course.instructor_name),
+                section=f"{course.department}-{course.year_level} {course.block}",
+                slots=self._slots_by_employment[employment],
+                rooms=self._rooms_by_type[room_key],
+                sessions=self._session_tables[employment],
+                durations=self.course_durations(course)
+            )
+            self.course_candidates[id(course)] = candidates
+        return candidates
+    
+    def session_slots(self, course: Course, minutes: int) -> Tuple[List[TimeSlot], List[int]]:
+        """Session-length slots starting at each base slot long enough to hold them.
+
+        Weights favour days with fewer fitting slots (int(10 / (slots on day + 1)));
+        an empty weight list means uniform sampling.
+        """
+        candidates = self.candidates_for(course)
+        table = candidates.sessions.get(minutes)
+        if table is None:
+            fit_slots = [s for s in candidates.slots if self.slot_minutes[(s.start_time, s.end_time)] >= minutes]
+            day_counts = defaultdict(int)
+            for slot in fit_slots:
+                day_counts[slot.day] += 1
+            weights = [int(1.0 / (day_counts[slot.day] + 1) * 10) for slot in fit_slots]
+            cum_weights = []
+            if any(weights):
+                total = 0
+                for weight in weights:
+                    total += weight
+                    cum_weights.append(total)
+            table = ([self.session_time_slot(slot, minutes) for slot in fit_slots], cum_weights)
+            candidates.sessions[minutes] = table
+        return table
+    
+    def sample_session_slot(self, course: Course, minutes: int) -> TimeSlot:
+        """Random session slot of the given length for a course, or None"""
+        slots, cum_weights = self.session_slots(course, minutes)
+        if not slots:
+            return None
+        if cum_weights:
+            return random.choices(slots, cum_weights=cum_weights)[0]
+        return random.choice(slots)
+    
+    def course_durations(self, course: Course) -> List[float]:
+        """Session hours of a course (fixed by the instance when there is one)"""
+        c = self.course_index.get(id(course))
+        if c is not None:
+            return self.instance.durations(c)
+        return self.generate_randomized_sessions(course.units, course.employment_type)
+    
     def get_instructor_by_name(self, instructor_name: str) -> Instructor:
         """Get instructor by name, fallback to first instructor if not found"""
-        for instructor in self.instructors:
-            if instructor.name == instructor_name:
-                return instructor
+        instructor = self.instructor_by_name.get(instructor_name)
+        if instructor is not None:
+            return instructor
         
         # Fallback to first instructor if name not found
         print(f"WARNING: Instructor '{instructor_name}' not found, using first available instructor", file=sys.stderr)
@@ -108,70 +339,23 @@ class GeneticScheduler:
         used_times = set()     # Track used time slots to prevent conflicts
         
         for course in self.courses:
-            # Generate randomized session durations
-            session_durations = self.generate_randomized_sessions(course.units, course.employment_type)
-            
-            # Get suitable time slots for this course
-            suitable_slots = self.get_suitable_time_slots(course)
-            
-            # Get suitable rooms
-            suitable_rooms = self.get_suitable_rooms(course)
-            
-            # Assign instructor - use the original instructor from the course data
-            instructor = self.get_instructor_by_name(course.instructor_name)
+            candidates = self.candidates_for(course)
+            session_durations = candidates.durations
+            suitable_rooms = candidates.rooms
+            instructor = candidates.instructor
+            section = candidates.section
             
             # Create schedule entries for each session duration
             for session_duration in session_durations:
-                if not suitable_slots or not suitable_rooms:
+                if not candidates.slots or not suitable_rooms:
                     continue
                 
-                # Choose a base slot that can fit the required duration
-                required_minutes = int(round(session_duration * 60))
-                def slot_len_minutes(slot: TimeSlot) -> int:
-                    start_time_dt = datetime.strptime(slot.start_time, "%H:%M:%S")
-                    end_time_dt = datetime.strptime(slot.end_time, "%H:%M:%S")
-                    return int((end_time_dt - start_time_dt).total_seconds() // 60)
-                fit_slots = [s for s in suitable_slots if slot_len_minutes(s) >= required_minutes]
-                if not fit_slots:
+                # Session-length slot from a base slot that can fit the required
+                # duration, weighted towards less-used days
+                custom_time_slot = self.sample_session_slot(course, int(round(session_duration * 60)))
+                if custom_time_slot is None:
                     continue
                 
-                # Prefer day diversity by weighting slots from less-used days
-                day_weights = {}
-                for slot in fit_slots:
-                    day = slot.day
-                    if day not in day_weights:
-                        day_weights[day] = []
-                    day_weights[day].append(slot)
-                
-                # Prefer days that haven't been used much yet
-                day_counts = {}
-                for slot in fit_slots:
-                    day = slot.day
-                    day_counts[day] = day_counts.get(day, 0) + 1
-                
-                # Weight slots inversely to their day usage
-                weighted_slots = []
-                for slot in fit_slots:
-                    day = slot.day
-                    weight = 1.0 / (day_counts[day] + 1)  # +1 to avoid division by zero
-                    weighted_slots.extend([slot] * int(weight * 10))  # Scale up for random choice
-                
-                base_slot = random.choice(weighted_slots) if weighted_slots else random.choice(fit_slots)
-                section = f"{course.department}-{course.year_level} {course.block}"
-                
-                # Calculate end time based on session duration
-                start_time = datetime.strptime(base_slot.start_time, "%H:%M:%S")
-                end_time = start_time + timedelta(hours=session_duration)
-                end_time_str = end_time.strftime("%H:%M:%S")
-                
-                # Create custom time slot with the correct duration
-                custom_time_slot = TimeSlot(
-                    day=base_slot.day,
-                    start_time=base_slot.start_time,
-                    end_time=end_time_str,
-                    period=base_slot.period
-                )
-                
                 # Try to find a room that doesn't conflict
                 room = None
                 time_key = f"{custom_time_slot.day}|{custom_time_slot.start_time}|{custom_time_slot.end_time}"
@@ -245,6 +429,13 @@ class GeneticScheduler:
     
     def get_suitable_time_slots(self, course: Course) -> List[TimeSlot]:
         """Get time slots suitable for the course with relaxed constraints."""
+        return self.candidates_for(course).slots
+    
+    def filter_time_slots(self, course: Course) -> List[TimeSlot]:
+        """Employment-type filtering of time_slots (uncached; see candidates_for)"""
+        c = self.course_index.get(id(course))
+        if c is not None and len(self.time_slots) == len(self.instance.time_slots):
+            return [self.time_slots[s] for s in self.instance.course_slots(c)]
         try:
             from .TimeScheduler import filter_time_slots_by_employment
             # Convert object TimeSlot -> dict for reuse, then back
@@ -262,13 +453,18 @@ class GeneticScheduler:
     
     def get_suitable_rooms(self, course: Course) -> List[Room]:
         """Get rooms suitable for the course using dynamic room distribution"""
+        return self.candidates_for(course).rooms
+    
+    def filter_rooms(self, course: Course) -> List[Room]:
+        """Room suitability filtering (uncached; see candidates_for)"""
         # Estimate student count based on units
         estimated_students = min(50, max(20, course.units * 10))
         
-        suitable_rooms = []
-        for room in self.rooms:
-            if self.is_room_suitable_for_course(room, course):
-                suitable_rooms.append(room)
+        c = self.course_index.get(id(course))
+        if c is not None and len(self.rooms) == len(self.instance.rooms):
+            suitable_rooms = [self.rooms[r] for r in self.instance.compatible_rooms(c)]
+        else:
+            suitable_rooms = [self.rooms[r] for r in self.room_compatibility.rooms_for(course.units, course.requires_lab)]
         
         # If no suitable rooms found, use appropriate fallback
         if not suitable_rooms and self.rooms:
@@ -298,6 +494,9 @@ class GeneticScheduler:
     
     def is_room_suitable_for_course(self, room: Room, course: Course) -> bool:
         """Delegate suitability checks to RoomScheduler utilities (object form)."""
+        r = self.room_position.get(id(room))
+        if r is not None:
+            return self.room_compatibility.suitable(course.units, course.requires_lab, r)
         try:
             from .RoomScheduler import is_room_suitable_for_course_obj
             return is_room_suitable_for_course_obj(room, course)
@@ -306,108 +505,79 @@ class GeneticScheduler:
             return True
     
     def calculate_fitness(self, individual: List[ScheduleEntry]) -> float:
-        """Calculate enhanced fitness score for an individual (lower is better)"""
-        conflicts = self.detect_conflicts(individual)
-        
-        # Base fitness (penalty for conflicts)
-        fitness = 0
-        
-        # Hard constraints (critical penalties - further reduced for more flexibility)
-        fitness += conflicts['instructor_conflicts'] * 200       # Instructor double-booking (further reduced penalty)
-        fitness += conflicts['room_conflicts'] * 200             # Room double-booking (further reduced penalty)
-        fitness += conflicts['student_conflicts'] * 400          # Same section at same time (further reduced penalty)
-        fitness += conflicts['cross_section_conflicts'] * 300     # Same subject at same time (further reduced penalty)
-        fitness += conflicts['section_time_overlaps'] * 500      # Same section with overlapping times (further reduced penalty)
-        fitness += conflicts['lunch_break_violations'] * 300      # Lunch break violations (further reduced penalty)
-        
-        # Soft constraints (optimization penalties)
-        fitness += conflicts['employment_violations'] * 100      # Wrong time slots for employment type
-        fitness += conflicts['capacity_violations'] * 50         # Room capacity issues
-        
-        # Additional quality metrics
-        fitness += self.calculate_time_distribution_penalty(individual) * 20
-        fitness += self.calculate_instructor_load_penalty(individual) * 30
-        fitness += self.calculate_room_utilization_penalty(individual) * 15
-        fitness += self.calculate_meeting_pattern_penalty(individual) * 25
-        fitness += self.calculate_units_coverage_penalty(individual) * 100  # High penalty for units mismatch
-        
-        # Bonus for complete scheduling (all courses scheduled)
-        if len(individual) == sum(self.calculate_required_sessions(course.units, course.employment_type) 
-                                 for course in self.courses):
-            fitness -= 100  # Bonus for complete scheduling
-        
+        """Calculate enhanced fitness score for an individual (lower is better).
+
+        Conflicts and quality metrics are weighted by FitnessEngine.CONFLICT_WEIGHTS
+        and PENALTY_WEIGHTS, with a bonus when every required session is scheduled.
+        """
+        state = getattr(individual, 'state', None)
+        if state is not None:
+            return state.fitness()
+        fitness, _, _ = self.fitness_engine.evaluate(individual)
+        return fitness
+    
+    def genome_key(self, individual: List[ScheduleEntry]) -> int:
+        """Hash of the slot/room assignment, independent of entry order"""
+        key = getattr(individual, 'genome_key', None)
+        if key is not None:
+            return key
+        state = getattr(individual, 'state', None)
+        if state is not None:
+            genes = state.genes
+        else:
+            genes = [self.fitness_engine.gene_row(entry) for entry in individual]
+        # (day, interval, instructor, section, room, subject) per session
+        key = hash(tuple(sorted(gene[:6] for gene in genes)))
+        if isinstance(individual, Individual):
+            individual.genome_key = key
+        return key
+    
+    def cached_fitness(self, individual: List[ScheduleEntry]) -> float:
+        """calculate_fitness() memoized in a bounded LRU cache keyed by genome_key()"""
+        key = self.genome_key(individual)
+        fitness = self.fitness_cache.get(key)
+        if fitness is not None:
+            self.fitness_cache.move_to_end(key)
+            self.fitness_cache_hits += 1
+            return fitness
+        
+        self.fitness_cache_misses += 1
+        fitness = self.calculate_fitness(individual)
+        self.fitness_cache[key] = fitness
+        if len(self.fitness_cache) > self.fitness_cache_size:
+            self.fitness_cache.popitem(last=False)
         return fitness
     
+    def deduplicate_population(self, population: List[List[ScheduleEntry]]) -> List[List[ScheduleEntry]]:
+        """Replace individuals whose genome already appears in the population with fresh ones"""
+        seen = set()
+        unique = []
+        self.duplicates_replaced = 0
+        for individual in population:
+            key = self.genome_key(individual)
+            if key in seen:
+                individual = self.create_individual()
+                key = self.genome_key(individual)
+                self.duplicates_replaced += 1
+            seen.add(key)
+            unique.append(individual)
+        return unique
+    
+    def fitness_state(self, individual: List[ScheduleEntry]) -> FitnessState:
+        """Return a private FitnessState for the individual (copied if it already carries one)."""
+        state = getattr(individual, 'state', None)
+        if state is not None:
+            return state.copy()
+        return FitnessState(self.fitness_engine, individual)
+    
     def detect_conflicts(self, individual: List[ScheduleEntry]) -> Dict[str, int]:
-        """Detect all types of conflicts in the schedule with enhanced section conflict detection"""
-        conflicts = {
-            'instructor_conflicts': 0,
-            'room_conflicts': 0,
-            'student_conflicts': 0,
-            'cross_section_conflicts': 0,
-            'employment_violations': 0,
-            'capacity_violations': 0,
-            'lunch_break_violations': 0,
-            'section_time_overlaps': 0
-        }
-        
-        # Group entries by time slot
-        time_groups = defaultdict(list)
-        for entry in individual:
-            key = f"{entry.time_slot.day}|{entry.time_slot.start_time}|{entry.time_slot.end_time}"
-            time_groups[key].append(entry)
-        
-        for time_key, entries in time_groups.items():
-            if len(entries) <= 1:
-                continue
-            
-            # Check instructor conflicts
-            instructor_ids = [entry.instructor.instructor_id for entry in entries]
-            if len(instructor_ids) != len(set(instructor_ids)):
-                conflicts['instructor_conflicts'] += len(instructor_ids) - len(set(instructor_ids))
-            
-            # Check room conflicts
-            rooms = [entry.room.room_id for entry in entries]
-            if len(rooms) != len(set(rooms)):
-                conflicts['room_conflicts'] += len(rooms) - len(set(rooms))
-            
-            # Check student group conflicts (same section at same time)
-            sections = [entry.section for entry in entries]
-            if len(sections) != len(set(sections)):
-                conflicts['student_conflicts'] += len(sections) - len(set(sections))
-            
-            # Check cross-section conflicts (same subject at same time)
-            subjects = [entry.course.course_code for entry in entries]
-            if len(subjects) != len(set(subjects)):
-                conflicts['cross_section_conflicts'] += len(subjects) - len(set(subjects))
-            
-            # Check employment type violations
-            for entry in entries:
-                if entry.course.employment_type == 'PART-TIME' and entry.time_slot.period != 'evening':
-                    conflicts['employment_violations'] += 1
-                elif entry.course.employment_type == 'FULL-TIME' and entry.time_slot.period == 'evening':
-                    conflicts['employment_violations'] += 1
-            
-            # Check room capacity violations
-            for entry in entries:
-                estimated_students = min(50, max(20, entry.course.units * 10))
-                if entry.room.capacity < estimated_students:
-                    conflicts['capacity_violations'] += 1
-            
-            # Check lunch break violations (12:00 PM - 12:59 PM)
-            for entry in entries:
-                start_time = entry.time_slot.start_time
-                end_time = entry.time_slot.end_time
-                if self.is_lunch_break_violation(start_time, end_time):
-                    conflicts['lunch_break_violations'] += 1
-        
-        # Check for section time overlaps (same section with overlapping times)
-        conflicts['section_time_overlaps'] = self.detect_section_time_overlaps(individual)
-        
-        # Check for cross-section conflicts
-        conflicts['cross_section_conflicts'] = self.detect_cross_section_conflicts(individual)
-        
-        return conflicts
+        """Detect all types of conflicts in the schedule.
+
+        Instructor, room and section conflicts are counted as overlapping
+        same-day pairs, so partially overlapping sessions are caught as well as
+        identical time slots.
+        """
+        return self.fitness_engine.detect_conflicts(self.fitness_engine.encode(individual))
     
     def is_lunch_break_violation(self, start_time: str, end_time: str) -> bool:
         """Check if a time slot violates the lunch break (12:00 PM - 12:59 PM)"""
@@ -426,182 +596,12 @@ class GeneticScheduler:
         
         # Check if any part of the class overlaps with lunch break
         return not (end_minutes <= lunch_start or start_minutes >= lunch_end)
-    
-    def detect_section_time_overlaps(self, individual: List[ScheduleEntry]) -> int:
-        """Detect overlapping time slots for the same section"""
-        overlaps = 0
-        
-        # Group entries by section
-        section_entries = defaultdict(list)
-        for entry in individual:
-            section_entries[entry.section].append(entry)
-        
-        for section, entries in section_entries.items():
-            if len(entries) <= 1:
-                continue
-            
-            # Check all pairs of entries for the same section
-            for i in range(len(entries)):
-                for j in range(i + 1, len(entries)):
-                    entry1 = entries[i]
-                    entry2 = entries[j]
-                    
-                    # Check if they're on the same day
-                    if entry1.time_slot.day == entry2.time_slot.day:
-                        if self.times_overlap(entry1.time_slot, entry2.time_slot):
-                            overlaps += 1
-        
-        return overlaps
-    
-    def detect_cross_section_conflicts(self, individual: List[ScheduleEntry]) -> int:
-        """Detect conflicts where same subject is taught at same time in different sections"""
-        subject_time_groups = defaultdict(list)
-        
-        # Group by subject and time
-        for entry in individual:
-            key = f"{entry.course.course_code}|{entry.time_slot.day}|{entry.time_slot.start_time}|{entry.time_slot.end_time}"
-            subject_time_groups[key].append(entry)
-        
-        conflicts = 0
-        for key, entries in subject_time_groups.items():
-            if len(entries) > 1:
-                # Same subject at same time - check if different sections
-                sections = set(entry.section for entry in entries)
-                if len(sections) > 1:
-                    conflicts += len(entries) - 1
-        
-        return conflicts
-    
-    def times_overlap(self, slot1: TimeSlot, slot2: TimeSlot) -> bool:
-        """Check if two time slots overlap"""
-        start1 = self.time_to_minutes(slot1.start_time)
-        end1 = self.time_to_minutes(slot1.end_time)
-        start2 = self.time_to_minutes(slot2.start_time)
-        end2 = self.time_to_minutes(slot2.end_time)
-        
-        return not (end1 <= start2 or end2 <= start1)
-    
+
     def time_to_minutes(self, time_str: str) -> int:
         """Convert time string to minutes since midnight"""
         parts = time_str.split(':')
         return int(parts[0]) * 60 + int(parts[1])
-    
-    def calculate_instructor_load_penalty(self, individual: List[ScheduleEntry]) -> float:
-        """Calculate penalty for uneven instructor workload distribution"""
-        if not individual:
-            return 0
-        
-        instructor_loads = defaultdict(int)
-        for entry in individual:
-            instructor_loads[entry.instructor.instructor_id] += 1
-        
-        if len(instructor_loads) <= 1:
-            return 0
-        
-        loads = list(instructor_loads.values())
-        mean_load = sum(loads) / len(loads)
-        variance = sum((load - mean_load) ** 2 for load in loads) / len(loads)
-        
-        return variance  # Higher variance = more uneven distribution = higher penalty
-    
-    def calculate_room_utilization_penalty(self, individual: List[ScheduleEntry]) -> float:
-        """Calculate penalty for poor room utilization"""
-        if not individual:
-            return 0
-        
-        room_usage = defaultdict(int)
-        for entry in individual:
-            room_usage[entry.room.room_id] += 1
-        
-        if len(room_usage) <= 1:
-            return 0
-        
-        # Penalty for rooms that are overused or underused
-        total_usage = sum(room_usage.values())
-        expected_usage_per_room = total_usage / len(self.rooms)
-        
-        penalty = 0
-        for room_id, usage in room_usage.items():
-            deviation = abs(usage - expected_usage_per_room)
-            penalty += deviation
-        
-        return penalty
-    
-    def calculate_meeting_pattern_penalty(self, individual: List[ScheduleEntry]) -> float:
-        """Calculate penalty for poor meeting patterns (e.g., single sessions for multi-unit courses)"""
-        if not individual:
-            return 0
-        
-        # Group entries by course
-        course_entries = defaultdict(list)
-        for entry in individual:
-            course_entries[entry.course.course_code].append(entry)
-        
-        penalty = 0
-        for course_code, entries in course_entries.items():
-            if len(entries) == 1:
-                # Single session for multi-unit course is generally bad
-                course = entries[0].course
-                if course.units > 2:
-                    penalty += course.units * 5
-            elif len(entries) > 1:
-                # Check if sessions are well-distributed
-                days = [entry.time_slot.day for entry in entries]
-                if len(set(days)) == 1:
-                    # All sessions on same day - not ideal
-                    penalty += len(entries) * 3
-        
-        return penalty
-    
-    def calculate_units_coverage_penalty(self, individual: List[ScheduleEntry]) -> float:
-        """Calculate penalty for not meeting unit requirements"""
-        if not individual:
-            return 1000  # High penalty for empty schedule
-        
-        course_teaching_time = {}
-        
-        # Calculate actual teaching time for each course
-        for entry in individual:
-            course_code = entry.course.course_code
-            if course_code not in course_teaching_time:
-                course_teaching_time[course_code] = 0
-            
-            # Calculate actual duration of this session
-            start_time = datetime.strptime(entry.time_slot.start_time, "%H:%M:%S")
-            end_time = datetime.strptime(entry.time_slot.end_time, "%H:%M:%S")
-            duration_hours = (end_time - start_time).total_seconds() / 3600
-            course_teaching_time[course_code] += duration_hours
-        
-        # Calculate penalty for units mismatch
-        penalty = 0
-        for course in self.courses:
-            required_units = course.units
-            actual_time = course_teaching_time.get(course.course_code, 0)
-            units_diff = abs(actual_time - required_units)
-            penalty += units_diff * 10  # 10 points per unit difference
-        
-        return penalty
-    
-    def calculate_time_distribution_penalty(self, individual: List[ScheduleEntry]) -> float:
-        """Calculate penalty for poor time distribution"""
-        if not individual:
-            return 0
-        
-        # Count entries per day
-        day_counts = defaultdict(int)
-        for entry in individual:
-            day_counts[entry.time_slot.day] += 1
-        
-        # Calculate variance (higher variance = more spread out = better)
-        if len(day_counts) == 0:
-            return 100  # High penalty for no distribution
-        
-        mean_count = sum(day_counts.values()) / len(day_counts)
-        variance = sum((count - mean_count) ** 2 for count in day_counts.values()) / len(day_counts)
-        
-        # Return penalty (lower variance = higher penalty)
-        return max(0, 10 - variance)
-    
+
     def crossover(self, parent1: List[ScheduleEntry], parent2: List[ScheduleEntry]) -> Tuple[List[ScheduleEntry], List[ScheduleEntry]]:
         """Perform enhanced crossover between two parents"""
         if random.random() > self.crossover_rate:
@@ -614,8 +614,9 @@ class GeneticScheduler:
         child1 = []
         child2 = []
         
-        # Use uniform crossover with course-level selection
-        all_courses = set(parent1_groups.keys()) | set(parent2_groups.keys())
+        # Use uniform crossover with course-level selection (ordered, so a
+        # seeded run is reproducible across processes)
+        all_courses = list(dict.fromkeys(list(parent1_groups) + list(parent2_groups)))
         
         for course_code in all_courses:
             # Choose parent based on fitness (better parent has higher chance)
@@ -651,290 +652,243 @@ class GeneticScheduler:
             groups[entry.course.course_code].append(entry)
         return dict(groups)
     
+    def entry_minutes(self, entry: ScheduleEntry) -> int:
+        """Duration of a scheduled session in minutes"""
+        return self.time_to_minutes(entry.time_slot.end_time) - self.time_to_minutes(entry.time_slot.start_time)
+    
+    def session_time_slot(self, base_slot: TimeSlot, minutes: int) -> TimeSlot:
+        """Place a session of the given length at the start of base_slot"""
+        end_minutes = self.time_to_minutes(base_slot.start_time) + minutes
+        return TimeSlot(
+            day=base_slot.day,
+            start_time=base_slot.start_time,
+            end_time=f"{end_minutes // 60:02d}:{end_minutes % 60:02d}:00",
+            period=base_slot.period
+        )
+    
     def mutate(self, individual: List[ScheduleEntry]) -> List[ScheduleEntry]:
-        """Apply enhanced mutation to an individual"""
+        """Apply enhanced mutation to an individual.
+
+        Mutations are applied as moves on the individual's FitnessState, so
+        each one is scored from the changed session's old and new contribution.
+        """
         if random.random() > self.mutation_rate:
             return individual
         
-        mutated = individual.copy()
-        
-        if not mutated:
-            return mutated
-        
-        # Choose mutation type based on adaptive strategy
-        mutation_type = random.choice(['time', 'room', 'instructor', 'swap', 'add_remove'])
-        
-        if mutation_type == 'time':
-            # Mutate time slot
-            entry_to_mutate = random.choice(mutated)
-            suitable_slots = self.get_suitable_time_slots(entry_to_mutate.course)
-            if suitable_slots:
-                entry_to_mutate.time_slot = random.choice(suitable_slots)
-        
-        elif mutation_type == 'room':
-            # Mutate room
-            entry_to_mutate = random.choice(mutated)
-            suitable_rooms = self.get_suitable_rooms(entry_to_mutate.course)
-            if suitable_rooms:
-                entry_to_mutate.room = random.choice(suitable_rooms)
-        
-        elif mutation_type == 'instructor':
-            # Mutate instructor - but preserve the original instructor assignment
-            # Skip instructor mutation to maintain consistency with uploaded data
-            pass
-        
-        elif mutation_type == 'swap':
-            # Swap two entries' time slots or rooms
-            if len(mutated) >= 2:
-                entry1, entry2 = random.sample(mutated, 2)
-                if random.random() < 0.5:
-                    # Swap time slots
-                    entry1.time_slot, entry2.time_slot = entry2.time_slot, entry1.time_slot
-                else:
-                    # Swap rooms
-                    entry1.room, entry2.room = entry2.room, entry1.room
-        
-        elif mutation_type == 'add_remove':
-            # Add or remove a session (if constraints allow)
-            if random.random() < 0.5 and len(mutated) < len(self.courses) * 3:
-                # Try to add a session
-                course = random.choice(self.courses)
-                suitable_slots = self.get_suitable_time_slots(course)
-                suitable_rooms = self.get_suitable_rooms(course)
-                
-                if suitable_slots and suitable_rooms:
-                    new_entry = ScheduleEntry(
-                        course=course,
-                        instructor=self.get_instructor_by_name(course.instructor_name),
-                        room=random.choice(suitable_rooms),
-                        time_slot=random.choice(suitable_slots),
-                        section=f"{course.department}-{course.year_level} {course.block}"
-                    )
-                    mutated.append(new_entry)
-            else:
-                # Try to remove a session (if it won't violate minimum requirements)
-                if len(mutated) > len(self.courses):
-                    entry_to_remove = random.choice(mutated)
-                    mutated.remove(entry_to_remove)
+        if not individual:
+            return individual.copy()
+        
+        state = self.fitness_state(individual)
+        
+        # Choose the operator adaptively and credit it with the fitness gain
+        # (after repair) per move scored, the application itself included
+        name = self.operator_bandit.select()
+        started = time.perf_counter()
+        before, moves = state.fitness(), state.moves
+        self.mutation_operators[name](state)
         
         # Repair the mutated individual
-        mutated = self.repair_schedule(mutated)
+        self.repair_state(state)
+        self.operator_bandit.update(name, before - state.fitness(), 1 + state.moves - moves,
+                                    time.perf_counter() - started)
         
-        return mutated
+        return Individual(state)
+    
+    def register_mutation_operator(self, name: str, operator: Callable[[FitnessState], Any]) -> None:
+        """Add (or replace) a mutation operator; it receives a private FitnessState to modify in place"""
+        self.mutation_operators[name] = operator
+        self.operator_bandit.add(name)
+    
+    def mutate_time(self, state: FitnessState) -> None:
+        """Move one session to another start, keeping its duration"""
+        g = random.randrange(len(state.entries))
+        entry = state.entries[g]
+        slot = self.sample_session_slot(entry.course, self.entry_minutes(entry))
+        if slot is not None:
+            state.move(g, replace(entry, time_slot=slot))
+    
+    def mutate_room(self, state: FitnessState) -> None:
+        g = random.randrange(len(state.entries))
+        entry = state.entries[g]
+        suitable_rooms = self.get_suitable_rooms(entry.course)
+        if suitable_rooms:
+            state.move(g, replace(entry, room=random.choice(suitable_rooms)))
+    
+    def mutate_swap_time(self, state: FitnessState) -> None:
+        """Swap the start times of two sessions; each keeps its own duration"""
+        entries = state.entries
+        if len(entries) >= 2:
+            g1, g2 = random.sample(range(len(entries)), 2)
+            entry1, entry2 = entries[g1], entries[g2]
+            state.move(g1, replace(entry1, time_slot=self.session_time_slot(entry2.time_slot, self.entry_minutes(entry1))))
+            state.move(g2, replace(entry2, time_slot=self.session_time_slot(entry1.time_slot, self.entry_minutes(entry2))))
+    
+    def mutate_swap_room(self, state: FitnessState) -> None:
+        entries = state.entries
+        if len(entries) >= 2:
+            g1, g2 = random.sample(range(len(entries)), 2)
+            entry1, entry2 = entries[g1], entries[g2]
+            state.move(g1, replace(entry1, room=entry2.room))
+            state.move(g2, replace(entry2, room=entry1.room))
+    
+    def mutate_add_session(self, state: FitnessState) -> None:
+        """Add a session for a random course (if constraints allow)"""
+        if len(state.entries) >= len(self.courses) * 3:
+            return
+        course = random.choice(self.courses)
+        candidates = self.candidates_for(course)
+        if candidates.slots and candidates.rooms:
+            state.add_entry(ScheduleEntry(
+                course=course,
+                instructor=candidates.instructor,
+                room=random.choice(candidates.rooms),
+                time_slot=random.choice(candidates.slots),
+                section=candidates.section
+            ))
+    
+    def mutate_remove_session(self, state: FitnessState) -> None:
+        """Remove a session (if it won't violate minimum requirements)"""
+        if len(state.entries) > len(self.courses):
+            state.remove_entry(random.randrange(len(state.entries)))
+    
+    def mutate_relocate_conflict(self, state: FitnessState) -> None:
+        """Move a random conflicting session to a placement where all its resources are free"""
+        conflicting = state.conflicting_genes()
+        if not conflicting:
+            return
+        g = random.choice(conflicting)
+        entry = state.entries[g]
+        session_slots, _ = self.session_slots(entry.course, self.entry_minutes(entry))
+        if session_slots:
+            placement = state.free_placement(g, session_slots, self.candidates_for(entry.course).rooms,
+                                             random.randrange(len(session_slots)))
+            if placement is not None:
+                state.move(g, replace(entry, time_slot=placement[0], room=placement[1]))
     
     def repair_schedule(self, individual: List[ScheduleEntry]) -> List[ScheduleEntry]:
-        """Repair schedule to resolve conflicts with enhanced section conflict handling"""
+        """Repair schedule by moving conflicting sessions to better time slots or rooms"""
         if not individual:
             return individual
         
-        repaired = individual.copy()
-        max_repair_attempts = 10
-        attempt = 0
-        
-        while attempt < max_repair_attempts:
-            conflicts = self.detect_conflicts(repaired)
-            
-            # If no conflicts, return as is
-            if sum(conflicts.values()) == 0:
-                return repaired
-            
-            # Priority 1: Fix section time overlaps (most critical)
-            if conflicts['section_time_overlaps'] > 0:
-                repaired = self.fix_section_time_overlaps(repaired)
-            
-            # Priority 2: Fix lunch break violations
-            if conflicts['lunch_break_violations'] > 0:
-                repaired = self.fix_lunch_break_violations(repaired)
-            
-            # Priority 3: Fix cross-section conflicts
-            if conflicts['cross_section_conflicts'] > 0:
-                repaired = self.fix_cross_section_conflicts(repaired)
-            
-            # Priority 4: Fix other conflicts
-            repaired = self.fix_other_conflicts(repaired)
-            
-            attempt += 1
-        
-        return repaired
+        state = self.fitness_state(individual)
+        self.repair_state(state)
+        return Individual(state)
     
-    def fix_section_time_overlaps(self, individual: List[ScheduleEntry]) -> List[ScheduleEntry]:
-        """Fix section time overlaps by rescheduling conflicting entries"""
-        repaired = individual.copy()
-        
-        # Group entries by section
-        section_entries = defaultdict(list)
-        for entry in repaired:
-            section_entries[entry.section].append(entry)
-        
-        for section, entries in section_entries.items():
-            if len(entries) <= 1:
-                continue
-            
-            # Sort entries by start time
-            entries.sort(key=lambda e: self.time_to_minutes(e.time_slot.start_time))
-            
-            # Check for overlaps and fix them
-            for i in range(len(entries)):
-                for j in range(i + 1, len(entries)):
-                    entry1 = entries[i]
-                    entry2 = entries[j]
-                    
-                    if (entry1.time_slot.day == entry2.time_slot.day and 
-                        self.times_overlap(entry1.time_slot, entry2.time_slot)):
-                        
-                        # Try to reschedule entry2 to a different time slot
-                        suitable_slots = self.get_suitable_time_slots(entry2.course)
-                        for slot in suitable_slots:
-                            # Check if this slot doesn't conflict with other entries
-                            if not self.slot_conflicts_with_entries(slot, entries, entry2):
-                                entry2.time_slot = slot
-                                break
-        
-        return repaired
+    def repair_state(self, state: FitnessState) -> None:
+        """Run improving moves on sessions involved in hard conflicts until none help"""
+        self.timer.start('repair')
+        try:
+            for _ in range(self.max_repair_passes):
+                conflicting = state.conflicting_genes()
+                if not conflicting:
+                    return
+                
+                improved = False
+                for g in conflicting:
+                    # An earlier move in this pass may already have cleared this session
+                    if state.gene_conflicts(g) and self.improve_gene(state, g):
+                        improved = True
+                
+                if not improved:
+                    return
+        finally:
+            self.timer.stop()
     
-    def fix_lunch_break_violations(self, individual: List[ScheduleEntry]) -> List[ScheduleEntry]:
-        """Fix lunch break violations by rescheduling conflicting entries"""
-        repaired = individual.copy()
-        
-        for entry in repaired:
-            if self.is_lunch_break_violation(entry.time_slot.start_time, entry.time_slot.end_time):
-                # Try to find a suitable non-lunch time slot
-                suitable_slots = self.get_suitable_time_slots(entry.course)
-                for slot in suitable_slots:
-                    if not self.is_lunch_break_violation(slot.start_time, slot.end_time):
-                        entry.time_slot = slot
-                        break
+    def improve_gene(self, state: FitnessState, g: int) -> bool:
+        """Move one conflicting session to a better time slot or room.
+
+        First asks the state's busy masks for a placement where instructor,
+        section and room are all idle; if there is none (or it does not lower
+        fitness) falls back to scoring a sample of alternative slots and rooms.
+        """
+        entry = state.entries[g]
+        best_fitness = state.fitness()
+        best_entry = None
+        
+        session_slots, _ = self.session_slots(entry.course, self.entry_minutes(entry))
+        suitable_rooms = self.candidates_for(entry.course).rooms
+        
+        if session_slots:
+            placement = state.free_placement(g, session_slots, suitable_rooms, random.randrange(len(session_slots)))
+            if placement is not None:
+                slot, room = placement
+                if state.move(g, replace(entry, time_slot=slot, room=room)) < best_fitness:
+                    return True
+                state.move(g, entry)
+        
+        candidates = [
+            replace(entry, time_slot=slot)
+            for slot in random.sample(session_slots, min(len(session_slots), self.repair_candidates))
+        ]
+        candidates.extend(
+            replace(entry, room=room)
+            for room in random.sample(suitable_rooms, min(len(suitable_rooms), self.repair_candidates // 4))
+        )
         
-        return repaired
-    
-    def fix_cross_section_conflicts(self, individual: List[ScheduleEntry]) -> List[ScheduleEntry]:
-        """Fix cross-section conflicts by rescheduling conflicting entries"""
-        repaired = individual.copy()
-        
-        # Group by subject and time
-        subject_time_groups = defaultdict(list)
-        for i, entry in enumerate(repaired):
-            key = f"{entry.course.course_code}|{entry.time_slot.day}|{entry.time_slot.start_time}|{entry.time_slot.end_time}"
-            subject_time_groups[key].append((i, entry))
-        
-        for key, entries in subject_time_groups.items():
-            if len(entries) > 1:
-                # Keep first entry, reschedule others
-                for i, (idx, entry) in enumerate(entries[1:], 1):
-                    # Find alternative time slot
-                    suitable_slots = self.get_suitable_time_slots(entry.course)
-                    suitable_rooms = self.get_suitable_rooms(entry.course)
-                    
-                    if suitable_slots and suitable_rooms:
-                        # Try to find non-conflicting slot
-                        for slot in suitable_slots:
-                            for room in suitable_rooms:
-                                if not self.slot_conflicts_with_entries(slot, repaired, entry):
-                                    repaired[idx] = ScheduleEntry(
-                                        course=entry.course,
-                                        instructor=entry.instructor,
-                                        room=room,
-                                        time_slot=slot,
-                                        section=entry.section
-                                    )
-                                    break
-                            else:
-                                continue
-                            break
-        
-        return repaired
-    
-    def fix_other_conflicts(self, individual: List[ScheduleEntry]) -> List[ScheduleEntry]:
-        """Fix other types of conflicts"""
-        repaired = individual.copy()
-        
-        # Group entries by time slot for conflict resolution
-        time_groups = defaultdict(list)
-        for entry in repaired:
-            key = f"{entry.time_slot.day}|{entry.time_slot.start_time}|{entry.time_slot.end_time}"
-            time_groups[key].append(entry)
-        
-        # Resolve conflicts in each time slot
-        for time_key, entries in time_groups.items():
-            if len(entries) <= 1:
-                continue
-            
-            # Check for instructor conflicts
-            instructor_conflicts = defaultdict(list)
-            for entry in entries:
-                instructor_conflicts[entry.instructor.instructor_id].append(entry)
-            
-            for instructor, conflicting_entries in instructor_conflicts.items():
-                if len(conflicting_entries) > 1:
-                    # Keep the first entry, reschedule others
-                    for entry in conflicting_entries[1:]:
-                        suitable_slots = self.get_suitable_time_slots(entry.course)
-                        if suitable_slots:
-                            # Find a non-conflicting slot
-                            for slot in suitable_slots:
-                                slot_key = f"{slot.day}|{slot.start_time}|{slot.end_time}"
-                                if slot_key not in time_groups or len(time_groups[slot_key]) == 0:
-                                    entry.time_slot = slot
-                                    break
-            
-            # Check for room conflicts
-            room_conflicts = defaultdict(list)
-            for entry in entries:
-                room_conflicts[entry.room.room_id].append(entry)
-            
-            for room_id, conflicting_entries in room_conflicts.items():
-                if len(conflicting_entries) > 1:
-                    # Keep the first entry, reschedule others
-                    for entry in conflicting_entries[1:]:
-                        suitable_rooms = self.get_suitable_rooms(entry.course)
-                        if suitable_rooms:
-                            # Find a non-conflicting room
-                            for room in suitable_rooms:
-                                if room.room_id != room_id:
-                                    entry.room = room
-                                    break
-        
-        return repaired
-    
-    def slot_conflicts_with_entries(self, slot: TimeSlot, entries: List[ScheduleEntry], exclude_entry: ScheduleEntry) -> bool:
-        """Check if a time slot conflicts with existing entries (excluding the excluded entry)"""
-        for entry in entries:
-            if entry == exclude_entry:
-                continue
-            if (entry.time_slot.day == slot.day and 
-                self.times_overlap(entry.time_slot, slot)):
-                return True
-        return False
+        for candidate in candidates:
+            fitness = state.move(g, candidate)
+            if fitness < best_fitness:
+                best_fitness = fitness
+                best_entry = candidate
+        
+        state.move(g, best_entry if best_entry is not None else entry)
+        return best_entry is not None
     
     def evolve(self) -> List[ScheduleEntry]:
         """Run the enhanced genetic algorithm with adaptive parameters"""
+        if self.search_engine != 'ga':
+            try:
+                from .LocalSearch import LocalSearch
+            except ImportError:
+                from LocalSearch import LocalSearch
+            return LocalSearch(self, self.search_engine, self.local_search_config).run()
+        if self.islands > 1:
+            try:
+                from .ParallelGenetic import IslandEvolution
+            except ImportError:
+                from ParallelGenetic import IslandEvolution
+            return IslandEvolution(self, self.islands, self.seed).run()
+        if self.workers > 1:
+            try:
+                from .ParallelGenetic import ParallelEvolution
+            except ImportError:
+                from ParallelGenetic import ParallelEvolution
+            return ParallelEvolution(self, self.workers, self.seed).run()
+        
+        if self.seed is not None:
+            random.seed(self.seed)
+        
         # Reduced debug output to prevent pipe overflow
         if len(self.courses) <= 10:
             print("Starting enhanced genetic algorithm evolution...", file=sys.stderr)
         
         import time
         start_time = time.time()
-        max_runtime = 45  # 45 seconds max runtime (increased for better results)
+        policy = self.termination_policy()
+        if self.population_scaling:
+            self.scale_population(policy.budget() or self.max_runtime)
+        deadline = start_time + (policy.budget() or self.max_runtime)
         
         # Initialize population
-        population = [self.create_individual() for _ in range(self.population_size)]
+        self.timer.take()
+        self.timer.start('initialization')
+        population = self.initial_population()
+        self.timer.stop()
         
         best_fitness = float('inf')
         best_individual = None
         stagnation_count = 0
-        last_improvement = 0
+        generation = 0
+        generation_start = start_time
         
-        for generation in range(self.generations):
-            # Check timeout
-            if time.time() - start_time > max_runtime:
-                print(f"Timeout reached after {time.time() - start_time:.1f} seconds", file=sys.stderr)
-                break
-                
+        while True:
             # Calculate fitness for all individuals
+            self.timer.start('evaluation')
             fitness_scores = []
             for individual in population:
-                fitness = self.calculate_fitness(individual)
+                fitness = self.cached_fitness(individual)
                 fitness_scores.append((fitness, individual))
+            self.timer.stop()
             
             # Sort by fitness (lower is better)
             fitness_scores.sort(key=lambda x: x[0])
@@ -945,12 +899,13 @@ class GeneticScheduler:
                 best_fitness = current_best_fitness
                 best_individual = current_best_individual.copy()
                 stagnation_count = 0
-                last_improvement = generation
             else:
                 stagnation_count += 1
             
             # Track fitness history
             self.best_fitness_history.append(current_best_fitness)
+            if self.telemetry is not None:
+                self.emit_generation(generation, fitness_scores, stagnation_count, time.time() - start_time)
             
             # Adaptive mutation rate
             if self.adaptive_mutation:
@@ -964,15 +919,21 @@ class GeneticScheduler:
                 print(f"Generation {generation + 1}: Best fitness = {current_best_fitness:.2f}, "
                       f"Mutation rate = {self.mutation_rate:.3f}, Stagnation = {stagnation_count}", file=sys.stderr)
             
-            # Early termination conditions
-            if current_best_fitness == 0:  # Perfect solution found
-                print("Perfect solution found!", file=sys.stderr)
-                break
-            
-            # Accept solution with reasonable conflicts (less than 50 total conflicts)
-            if current_best_fitness < 50000:  # Less than 50 hard constraint violations
-                print(f"Good solution found with fitness {current_best_fitness:.2f}", file=sys.stderr)
+            # Termination policies
+            generation += 1
+            now = time.time()
+            reason = policy.check(Progress(
+                generation=generation,
+                elapsed=now - start_time,
+                best_fitness=best_fitness,
+                history=self.best_fitness_history,
+                generation_sec=now - generation_start,
+                hard_conflicts=lambda: self.hard_conflicts(best_individual)
+            ))
+            if reason:
+                print(f"Stopping: {reason}", file=sys.stderr)
                 break
+            generation_start = now
             
             if stagnation_count >= self.stagnation_limit:
                 print(f"Stagnation limit reached. Restarting with best solution...", file=sys.stderr)
@@ -981,32 +942,131 @@ class GeneticScheduler:
                 stagnation_count = 0
                 continue
             
-            # Create new population
-            new_population = []
+            population = self.next_generation(population, fitness_scores, deadline)
+        
+        print(f"Evolution completed. Best fitness: {best_fitness:.2f}", file=sys.stderr)
+        total_lookups = self.fitness_cache_hits + self.fitness_cache_misses
+        if total_lookups:
+            print(f"Fitness cache: {self.fitness_cache_hits}/{total_lookups} hits", file=sys.stderr)
+        if self.telemetry is not None:
+            self.telemetry.emit("summary", engine="serial", best=best_fitness,
+                                generations=len(self.best_fitness_history),
+                                elapsed_sec=round(time.time() - start_time, 4))
+        return best_individual or []
+    
+    def emit_generation(self, generation: int, fitness_scores: List[Tuple[float, List[ScheduleEntry]]],
+                        stagnation: int, elapsed: float) -> None:
+        """Write one telemetry record for a scored generation.
+
+        phase_sec covers the work since the previous record, i.e. producing
+        and evaluating this generation.
+        """
+        best = fitness_scores[0][1]
+        state = getattr(best, 'state', None)
+        conflicts = dict(state.conflicts) if state is not None else self.detect_conflicts(best)
+        # Gene-level diversity: distinct (day, interval, instructor, section,
+        # room, course) placements over all placements in the population
+        placements = set()
+        total = 0
+        for _, individual in fitness_scores:
+            genes = individual.state.genes if getattr(individual, 'state', None) is not None \
+                else [self.fitness_engine.gene_row(entry) for entry in individual]
+            placements.update(gene[:6] for gene in genes)
+            total += len(genes)
+        lookups = self.fitness_cache_hits + self.fitness_cache_misses
+        self.telemetry.emit(
+            "generation",
+            engine="serial",
+            generation=generation,
+            elapsed_sec=round(elapsed, 4),
+            fitness=population_stats([f for f, _ in fitness_scores]),
+            conflicts=conflicts,
+            diversity={"distinct_placements": len(placements) / total if total else 0.0,
+                       "duplicates_replaced": self.duplicates_replaced},
+            sessions=len(best),
+            mutation_rate=self.mutation_rate,
+            stagnation=stagnation,
+            cache_hit_rate=(self.fitness_cache_hits / lookups) if lookups else None,
+            operators=self.operator_bandit.snapshot(),
+            phase_sec={phase: round(t, 5) for phase, t in self.timer.take().items()}
+        )
+    
+    def termination_policy(self):
+        """Termination.AnyOf built from termination_config and the run defaults"""
+        return build_termination(self.termination_config, self.max_runtime, self.generations)
+    
+    def scale_population(self, budget: float) -> None:
+        """Size the population so about `generations` generations fit in the budget"""
+        import time
+        samples = 3
+        start = time.time()
+        for _ in range(samples):
+            self.repair_schedule(self.create_individual())
+        offspring_sec = (time.time() - start) / samples
+        self.population_size = scaled_population_size(offspring_sec, budget, self.generations)
+        self.elite_size = max(2, min(self.elite_size, self.population_size // 6))
+        print(f"Population scaled to {self.population_size} "
+              f"({offspring_sec * 1000:.1f}ms per offspring, {budget:.1f}s budget)", file=sys.stderr)
+    
+    def hard_conflicts(self, individual: List[ScheduleEntry]) -> int:
+        """Hard-constraint conflicts of an individual"""
+        if not individual:
+            return 0
+        state = getattr(individual, 'state', None)
+        if state is not None:
+            return state.hard_conflicts()
+        conflicts = self.detect_conflicts(individual)
+        return sum(conflicts[key] for key in HARD_CONFLICT_KEYS)
+    
+    def initial_population(self) -> List[List[ScheduleEntry]]:
+        """Repaired seed individuals followed by random ones"""
+        population = [self.repair_schedule(list(seed)) for seed in self.seed_individuals[:self.population_size]]
+        population.extend(self.create_individual() for _ in range(self.population_size - len(population)))
+        return population
+    
+    def next_generation(self, population: List[List[ScheduleEntry]], fitness_scores: List[Tuple[float, List[ScheduleEntry]]],
+                        deadline: Optional[float] = None) -> List[List[ScheduleEntry]]:
+        """Elites plus offspring of tournament-selected parents; fitness_scores must be sorted.
+
+        If the deadline passes while breeding, the remaining places are filled
+        with the best not-yet-included members of the current population.
+        """
+        import time
+        size = len(population)
+        new_population = [individual for _, individual in fitness_scores[:self.elite_size]]
+        
+        # Generate offspring
+        timer = self.timer
+        while len(new_population) < size:
+            if deadline is not None and time.time() > deadline:
+                new_population.extend(individual for _, individual in fitness_scores[len(new_population):size])
+                return new_population[:size]
+            # Select parents using tournament selection
+            timer.start('selection')
+            parent1 = self.tournament_selection(population, fitness_scores)
+            parent2 = self.tournament_selection(population, fitness_scores)
+            timer.stop()
             
-            # Keep elite individuals
-            elite = [individual for _, individual in fitness_scores[:self.elite_size]]
-            new_population.extend(elite)
+            # Create offspring
+            timer.start('crossover')
+            child1, child2 = self.crossover(parent1, parent2)
+            timer.stop()
             
-            # Generate offspring
-            while len(new_population) < self.population_size:
-                # Select parents using tournament selection
-                parent1 = self.tournament_selection(population, fitness_scores)
-                parent2 = self.tournament_selection(population, fitness_scores)
-                
-                # Create offspring
-                child1, child2 = self.crossover(parent1, parent2)
-                
-                # Apply mutation
-                child1 = self.mutate(child1)
-                child2 = self.mutate(child2)
-                
-                new_population.extend([child1, child2])
+            # Apply mutation
+            timer.start('mutation')
+            child1 = self.mutate(child1)
+            child2 = self.mutate(child2)
+            timer.stop()
             
-            population = new_population[:self.population_size]
+            new_population.extend([child1, child2])
         
-        print(f"Evolution completed. Best fitness: {best_fitness:.2f}", file=sys.stderr)
-        return best_individual or []
+        # Identical children (unchanged copies, converged offspring) add no
+        # diversity; replace them with fresh individuals
+        timer.start('deduplication')
+        try:
+            return self.deduplicate_population(new_population[:size])
+        finally:
+            timer.stop()
     
     def tournament_selection(self, population: List[List[ScheduleEntry]], fitness_scores: List[Tuple[float, List[ScheduleEntry]]]) -> List[ScheduleEntry]:
         """Select an individual using enhanced tournament selection"""
@@ -1122,6 +1182,10 @@ class GeneticScheduler:
                 "errors": ["No solution found"]
             }
         
+        return self.format_result(best_schedule)
+    
+    def format_result(self, best_schedule: List[ScheduleEntry]) -> Dict[str, Any]:
+        """Output payload for a schedule, with conflicts and quality metrics"""
         # Convert to output format with reduced data to prevent pipe overflow
         schedules = []
         for entry in best_schedule:
@@ -1182,6 +1246,89 @@ def read_input() -> Dict[str, Any]:
         return {}
     return json.loads(data)
 
+def build_scheduler(payload: Dict[str, Any]) -> GeneticScheduler:
+    """Create a GeneticScheduler from a solver payload (instructorData, rooms and run options)"""
+    seed = payload.get("seed")
+    if seed is not None:
+        # Compiling shuffles the time slots and draws the session lengths,
+        # so a seeded run must seed before it compiles
+        random.seed(int(seed))
+        np.random.seed(int(seed))
+    instance = compile_instance(payload)
+    
+    # Courses keep their original year level and block assignments
+    courses = []
+    for record in instance.courses:
+        # Debug: Log lab session processing
+        if record["requires_lab"]:
+            print(f"DEBUG: Processing LAB session: {record['courseCode']} - {record['yearLevel']} {record['block']}", file=sys.stderr)
+        
+        courses.append(Course(
+            name=record["name"],
+            course_code=record["courseCode"],
+            description=record["subject"],
+            units=record["unit"],
+            year_level=record["yearLevel"],
+            block=record["block"],
+            employment_type=record["employmentType"],
+            department=record["dept"],
+            instructor_name=record["name"],  # Preserve the original instructor assignment
+            requires_lab=record["requires_lab"]
+        ))
+    
+    rooms = [
+        Room(
+            room_id=room_data.get("room_id", 0),
+            room_name=room_data.get("room_name", ""),
+            capacity=room_data.get("capacity", 30),
+            is_lab=room_data.get("is_lab", False),
+            is_active=room_data.get("is_active", True)
+        )
+        for room_data in instance.rooms
+    ]
+    
+    # One instructor per distinct name, ids in order of first appearance
+    named = [(name, employment) for name, employment in zip(instance.instructor_names, instance.instructor_employment) if name]
+    instructors = [
+        Instructor(instructor_id=i + 1, name=name, employment_type=employment)
+        for i, (name, employment) in enumerate(named)
+    ]
+    
+    scheduler = GeneticScheduler(courses, rooms, instructors, instance)
+    workers = int(payload.get("workers", 1) or 0)
+    scheduler.workers = workers if workers > 0 else (os.cpu_count() or 1)
+    if seed is not None:
+        scheduler.seed = int(seed)
+    islands = payload.get("islands")
+    if isinstance(islands, dict):
+        scheduler.islands = int(islands.get("count", 1) or 0) or (os.cpu_count() or 1)
+        scheduler.migration_interval = max(1, int(islands.get("migrationInterval", scheduler.migration_interval)))
+        scheduler.migration_size = max(0, int(islands.get("migrants", scheduler.migration_size)))
+        scheduler.migration_topology = str(islands.get("topology", scheduler.migration_topology))
+    elif islands is not None:
+        scheduler.islands = int(islands or 0) or (os.cpu_count() or 1)
+    scheduler.telemetry = open_sink(payload.get("telemetry"))
+    termination = payload.get("termination")
+    if isinstance(termination, dict):
+        scheduler.termination_config = termination
+    engine = payload.get("engine")
+    if engine:
+        engine = str(engine).lower()
+        if engine not in ("ga", "tabu", "annealing"):
+            raise ValueError(f"Unknown engine: {engine}")
+        scheduler.search_engine = engine
+        if isinstance(payload.get("localSearch"), dict):
+            scheduler.local_search_config = payload["localSearch"]
+    if payload.get("adaptiveOperators") is False:
+        scheduler.operator_bandit.adaptive = False
+    population_size = payload.get("populationSize")
+    if population_size == "auto" or (population_size is None and isinstance(termination, dict)
+                                     and termination.get("timeBudgetSec") is not None):
+        scheduler.population_scaling = True
+    elif population_size is not None:
+        scheduler.population_size = max(4, int(population_size))
+    return scheduler
+
 def main():
     """Main function"""
     try:
@@ -1205,61 +1352,15 @@ def main():
         }))
         return
     
-    # Convert input data preserving original year level and block assignments
-    courses = []
-    
-    for course_data in instructor_data:
-        # Process session type to determine lab requirement
-        session_type = str(course_data.get("sessionType", "Non-Lab session") or "").strip().lower()
-        requires_lab = (session_type == "lab session")
-        
-        # Debug: Log lab session processing
-        if requires_lab:
-            print(f"DEBUG: Processing LAB session: {course_data.get('courseCode', 'Unknown')} - {course_data.get('yearLevel', 'Unknown')} {course_data.get('block', 'Unknown')}", file=sys.stderr)
-        
-        # Create course with original block assignment
-        course = Course(
-            name=course_data.get("name", ""),
-            course_code=course_data.get("courseCode", ""),
-            description=course_data.get("subject", ""),
-            units=int(course_data.get("unit", 3)),
-            year_level=course_data.get("yearLevel", "1st Year"),
-            block=course_data.get("block", "A"),  # Use original block from data
-            employment_type=course_data.get("employmentType", "FULL-TIME"),
-            department=course_data.get("dept", "General"),
-            instructor_name=course_data.get("name", ""),  # Preserve the original instructor assignment
-            requires_lab=requires_lab  # Set lab requirement based on session type
-        )
-        courses.append(course)
-    
-    rooms = []
-    for room_data in rooms_data:
-        room = Room(
-            room_id=room_data.get("room_id", 0),
-            room_name=room_data.get("room_name", ""),
-            capacity=room_data.get("capacity", 30),
-            is_lab=room_data.get("is_lab", False),
-            is_active=room_data.get("is_active", True)
-        )
-        rooms.append(room)
-    
-    # Parse instructors from course data
-    instructor_map = {}
-    for course_data in instructor_data:
-        instructor_name = course_data.get("name", "")
-        if instructor_name and instructor_name not in instructor_map:
-            instructor_map[instructor_name] = Instructor(
-                instructor_id=len(instructor_map) + 1,  # Simple ID assignment
-                name=instructor_name,
-                employment_type=course_data.get("employmentType", "FULL-TIME")
-            )
-    
-    instructors = list(instructor_map.values())
-    
     # Create scheduler and solve
     try:
-        scheduler = GeneticScheduler(courses, rooms, instructors)
-        result = scheduler.solve()
+        with profile_run(payload, "ga") as profiler:
+            scheduler = build_scheduler(payload)
+            result = scheduler.solve()
+        result = apply_post_check(profiler.attach(result), payload.get("check"), payload.get("rooms"))
+        result = apply_output_mode(result, payload)
+        if scheduler.telemetry is not None:
+            scheduler.telemetry.close()
         
         # Ensure output is flushed to prevent broken pipe
         output = json.dumps(result)
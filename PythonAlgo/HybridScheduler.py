@@ -0,0 +1,208 @@
+import sys
+import json
+import time
+import random
+from typing import List, Dict, Any
+
+try:
+    from .GeneticScheduler import GeneticScheduler, ScheduleEntry, TimeSlot, build_scheduler, read_input
+    from .Scheduler import solve_with_cp_sat, expand_blocks
+    from .export import apply_output_mode
+    from .check import apply_post_check
+    from .Profiling import profile_run
+except ImportError:
+    from GeneticScheduler import GeneticScheduler, ScheduleEntry, TimeSlot, build_scheduler, read_input
+    from Scheduler import solve_with_cp_sat, expand_blocks
+    from export import apply_output_mode
+    from check import apply_post_check
+    from Profiling import profile_run
+
+
+# Share of the time budget for the feasibility seeding solve and the hinted
+# polishing solve; the GA gets the rest
+SEED_TIME_FRACTION = 0.15
+POLISH_TIME_FRACTION = 0.25
+
+
+def schedules_to_individual(scheduler: GeneticScheduler, schedules: List[Dict[str, Any]]) -> List[ScheduleEntry]:
+    """Convert schedule dicts (CP-SAT or GA output) into a GA individual.
+
+    Sessions are matched to courses by instructor, course code, year level and
+    block. CP-SAT expands multi-block courses ("A & B") into one course per
+    block, so such a course takes the sessions of its first block.
+    """
+    pending: Dict[Any, List[Dict[str, Any]]] = {}
+    for entry in schedules:
+        key = (entry.get("instructor", ""), entry.get("subject_code", ""), entry.get("year_level", ""), entry.get("block", ""))
+        pending.setdefault(key, []).append(entry)
+
+    periods = {}
+    for slot in scheduler.time_slots:
+        periods.setdefault((slot.day, slot.start_time), slot.period)
+    rooms = {room.room_id: room for room in scheduler.rooms}
+
+    individual = []
+    for course in scheduler.courses:
+        candidates = scheduler.candidates_for(course)
+        base = (course.instructor_name, course.course_code, course.year_level)
+        entries = pending.get(base + (course.block,)) or pending.get(base + (expand_blocks(course.block)[0],), [])
+        # Each course consumes its own sessions; duplicates of a course get the next ones
+        taken, entries[:] = entries[:len(candidates.durations)], entries[len(candidates.durations):]
+        for entry in taken:
+            room = rooms.get(entry.get("room_id"))
+            if room is None:
+                if not candidates.rooms:
+                    continue
+                room = candidates.rooms[0]
+            start = entry["start_time"]
+            period = periods.get((entry["day"], start))
+            if period is None:
+                period = 'evening' if start >= '17:00:00' else 'afternoon' if start >= '12:00:00' else 'morning'
+            individual.append(ScheduleEntry(
+                course=course,
+                instructor=candidates.instructor,
+                room=room,
+                time_slot=TimeSlot(day=entry["day"], start_time=start, end_time=entry["end_time"], period=period),
+                section=candidates.section
+            ))
+    return individual
+
+
+def seed_individuals(scheduler: GeneticScheduler, payload: Dict[str, Any], count: int, time_limit: float) -> List[List[ScheduleEntry]]:
+    """Feasibility-only CP-SAT solution (or the greedy fallback schedule) plus mutated variants"""
+    seeds = []
+    try:
+        result = solve_with_cp_sat(payload, time_limit=time_limit, objective=False, instance=scheduler.instance)
+        if result.get("success") and result.get("schedules"):
+            seeds.append(schedules_to_individual(scheduler, result["schedules"]))
+            print(f"Hybrid: CP-SAT seed with {len(seeds[0])} sessions", file=sys.stderr)
+        else:
+            print(f"Hybrid: CP-SAT seeding failed ({result.get('message')})", file=sys.stderr)
+    except Exception as e:
+        print(f"Hybrid: CP-SAT seeding error: {e}", file=sys.stderr)
+
+    try:
+        seeds.append(scheduler.create_simple_schedule())
+    except Exception as e:
+        print(f"Hybrid: simple schedule seeding error: {e}", file=sys.stderr)
+    seeds = [seed for seed in seeds if seed]
+    if not seeds:
+        return []
+
+    # Fill the seed share with forced mutations of the seeds
+    mutation_rate = scheduler.mutation_rate
+    scheduler.mutation_rate = 1.0
+    try:
+        variants = []
+        while len(seeds) + len(variants) < count:
+            variants.append(scheduler.mutate(scheduler.repair_schedule(list(random.choice(seeds)))))
+    finally:
+        scheduler.mutation_rate = mutation_rate
+    return seeds + variants
+
+
+def solve_hybrid(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """CP-SAT seeding -> GA -> CP-SAT polishing hinted with the GA's best schedule.
+
+    Payload options under "hybrid": seedFraction (share of the initial
+    population seeded, default 0.2), seedTimeSec and polishTimeSec (default
+    15% and 25% of timeLimitSec).
+    """
+    options = payload.get("hybrid") if isinstance(payload.get("hybrid"), dict) else {}
+    total_time = float(payload.get("timeLimitSec", 60))
+    seed_time = float(options.get("seedTimeSec", total_time * SEED_TIME_FRACTION))
+    polish_time = float(options.get("polishTimeSec", total_time * POLISH_TIME_FRACTION))
+    seed_fraction = min(1.0, max(0.0, float(options.get("seedFraction", 0.2))))
+
+    scheduler = build_scheduler(payload)
+    if scheduler.seed is not None:
+        random.seed(scheduler.seed)
+    phases = {}
+
+    start = time.time()
+    scheduler.seed_individuals = seed_individuals(
+        scheduler, payload, max(1, int(scheduler.population_size * seed_fraction)), seed_time)
+    phases["seed_sec"] = round(time.time() - start, 2)
+
+    start = time.time()
+    scheduler.max_runtime = max(1.0, total_time - seed_time - polish_time)
+    if scheduler.termination_config and scheduler.termination_config.get("timeBudgetSec") is not None:
+        scheduler.termination_config = dict(scheduler.termination_config, timeBudgetSec=scheduler.max_runtime)
+    best = scheduler.evolve()
+    if not best:
+        best = scheduler.create_simple_schedule()
+    phases["ga_sec"] = round(time.time() - start, 2)
+    ga_fitness = scheduler.calculate_fitness(best) if best else float('inf')
+
+    start = time.time()
+    polished_fitness = None
+    if best:
+        try:
+            hints = scheduler.format_result(best)["schedules"]
+            polished = solve_with_cp_sat(payload, hint_schedules=hints, time_limit=polish_time,
+                                         instance=scheduler.instance)
+            if polished.get("success") and polished.get("schedules"):
+                candidate = schedules_to_individual(scheduler, polished["schedules"])
+                polished_fitness = scheduler.calculate_fitness(candidate)
+                if polished_fitness < ga_fitness:
+                    best = candidate
+        except Exception as e:
+            print(f"Hybrid: CP-SAT polishing error: {e}", file=sys.stderr)
+    phases["polish_sec"] = round(time.time() - start, 2)
+    if scheduler.telemetry is not None:
+        scheduler.telemetry.emit("hybrid", ga_fitness=ga_fitness, polished_fitness=polished_fitness,
+                                 seeded_individuals=len(scheduler.seed_individuals), phase_sec=phases)
+        scheduler.telemetry.close()
+    print(f"Hybrid: GA fitness {ga_fitness:.2f}, polished fitness "
+          f"{'n/a' if polished_fitness is None else f'{polished_fitness:.2f}'}", file=sys.stderr)
+
+    if not best:
+        return {
+            "success": False,
+            "message": "No valid schedule found",
+            "schedules": [],
+            "errors": ["No solution found"]
+        }
+    result = scheduler.format_result(best)
+    result["hybrid"] = {
+        "seeded_individuals": len(scheduler.seed_individuals),
+        "ga_fitness": ga_fitness,
+        "polished_fitness": polished_fitness,
+        "phases": phases
+    }
+    return result
+
+
+def main() -> None:
+    try:
+        payload = read_input()
+        if not payload:
+            print(json.dumps({"success": False, "message": "Empty input"}))
+            return
+        if not payload.get("instructorData") or not payload.get("rooms"):
+            print(json.dumps({
+                "success": False,
+                "message": "Missing instructorData or rooms",
+                "schedules": [],
+                "errors": ["Invalid input"]
+            }))
+            return
+
+        with profile_run(payload, "hybrid") as profiler:
+            result = solve_hybrid(payload)
+        result = apply_post_check(profiler.attach(result), payload.get("check"), payload.get("rooms"))
+        result = apply_output_mode(result, payload)
+        print(json.dumps(result), flush=True)
+
+    except Exception as e:
+        error_result = {
+            "success": False,
+            "message": f"Hybrid algorithm error: {str(e)}",
+            "schedules": [],
+            "errors": [str(e)]
+        }
+        print(json.dumps(error_result), flush=True)
+
+
+if __name__ == "__main__":
+    main()
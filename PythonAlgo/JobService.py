@@ -0,0 +1,384 @@
+"""Local job service for schedule generation.
+
+    python -m PythonAlgo.JobService [--host 127.0.0.1] [--port 8765] [--socket path] [--capacity N]
+
+Solves run as solver subprocesses (python -m PythonAlgo.<module>) behind a
+small HTTP/1.1 JSON API on localhost or a Unix socket, so the web tier gets
+a job id back immediately instead of waiting for the solve:
+
+    POST   /jobs       {"engine", "payload", "priority", "cores"} -> 202 {"job_id", ...}
+    GET    /jobs       all jobs, without results
+    GET    /jobs/<id>  status, progress (incumbent/bound or generation/best) and the result once done
+    DELETE /jobs/<id>  cancel a queued or running job
+    GET    /health     capacity and load
+
+Jobs wait in a priority queue (lower priority first, FIFO within a
+priority) and start only when their cores fit in the capacity, which
+defaults to the CPU count.
+"""
+import os
+import sys
+import json
+import time
+import heapq
+import signal
+import asyncio
+import argparse
+import itertools
+from collections import deque
+from urllib.parse import urlsplit
+from typing import List, Dict, Any, Tuple, Optional
+
+
+# Engine -> solver module run for it
+ENGINE_MODULES: Dict[str, str] = {
+    'cp_sat': 'PythonAlgo.Scheduler',
+    'ga': 'PythonAlgo.GeneticScheduler',
+    'hybrid': 'PythonAlgo.HybridScheduler',
+    'portfolio': 'PythonAlgo.PortfolioScheduler',
+    'campus': 'PythonAlgo.CampusScheduler',
+    'scenarios': 'PythonAlgo.ScenarioScheduler',
+}
+
+# Finished jobs kept for polling; older ones are forgotten first
+DEFAULT_RETAIN = 200
+
+# Seconds a cancelled solve gets to exit before it is killed
+CANCEL_GRACE_SEC = 2.0
+
+# Solver stderr lines kept per job
+LOG_LINES = 50
+
+# Working directory for the solver modules (the directory containing PythonAlgo)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FINISHED = ('done', 'failed', 'cancelled')
+
+
+class Job:
+    """One queued, running or finished solve"""
+
+    def __init__(self, job_id: str, engine: str, payload: Dict[str, Any], priority: int, cores: int, seq: int):
+        self.id = job_id
+        self.seq = seq
+        self.engine = engine
+        self.payload = payload
+        self.priority = priority
+        self.cores = cores
+        self.status = 'queued'
+        self.progress: Dict[str, Any] = {}
+        self.log: deque = deque(maxlen=LOG_LINES)
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.process: Optional[asyncio.subprocess.Process] = None
+
+    def summary(self, with_result: bool = False) -> Dict[str, Any]:
+        now = time.time()
+        record = {
+            "job_id": self.id,
+            "engine": self.engine,
+            "status": self.status,
+            "priority": self.priority,
+            "cores": self.cores,
+            "progress": self.progress,
+            "created": round(self.created, 3),
+            "queued_sec": round((self.started or self.finished or now) - self.created, 3),
+            "elapsed_sec": round((self.finished or now) - self.started, 3) if self.started else None,
+        }
+        if self.error:
+            record["error"] = self.error
+        if with_result:
+            record["result"] = self.result
+            record["log"] = list(self.log)
+        return record
+
+
+def update_progress(job: Job, record: Dict[str, Any]) -> None:
+    """Fold a solver telemetry record into the job's progress"""
+    event = record.get("event")
+    progress = job.progress
+    if event == 'incumbent':
+        progress.update(engine=record.get("engine"), solutions=record.get("solutions"),
+                        incumbent=record.get("objective"), bound=record.get("bound"),
+                        solve_sec=record.get("elapsed_sec"))
+    elif event == 'generation':
+        fitness = record.get("fitness") or {}
+        progress.update(engine=record.get("engine"), generation=record.get("generation"),
+                        best=fitness.get("best"), conflicts=record.get("conflicts"),
+                        solve_sec=record.get("elapsed_sec"))
+    elif event == 'summary':
+        progress.update({key: value for key, value in record.items() if key not in ("event", "run_id", "ts")})
+
+
+class JobService:
+    """Priority queue of solver jobs run as subprocesses within a core capacity"""
+
+    def __init__(self, capacity: Optional[int] = None, retain: int = DEFAULT_RETAIN):
+        self.capacity = max(1, capacity or os.cpu_count() or 1)
+        self.retain = retain
+        self.jobs: Dict[str, Job] = {}
+        self.queue: List[Tuple[int, int, Job]] = []
+        self.in_use = 0
+        self._seq = itertools.count()
+        self._changed: Optional[asyncio.Condition] = None
+        self._tasks: set = set()
+
+    def submit(self, engine: str, payload: Dict[str, Any], priority: int = 0, cores: int = 1) -> Job:
+        engine = str(engine or 'cp_sat').lower()
+        if engine not in ENGINE_MODULES:
+            raise ValueError(f"Unknown engine: {engine}")
+        if not isinstance(payload, dict):
+            raise ValueError("payload must be an object")
+        cores = min(max(1, int(cores)), self.capacity)
+        payload = dict(payload)
+        # Keep the solver inside its cores and have it report progress on stderr
+        if engine == 'cp_sat':
+            payload["cpSatParameters"] = dict({"num_search_workers": cores}, **(payload.get("cpSatParameters") or {}))
+        elif engine == 'ga':
+            payload.setdefault("workers", cores)
+        payload["telemetry"] = "stderr"
+        seq = next(self._seq)
+        job = Job(f"{int(time.time() * 1000):x}-{seq}", engine, payload, int(priority), cores, seq)
+        self.jobs[job.id] = job
+        heapq.heappush(self.queue, (job.priority, seq, job))
+        self._notify()
+        return job
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        job = self.jobs.get(job_id)
+        if job is None or job.status in FINISHED:
+            return job
+        if job.status == 'queued':
+            # Left in the heap; the dispatcher skips it
+            self._finish(job, 'cancelled')
+            self._notify()
+        elif job.status == 'running':
+            job.status = 'cancelling'
+            self._terminate(job)
+        return job
+
+    def _terminate(self, job: Job) -> None:
+        """SIGTERM the job's process group, then SIGKILL it after a grace period"""
+        if job.process is None:
+            # Not started yet; _run terminates it once it is
+            return
+        _signal_group(job.process, signal.SIGTERM)
+
+        async def kill_later():
+            await asyncio.sleep(CANCEL_GRACE_SEC)
+            _signal_group(job.process, signal.SIGKILL)
+
+        task = asyncio.get_running_loop().create_task(kill_later())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def position(self, job: Job) -> Optional[int]:
+        """0-based place of a queued job in the start order"""
+        if job.status != 'queued':
+            return None
+        return sum(1 for priority, seq, other in self.queue
+                   if other.status == 'queued' and (priority, seq) < (job.priority, job.seq))
+
+    def health(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for job in self.jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {"capacity": self.capacity, "cores_in_use": self.in_use, "jobs": counts}
+
+    async def dispatch(self) -> None:
+        """Start queued jobs in priority order as cores free up.
+
+        The head of the queue waits for enough free cores; later jobs do not
+        overtake it.
+        """
+        self._changed = asyncio.Condition()
+        async with self._changed:
+            while True:
+                while self.queue and self.queue[0][2].status != 'queued':
+                    heapq.heappop(self.queue)
+                if self.queue and self.queue[0][2].cores <= self.capacity - self.in_use:
+                    _, _, job = heapq.heappop(self.queue)
+                    self.in_use += job.cores
+                    job.status = 'running'
+                    job.started = time.time()
+                    task = asyncio.create_task(self._run(job))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+                    continue
+                await self._changed.wait()
+
+    async def _run(self, job: Job) -> None:
+        try:
+            job.process = await asyncio.create_subprocess_exec(
+                sys.executable, "-m", ENGINE_MODULES[job.engine], cwd=PROJECT_ROOT,
+                stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+                # Own process group, so cancelling also stops worker/island processes
+                start_new_session=True, limit=1 << 26)
+            if job.status == 'cancelling':
+                # Cancelled while the process was starting
+                self._terminate(job)
+            watcher = asyncio.create_task(self._watch(job, job.process.stderr))
+            try:
+                job.process.stdin.write(json.dumps(job.payload).encode())
+                await job.process.stdin.drain()
+                job.process.stdin.close()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            stdout = await job.process.stdout.read()
+            await job.process.wait()
+            await watcher
+            if job.status == 'cancelling':
+                self._finish(job, 'cancelled')
+            elif job.process.returncode != 0 or not stdout.strip():
+                job.error = f"solver exited with code {job.process.returncode}"
+                self._finish(job, 'failed')
+            else:
+                # The result is the solver's last stdout line; stray prints above it are ignored
+                job.result = json.loads(stdout.strip().splitlines()[-1])
+                self._finish(job, 'done' if job.result.get("success") else 'failed')
+        except Exception as e:
+            job.error = str(e)
+            self._finish(job, 'failed')
+        finally:
+            job.payload = {}
+            self.in_use -= job.cores
+            self._notify()
+
+    async def _watch(self, job: Job, stream: asyncio.StreamReader) -> None:
+        """Read solver stderr: telemetry records update progress, other lines go to the log"""
+        while True:
+            line = await stream.readline()
+            if not line:
+                return
+            text = line.decode(errors="replace").rstrip()
+            if text.startswith("{"):
+                try:
+                    record = json.loads(text)
+                except ValueError:
+                    record = None
+                if isinstance(record, dict) and "event" in record:
+                    update_progress(job, record)
+                    continue
+            job.log.append(text)
+
+    def _finish(self, job: Job, status: str) -> None:
+        job.status = status
+        job.finished = time.time()
+        finished = [other for other in self.jobs.values() if other.status in FINISHED]
+        for other in sorted(finished, key=lambda other: other.finished)[:max(0, len(finished) - self.retain)]:
+            del self.jobs[other.id]
+
+    def _notify(self) -> None:
+        if self._changed is None:
+            return
+
+        async def notify():
+            async with self._changed:
+                self._changed.notify_all()
+
+        task = asyncio.get_running_loop().create_task(notify())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def route(self, method: str, target: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        """(HTTP status, response object) for one request"""
+        path = urlsplit(target).path.rstrip("/")
+        parts = [part for part in path.split("/") if part]
+        if parts == ["health"] and method == "GET":
+            return 200, self.health()
+        if parts == ["jobs"] and method == "GET":
+            return 200, {"jobs": [job.summary() for job in self.jobs.values()]}
+        if parts == ["jobs"] and method == "POST":
+            try:
+                request = json.loads(body or b"{}")
+                job = self.submit(request.get("engine", 'cp_sat'), request.get("payload"),
+                                  request.get("priority", 0), request.get("cores", 1))
+            except (ValueError, TypeError, AttributeError) as e:
+                return 400, {"success": False, "message": str(e)}
+            return 202, dict(job.summary(), position=self.position(job))
+        if len(parts) == 2 and parts[0] == "jobs":
+            job = self.jobs.get(parts[1])
+            if job is None:
+                return 404, {"success": False, "message": f"Unknown job: {parts[1]}"}
+            if method == "GET":
+                return 200, dict(job.summary(with_result=True), position=self.position(job))
+            if method == "DELETE":
+                return 200, self.cancel(job.id).summary()
+        return 404, {"success": False, "message": f"No route for {method} {path or '/'}"}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """One HTTP/1.1 request per connection"""
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers: Dict[str, str] = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0) or 0))
+            if len(request_line) < 2:
+                status, response = 400, {"success": False, "message": "Bad request"}
+            else:
+                status, response = self.route(request_line[0].upper(), request_line[1], body)
+        except (asyncio.IncompleteReadError, ValueError) as e:
+            status, response = 400, {"success": False, "message": f"Bad request: {e}"}
+        data = json.dumps(response).encode()
+        reason = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found"}.get(status, "")
+        writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode() + data)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+
+def _signal_group(process: Optional[asyncio.subprocess.Process], sig: int) -> None:
+    if process is None or process.returncode is not None:
+        return
+    try:
+        os.killpg(process.pid, sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8765, socket_path: Optional[str] = None,
+                capacity: Optional[int] = None, retain: int = DEFAULT_RETAIN) -> None:
+    service = JobService(capacity, retain)
+    dispatcher = asyncio.create_task(service.dispatch())
+    if socket_path:
+        server = await asyncio.start_unix_server(service.handle, path=socket_path)
+        where = socket_path
+    else:
+        server = await asyncio.start_server(service.handle, host=host, port=port)
+        where = f"http://{host}:{port}"
+    print(f"Job service on {where} with {service.capacity} cores", file=sys.stderr, flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        dispatcher.cancel()
+        for job in service.jobs.values():
+            _signal_group(job.process, signal.SIGTERM)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m PythonAlgo.JobService", description="Run the solver job service")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: localhost)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--socket", help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--capacity", type=int, help="cores shared by running jobs (default: CPU count)")
+    parser.add_argument("--retain", type=int, default=DEFAULT_RETAIN, help="finished jobs kept for polling")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.socket, args.capacity, args.retain))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
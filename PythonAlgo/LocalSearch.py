@@ -0,0 +1,298 @@
+import sys
+import math
+import time
+import random
+from dataclasses import replace
+from typing import List, Dict, Any, Tuple, Optional
+
+try:
+    from .FitnessEngine import FitnessState
+    from .Termination import Progress, build_termination
+except ImportError:
+    from FitnessEngine import FitnessState
+    from Termination import Progress, build_termination
+
+
+# Local search methods selectable with the payload "engine" key
+LOCAL_SEARCH_METHODS = ('tabu', 'annealing')
+
+# Iterations per round; termination policies and telemetry see one round as a generation
+ROUND_ITERATIONS = 100
+
+
+class LocalSearch:
+    """Single-solution search over slot/room moves on the GA's fitness model.
+
+    Works on one FitnessState, so every move is scored incrementally with the
+    GA's constraint weights. method is "tabu" (best of a sampled neighbourhood,
+    recently left placements are tabu unless they beat the best schedule) or
+    "annealing" (random neighbour, worse moves accepted with probability
+    exp(-delta / T) under geometric cooling). Both restart from a perturbed
+    copy of the best schedule when it stops improving.
+
+    Options (payload "localSearch"): tabuTenure, neighbors, initialTemperature,
+    cooling, restartAfter, perturbation, maxRounds.
+    """
+
+    def __init__(self, scheduler, method: str = 'tabu', options: Optional[Dict[str, Any]] = None):
+        if method not in LOCAL_SEARCH_METHODS:
+            raise ValueError(f"Unknown local search method: {method}")
+        options = options or {}
+        self.scheduler = scheduler
+        self.method = method
+        self.tabu_tenure = max(1, int(options.get("tabuTenure", 7 + len(scheduler.courses) // 10)))
+        self.neighbors = max(1, int(options.get("neighbors", 20)))
+        self.initial_temperature = options.get("initialTemperature")
+        self.cooling = float(options.get("cooling", 0.995))
+        self.restart_after = max(1, int(options.get("restartAfter", 500)))
+        self.perturbation = max(1, int(options.get("perturbation", 3)))
+        self.max_rounds = max(1, int(options.get("maxRounds", 1000)))
+        self.restarts = 0
+        self.entry_cls = sys.modules[type(scheduler).__module__].ScheduleEntry
+
+    # ------------------------------------------------------------------
+    # Neighbourhood
+    # ------------------------------------------------------------------
+    # A move is ('move', g, new entry), ('remove', g, None) or ('add', -1, new entry)
+
+    def relocation(self, state: FitnessState, g: int) -> Optional[Any]:
+        """A new time slot, room or both for gene g (same duration); None if it has no alternatives"""
+        s = self.scheduler
+        entry = state.entries[g]
+        rooms = s.candidates_for(entry.course).rooms
+        kind = random.random()
+        if kind < 0.15:
+            session_slots, _ = s.session_slots(entry.course, s.entry_minutes(entry))
+            if session_slots:
+                placement = state.free_placement(g, session_slots, rooms, random.randrange(len(session_slots)))
+                if placement is not None:
+                    return replace(entry, time_slot=placement[0], room=placement[1])
+        if kind < 0.6 or not rooms:
+            slot = s.sample_session_slot(entry.course, s.entry_minutes(entry))
+            return replace(entry, time_slot=slot) if slot is not None else None
+        if kind < 0.85:
+            return replace(entry, room=random.choice(rooms))
+        slot = s.sample_session_slot(entry.course, s.entry_minutes(entry))
+        if slot is None:
+            return None
+        return replace(entry, time_slot=slot, room=random.choice(rooms))
+
+    def random_move(self, state: FitnessState, conflicting: List[int]) -> Optional[Tuple[str, int, Any]]:
+        """Mostly relocations of conflicting sessions; sometimes adds or removes a
+        session within the same bounds as the GA's add/remove mutations"""
+        s = self.scheduler
+        n = len(state.entries)
+        kind = random.random()
+        if kind < 0.05 and n > len(s.courses):
+            return 'remove', random.randrange(n), None
+        if kind < 0.1 and n < len(s.courses) * 3:
+            course = random.choice(s.courses)
+            candidates = s.candidates_for(course)
+            if not candidates.rooms or not candidates.durations:
+                return None
+            slot = s.sample_session_slot(course, int(round(random.choice(candidates.durations) * 60)))
+            if slot is None:
+                return None
+            return 'add', -1, self.entry_cls(course=course, instructor=candidates.instructor,
+                                             room=random.choice(candidates.rooms), time_slot=slot,
+                                             section=candidates.section)
+        conflicting = [g for g in conflicting if g < n]
+        g = random.choice(conflicting) if conflicting and random.random() < 0.8 else random.randrange(n)
+        candidate = self.relocation(state, g)
+        return ('move', g, candidate) if candidate is not None else None
+
+    def apply(self, state: FitnessState, move: Tuple[str, int, Any]) -> Any:
+        """Apply a move and return what undo needs (the replaced or removed entry)"""
+        kind, g, entry = move
+        if kind == 'move':
+            previous = state.entries[g]
+            state.move(g, entry)
+            return previous
+        if kind == 'remove':
+            return state.remove_entry(g)
+        state.add_entry(entry)
+        return None
+
+    def undo(self, state: FitnessState, move: Tuple[str, int, Any], previous: Any) -> None:
+        """Revert apply; a removed entry comes back at the end of the list"""
+        kind, g, _ = move
+        if kind == 'move':
+            state.move(g, previous)
+        elif kind == 'remove':
+            state.add_entry(previous)
+        else:
+            state.remove_entry(len(state.entries) - 1)
+
+    @staticmethod
+    def attribute(entry: Any) -> Tuple[str, str, str, str, int]:
+        """Tabu attribute: a course section at a placement"""
+        return (entry.course.course_code, entry.section, entry.time_slot.day,
+                entry.time_slot.start_time, entry.room.room_id)
+
+    def perturb(self, state: FitnessState) -> None:
+        for _ in range(self.perturbation):
+            g = random.randrange(len(state.entries))
+            candidate = self.relocation(state, g)
+            if candidate is not None:
+                state.move(g, candidate)
+
+    def estimate_temperature(self, state: FitnessState, samples: int = 30) -> float:
+        """Temperature at which an average worsening move is accepted half of the time"""
+        current = state.fitness()
+        conflicting = state.conflicting_genes()
+        worse = []
+        for _ in range(samples):
+            move = self.random_move(state, conflicting)
+            if move is None:
+                continue
+            previous = self.apply(state, move)
+            delta = state.fitness() - current
+            self.undo(state, move, previous)
+            if delta > 0:
+                worse.append(delta)
+        if not worse:
+            return 1.0
+        return (sum(worse) / len(worse)) / math.log(2)
+
+    # ------------------------------------------------------------------
+    # Steps
+    # ------------------------------------------------------------------
+    def tabu_step(self, state: FitnessState, current: float, best: float,
+                  tabu: Dict[Tuple[str, str, str, str, int], int], iteration: int) -> float:
+        """Apply the best non-tabu sampled move (tabu moves pass if they beat the best).
+
+        Evaluating a removal re-appends the entry, shifting gene indices, so
+        sampled moves are remembered by the entry objects they touch.
+        """
+        conflicting = state.conflicting_genes()
+        chosen = None
+        chosen_fitness = float('inf')
+        for _ in range(self.neighbors):
+            move = self.random_move(state, conflicting)
+            if move is None:
+                continue
+            kind, g, entry = move
+            old = state.entries[g] if kind != 'add' else None
+            previous = self.apply(state, move)
+            fitness = state.fitness()
+            self.undo(state, move, previous)
+            if kind != 'remove' and tabu.get(self.attribute(entry), -1) >= iteration and fitness >= best:
+                continue
+            if fitness < chosen_fitness:
+                chosen, chosen_fitness = (kind, old, entry), fitness
+        if chosen is None:
+            return current
+
+        kind, old, entry = chosen
+        expiry = iteration + self.tabu_tenure + random.randrange(self.tabu_tenure)
+        if old is not None:
+            tabu[self.attribute(old)] = expiry
+            g = next(i for i, e in enumerate(state.entries) if e is old)
+            if kind == 'move':
+                return state.move(g, entry)
+            state.remove_entry(g)
+        else:
+            state.add_entry(entry)
+        return state.fitness()
+
+    def annealing_step(self, state: FitnessState, current: float, temperature: float,
+                       conflicting: List[int]) -> float:
+        move = self.random_move(state, conflicting)
+        if move is None:
+            return current
+        previous = self.apply(state, move)
+        fitness = state.fitness()
+        delta = fitness - current
+        if delta <= 0 or (temperature > 0 and random.random() < math.exp(-delta / temperature)):
+            return fitness
+        self.undo(state, move, previous)
+        return current
+
+    # ------------------------------------------------------------------
+    # Driver
+    # ------------------------------------------------------------------
+    def initial_state(self) -> FitnessState:
+        """Best of the repaired seed individuals and a few random individuals"""
+        s = self.scheduler
+        candidates = [s.repair_schedule(list(seed)) for seed in s.seed_individuals]
+        candidates.extend(s.create_individual() for _ in range(3))
+        candidates = [c for c in candidates if c]
+        best = min(candidates, key=s.calculate_fitness)
+        return s.fitness_state(best)
+
+    def run(self) -> List[Any]:
+        s = self.scheduler
+        if s.seed is not None:
+            random.seed(s.seed)
+        individual_cls = sys.modules[type(s).__module__].Individual
+
+        start_time = time.time()
+        policy = build_termination(s.termination_config, s.max_runtime, self.max_rounds)
+        state = self.initial_state()
+        if not state.entries:
+            return []
+
+        current = state.fitness()
+        best = current
+        best_entries = state.entries[:]
+        history: List[float] = []
+        tabu: Dict[Tuple[str, str, str, str, int], int] = {}
+        conflicting: List[int] = []
+        temperature = float(self.initial_temperature) if self.initial_temperature else self.estimate_temperature(state)
+        start_temperature = temperature
+        iteration = 0
+        since_improvement = 0
+        round_number = 0
+        round_start = time.time()
+
+        while True:
+            for _ in range(ROUND_ITERATIONS):
+                if self.method == 'tabu':
+                    current = self.tabu_step(state, current, best, tabu, iteration)
+                else:
+                    # The conflict list is refreshed periodically; stale genes are just less targeted
+                    if iteration % 10 == 0:
+                        conflicting = state.conflicting_genes()
+                    current = self.annealing_step(state, current, temperature, conflicting)
+                    temperature *= self.cooling
+                iteration += 1
+
+                if current < best:
+                    best = current
+                    best_entries = state.entries[:]
+                    since_improvement = 0
+                else:
+                    since_improvement += 1
+
+                if since_improvement >= self.restart_after:
+                    state = FitnessState(s.fitness_engine, best_entries)
+                    self.perturb(state)
+                    current = state.fitness()
+                    tabu.clear()
+                    temperature = start_temperature
+                    since_improvement = 0
+                    self.restarts += 1
+
+            round_number += 1
+            history.append(best)
+            for attribute in [a for a, expiry in tabu.items() if expiry < iteration]:
+                del tabu[attribute]
+            now = time.time()
+            round_sec = now - round_start
+            round_start = now
+            if s.telemetry is not None:
+                s.telemetry.emit("local_search", method=self.method, round=round_number, iterations=iteration,
+                                 current_fitness=current, best_fitness=best, restarts=self.restarts,
+                                 temperature=temperature if self.method == 'annealing' else None,
+                                 tabu_size=len(tabu) if self.method == 'tabu' else None,
+                                 round_sec=round(round_sec, 4), elapsed_sec=round(now - start_time, 4))
+            reason = policy.check(Progress(
+                round_number, now - start_time, best, history, round_sec,
+                lambda: FitnessState(s.fitness_engine, best_entries).hard_conflicts()))
+            if reason:
+                print(f"Local search ({self.method}) stopped: {reason}", file=sys.stderr)
+                break
+
+        print(f"Local search ({self.method}) completed. Best fitness: {best:.2f} after {iteration} moves, "
+              f"{self.restarts} restarts", file=sys.stderr)
+        return individual_cls(FitnessState(s.fitness_engine, best_entries))
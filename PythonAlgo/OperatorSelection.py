@@ -0,0 +1,93 @@
+import random
+from typing import List, Dict, Any, Optional, Tuple
+
+
+class OperatorBandit:
+    """Adaptive operator selection by probability matching.
+
+    Each operator's quality is a recency-weighted average of its reward, the
+    fitness improvement it produced per unit of cost (operators that make
+    things worse earn zero). The cost is a deterministic work count, such as
+    the fitness deltas an application evaluated, so a seeded run picks the
+    same operators every time; the CPU seconds passed to update() are only
+    reported in snapshot(). Selection probabilities are proportional to
+    quality with a floor of min_probability, so no operator starves and the
+    mix follows whatever pays off on the current instance.
+    """
+
+    def __init__(self, names: List[str], min_probability: float = 0.05, learning_rate: float = 0.2,
+                 adaptive: bool = True):
+        self.names: List[str] = []
+        self.min_probability = min_probability
+        self.learning_rate = learning_rate
+        self.adaptive = adaptive
+        self.quality: Dict[str, float] = {}
+        self.uses: Dict[str, int] = {}
+        self.gain: Dict[str, float] = {}
+        self.cost: Dict[str, float] = {}
+        self.seconds: Dict[str, float] = {}
+        # Credits recorded since load() (a worker's copy reports them back)
+        self.credits: Optional[List[Tuple[str, float, float, float]]] = None
+        for name in names:
+            self.add(name)
+
+    def add(self, name: str) -> None:
+        if name in self.quality:
+            return
+        self.names.append(name)
+        self.quality[name] = 0.0
+        self.uses[name] = 0
+        self.gain[name] = 0.0
+        self.cost[name] = 0.0
+        self.seconds[name] = 0.0
+
+    def probabilities(self) -> Dict[str, float]:
+        n = len(self.names)
+        if n == 0:
+            return {}
+        total = sum(self.quality.values())
+        if not self.adaptive or total <= 0:
+            return {name: 1.0 / n for name in self.names}
+        floor = min(self.min_probability, 1.0 / n)
+        share = 1.0 - n * floor
+        return {name: floor + share * self.quality[name] / total for name in self.names}
+
+    def select(self, rng: Optional[random.Random] = None) -> str:
+        rng = rng or random
+        probabilities = self.probabilities()
+        return rng.choices(self.names, weights=[probabilities[name] for name in self.names])[0]
+
+    def update(self, name: str, gain: float, cost: float = 1.0, seconds: float = 0.0) -> None:
+        """Credit an application of `name`: fitness gain (before - after), its work count and CPU seconds"""
+        if self.credits is not None:
+            self.credits.append((name, gain, cost, seconds))
+        self.uses[name] += 1
+        self.cost[name] += cost
+        self.seconds[name] += seconds
+        reward = max(0.0, gain) / max(cost, 1.0)
+        self.gain[name] += max(0.0, gain)
+        self.quality[name] += self.learning_rate * (reward - self.quality[name])
+
+    def state(self) -> Dict[str, Any]:
+        """What selection depends on, for a worker process's copy of the bandit"""
+        return {"quality": dict(self.quality), "adaptive": self.adaptive}
+
+    def load(self, state: Dict[str, Any]) -> None:
+        """Take over state() from another bandit and start recording credits"""
+        self.quality.update(state["quality"])
+        self.adaptive = state["adaptive"]
+        self.credits = []
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Per-operator probability, uses, total gain, cost and CPU seconds (for telemetry)"""
+        probabilities = self.probabilities()
+        return {
+            name: {
+                "p": round(probabilities[name], 4),
+                "uses": self.uses[name],
+                "gain": round(self.gain[name], 2),
+                "cost": round(self.cost[name], 2),
+                "sec": round(self.seconds[name], 4),
+            }
+            for name in self.names
+        }
@@ -0,0 +1,657 @@
+import sys
+import time
+import random
+import hashlib
+import numpy as np
+from typing import List, Dict, Any, Tuple, Optional
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+try:
+    from .DayScheduler import DAYS
+    from .Telemetry import population_stats
+    from .Termination import Progress, ZeroHardConflicts
+except ImportError:
+    from DayScheduler import DAYS
+    from Telemetry import population_stats
+    from Termination import Progress, ZeroHardConflicts
+
+
+# Gene row layout: (course index, day index, start minute, end minute, room index, period index)
+GENE_FIELDS = 6
+
+
+# Task kinds, so tasks of one generation never share a seed
+TASK_CREATE = 'create'
+TASK_BREED = 'breed'
+TASK_ISLAND = 'island'
+
+
+def task_seed(seed: int, generation: int, kind: str, task_id: int) -> int:
+    """Per-task RNG seed from (seed, generation, kind, task id), independent of which worker runs the task."""
+    digest = hashlib.blake2b(f"{seed}:{generation}:{kind}:{task_id}".encode(), digest_size=4).digest()
+    return int.from_bytes(digest, 'big') & 0x7FFFFFFF
+
+
+class GenomeCodec:
+    """Packs GeneticScheduler individuals into int32 gene rows and back."""
+
+    def __init__(self, scheduler: Any):
+        self.scheduler = scheduler
+        self.course_index = {id(c): i for i, c in enumerate(scheduler.courses)}
+        self.room_index = {r.room_id: i for i, r in enumerate(scheduler.rooms)}
+        self.days = list(DAYS)
+        for slot in scheduler.time_slots:
+            if slot.day not in self.days:
+                self.days.append(slot.day)
+        self.day_index = {d: i for i, d in enumerate(self.days)}
+        self.periods = sorted({slot.period for slot in scheduler.time_slots} | {'evening'})
+        self.period_index = {p: i for i, p in enumerate(self.periods)}
+        self.instructors = [scheduler.candidates_for(c).instructor for c in scheduler.courses]
+        self.sections = [scheduler.candidates_for(c).section for c in scheduler.courses]
+        self._time_slots: Dict[Tuple[int, int, int, int], Any] = {}
+
+    def encode(self, individual: List[Any], out: np.ndarray) -> int:
+        """Write an individual into out (capacity x GENE_FIELDS); return the gene count."""
+        n = 0
+        for entry in individual:
+            course = self.course_index.get(id(entry.course))
+            if course is None or n >= len(out):
+                continue
+            ts = entry.time_slot
+            day = self.day_index.get(ts.day)
+            if day is None:
+                continue
+            start = self.scheduler.time_to_minutes(ts.start_time)
+            end = self.scheduler.time_to_minutes(ts.end_time)
+            room = self.room_index.get(entry.room.room_id, -1) if entry.room is not None else -1
+            out[n] = (course, day, start, end, room, self.period_index.get(ts.period, 0))
+            n += 1
+        if n < len(individual):
+            print(f"WARNING: {len(individual) - n} sessions could not be encoded into the genome buffer", file=sys.stderr)
+        return n
+
+    def decode(self, rows: np.ndarray) -> List[Any]:
+        # Entry classes come from the scheduler's own module, which is __main__
+        # when run as python -m PythonAlgo.GeneticScheduler
+        scheduler = self.scheduler
+        module = sys.modules[type(scheduler).__module__]
+        ScheduleEntry, TimeSlot = module.ScheduleEntry, module.TimeSlot
+        individual = []
+        for course, day, start, end, room, period in rows.tolist():
+            key = (day, start, end, period)
+            time_slot = self._time_slots.get(key)
+            if time_slot is None:
+                time_slot = self._time_slots[key] = TimeSlot(
+                    day=self.days[day],
+                    start_time=f"{start // 60:02d}:{start % 60:02d}:00",
+                    end_time=f"{end // 60:02d}:{end % 60:02d}:00",
+                    period=self.periods[period]
+                )
+            individual.append(ScheduleEntry(
+                course=scheduler.courses[course],
+                instructor=self.instructors[course],
+                room=scheduler.rooms[room] if room >= 0 else None,
+                time_slot=time_slot,
+                section=self.sections[course]
+            ))
+        return individual
+
+    @staticmethod
+    def genome_key(rows: np.ndarray) -> bytes:
+        """Order-independent identity of a genome"""
+        if len(rows) == 0:
+            return b''
+        return rows[np.lexsort(rows.T[::-1])].tobytes()
+
+
+class GenomeBuffer:
+    """Fixed-slot genome storage in multiprocessing.shared_memory.
+
+    Each slot holds a gene count followed by capacity x GENE_FIELDS int32 values.
+    """
+
+    def __init__(self, slots: int, capacity: int, name: Optional[str] = None):
+        self.slots = slots
+        self.capacity = capacity
+        size = slots * (capacity * GENE_FIELDS + 1) * 4
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size)
+        table = np.ndarray((slots, capacity * GENE_FIELDS + 1), dtype=np.int32, buffer=self.shm.buf)
+        self.lengths = table[:, 0]
+        self.genes = table[:, 1:].reshape(slots, capacity, GENE_FIELDS)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def read(self, slot: int) -> np.ndarray:
+        return self.genes[slot, :self.lengths[slot]]
+
+    def write(self, slot: int, codec: GenomeCodec, individual: List[Any]) -> None:
+        self.lengths[slot] = codec.encode(individual, self.genes[slot])
+
+    def copy_slot(self, slot: int, other: 'GenomeBuffer', other_slot: int) -> None:
+        n = other.lengths[other_slot]
+        self.genes[slot, :n] = other.genes[other_slot, :n]
+        self.lengths[slot] = n
+
+    def close(self) -> None:
+        self.lengths = self.genes = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+# ----------------------------------------------------------------------
+# Worker side: static problem data is shipped once through the initializer
+# ----------------------------------------------------------------------
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(scheduler_cls, courses, rooms, instructors, instance, time_slots, settings, capacity, slots) -> None:
+    scheduler = scheduler_cls(courses, rooms, instructors, instance)
+    scheduler.time_slots = time_slots
+    scheduler.build_candidate_index()
+    for key, value in settings.items():
+        setattr(scheduler, key, value)
+    _worker['scheduler'] = scheduler
+    _worker['codec'] = GenomeCodec(scheduler)
+    _worker['capacity'] = capacity
+    _worker['slots'] = slots
+    _worker['buffers'] = {}
+
+
+def _buffer(name: str) -> GenomeBuffer:
+    buffers = _worker['buffers']
+    if name not in buffers:
+        buffers[name] = GenomeBuffer(_worker['slots'], _worker['capacity'], name=name)
+    return buffers[name]
+
+
+def _create_task(args: Tuple) -> List[Tuple[int, float]]:
+    """Create fresh individuals into the given slots, each seeded by its slot."""
+    seed, generation, dst_name, dst_slots = args
+    scheduler, codec = _worker['scheduler'], _worker['codec']
+    dst = _buffer(dst_name)
+    results = []
+    for slot in dst_slots:
+        random.seed(task_seed(seed, generation, TASK_CREATE, slot))
+        individual = scheduler.create_individual()
+        dst.write(slot, codec, individual)
+        results.append((slot, scheduler.calculate_fitness(individual)))
+    return results
+
+
+def _breed_task(args: Tuple) -> Tuple[List[Tuple[int, float]], List[Tuple[str, float, float, float]]]:
+    """Crossover + mutation + repair of one parent pair; children go to dst slots.
+
+    The task carries the mutation rate and operator-bandit state it runs
+    with and returns the bandit credits it earned, so its outcome does not
+    depend on the tasks this worker ran before.
+    """
+    seed, mutation_rate, bandit_state, src_name, parent_slots, dst_name, dst_slots = args
+    random.seed(seed)
+    scheduler, codec = _worker['scheduler'], _worker['codec']
+    scheduler.mutation_rate = mutation_rate
+    scheduler.operator_bandit.load(bandit_state)
+    src, dst = _buffer(src_name), _buffer(dst_name)
+    parent1 = codec.decode(src.read(parent_slots[0]))
+    parent2 = codec.decode(src.read(parent_slots[1]))
+    child1, child2 = scheduler.crossover(parent1, parent2)
+    results = []
+    for slot, child in zip(dst_slots, (child1, child2)):
+        child = scheduler.mutate(child)
+        dst.write(slot, codec, child)
+        results.append((slot, scheduler.calculate_fitness(child)))
+    return results, scheduler.operator_bandit.credits
+
+
+# ----------------------------------------------------------------------
+# Driver
+# ----------------------------------------------------------------------
+class ParallelEvolution:
+    """Runs GeneticScheduler.evolve's generation loop across a process pool.
+
+    Selection stays in the parent with its own seeded RNG; offspring creation
+    (crossover, mutation, repair) and fitness evaluation run in workers. Each
+    task is seeded from (seed, generation, kind, task id) and carries the
+    mutable state it runs with: breed tasks get the parent's operator-bandit
+    state as of the generation start, and the parent folds their credits
+    back in task order. Results therefore do not depend on scheduling or
+    the worker count. Genomes move between processes through two
+    shared-memory buffers that swap roles every generation.
+    """
+
+    def __init__(self, scheduler: Any, workers: int, seed: Optional[int] = None):
+        self.scheduler = scheduler
+        self.workers = max(1, workers)
+        self.seed = seed if seed is not None else random.randrange(1 << 30)
+        self.codec = GenomeCodec(scheduler)
+        self.rng = random.Random(self.seed)
+        required = scheduler.fitness_engine.required_sessions
+        self.capacity = 6 * len(scheduler.courses) + required + 8
+        self.slots = scheduler.population_size + 1  # +1: the last pair may overflow
+
+    def _settings(self) -> Dict[str, Any]:
+        s = self.scheduler
+        return {
+            'crossover_rate': s.crossover_rate,
+            'max_repair_passes': s.max_repair_passes,
+            'repair_candidates': s.repair_candidates,
+        }
+
+    def _run_tasks(self, executor: ProcessPoolExecutor, fn, tasks: List[Tuple]) -> Dict[int, float]:
+        fitness = {}
+        for results in executor.map(fn, tasks, chunksize=self._chunksize(tasks)):
+            for slot, value in results:
+                fitness[slot] = value
+        return fitness
+
+    def _breed(self, executor: ProcessPoolExecutor, tasks: List[Tuple]) -> Dict[int, float]:
+        """Run breed tasks; their bandit credits are applied in task order"""
+        fitness = {}
+        bandit = self.scheduler.operator_bandit
+        for results, credits in executor.map(_breed_task, tasks, chunksize=self._chunksize(tasks)):
+            for slot, value in results:
+                fitness[slot] = value
+            for name, gain, cost, seconds in credits:
+                bandit.update(name, gain, cost, seconds)
+        return fitness
+
+    def _chunksize(self, tasks: List[Tuple]) -> int:
+        return max(1, len(tasks) // (self.workers * 4))
+
+    def _create(self, executor, generation: int, buffer: GenomeBuffer, slots: List[int]) -> Dict[int, float]:
+        per_task = max(1, len(slots) // (self.workers * 2))
+        tasks = [(self.seed, generation, buffer.name, slots[k:k + per_task]) for k in range(0, len(slots), per_task)]
+        return self._run_tasks(executor, _create_task, tasks)
+
+    def _tournament(self, scored: List[Tuple[float, int]]) -> int:
+        size = min(self.scheduler.tournament_size, len(scored))
+        return min(self.rng.sample(scored, size))[1]
+
+    def run(self) -> List[Any]:
+        s = self.scheduler
+        print(f"Parallel evolution with {self.workers} workers (seed {self.seed})", file=sys.stderr)
+        start_time = time.time()
+        policy = s.termination_policy()
+        if s.population_scaling:
+            s.scale_population(policy.budget() or s.max_runtime)
+            self.slots = s.population_size + 1
+
+        current = GenomeBuffer(self.slots, self.capacity)
+        spare = GenomeBuffer(self.slots, self.capacity)
+        best_rows = None
+        best_fitness = float('inf')
+        stagnation_count = 0
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(type(s), s.courses, s.rooms, s.instructors, s.instance, s.time_slots, self._settings(),
+                          self.capacity, self.slots),
+            ) as executor:
+                s.timer.take()
+                s.timer.start('initialization')
+                # Seed individuals (repaired here) take the first slots
+                seeds = [s.repair_schedule(list(seed)) for seed in s.seed_individuals[:s.population_size]]
+                fitness = {}
+                for slot, seed in enumerate(seeds):
+                    current.write(slot, self.codec, seed)
+                    fitness[slot] = s.calculate_fitness(seed)
+                fitness.update(self._create(executor, -1, current, list(range(len(seeds), s.population_size))))
+                s.timer.stop()
+                duplicates = []
+
+                generation = 0
+                generation_start = start_time
+                while True:
+                    scored = sorted((fitness[slot], slot) for slot in range(s.population_size))
+                    current_best_fitness, best_slot = scored[0]
+                    if current_best_fitness < best_fitness:
+                        best_fitness = current_best_fitness
+                        best_rows = current.read(best_slot).copy()
+                        stagnation_count = 0
+                    else:
+                        stagnation_count += 1
+                    s.best_fitness_history.append(current_best_fitness)
+                    if s.telemetry is not None:
+                        self._emit(generation, scored, current, best_slot, stagnation_count,
+                                   len(duplicates), time.time() - start_time)
+
+                    if s.adaptive_mutation:
+                        if stagnation_count > 10:
+                            s.mutation_rate = min(0.3, s.mutation_rate * 1.1)
+                        elif stagnation_count < 5:
+                            s.mutation_rate = max(0.05, s.mutation_rate * 0.95)
+
+                    if len(s.courses) <= 10 or generation % 5 == 0:
+                        print(f"Generation {generation + 1}: Best fitness = {current_best_fitness:.2f}, "
+                              f"Mutation rate = {s.mutation_rate:.3f}, Stagnation = {stagnation_count}", file=sys.stderr)
+
+                    generation += 1
+                    now = time.time()
+                    reason = policy.check(Progress(
+                        generation=generation,
+                        elapsed=now - start_time,
+                        best_fitness=best_fitness,
+                        history=s.best_fitness_history,
+                        generation_sec=now - generation_start,
+                        hard_conflicts=lambda: s.hard_conflicts(self.codec.decode(best_rows))
+                    ))
+                    if reason:
+                        print(f"Stopping: {reason}", file=sys.stderr)
+                        break
+                    generation_start = now
+
+                    if stagnation_count >= s.stagnation_limit:
+                        print(f"Stagnation limit reached. Restarting with best solution...", file=sys.stderr)
+                        spare.genes[0, :len(best_rows)] = best_rows
+                        spare.lengths[0] = len(best_rows)
+                        fitness = {0: best_fitness}
+                        fitness.update(self._create(executor, generation, spare, list(range(1, s.population_size))))
+                        current, spare = spare, current
+                        stagnation_count = 0
+                        continue
+
+                    # Elites are copied into the next buffer by the parent
+                    new_fitness = {}
+                    elite_count = min(s.elite_size, s.population_size)
+                    for slot, (value, src_slot) in enumerate(scored[:elite_count]):
+                        spare.copy_slot(slot, current, src_slot)
+                        new_fitness[slot] = value
+
+                    s.timer.start('selection')
+                    tasks = []
+                    bandit_state = s.operator_bandit.state()
+                    for task_id, slot in enumerate(range(elite_count, s.population_size, 2)):
+                        parents = (self._tournament(scored), self._tournament(scored))
+                        tasks.append((task_seed(self.seed, generation, TASK_BREED, task_id), s.mutation_rate,
+                                      bandit_state, current.name, parents, spare.name, (slot, slot + 1)))
+                    s.timer.stop()
+                    # Crossover, mutation, repair and evaluation run in the workers
+                    s.timer.start('breeding')
+                    children = self._breed(executor, tasks)
+                    s.timer.stop()
+                    new_fitness.update((slot, value) for slot, value in children.items()
+                                       if slot < s.population_size)
+
+                    # Replace duplicate genomes with fresh individuals
+                    s.timer.start('deduplication')
+                    seen = set()
+                    duplicates = []
+                    for slot in range(s.population_size):
+                        key = GenomeCodec.genome_key(spare.read(slot))
+                        if key in seen:
+                            duplicates.append(slot)
+                        seen.add(key)
+                    if duplicates:
+                        new_fitness.update(self._create(executor, generation, spare, duplicates))
+                    s.timer.stop()
+
+                    fitness = new_fitness
+                    current, spare = spare, current
+        finally:
+            current.close()
+            spare.close()
+
+        print(f"Evolution completed. Best fitness: {best_fitness:.2f}", file=sys.stderr)
+        if s.telemetry is not None:
+            s.telemetry.emit("summary", engine="parallel", workers=self.workers, best=best_fitness,
+                             generations=len(s.best_fitness_history),
+                             elapsed_sec=round(time.time() - start_time, 4))
+        return self.codec.decode(best_rows) if best_rows is not None else []
+
+    def _emit(self, generation: int, scored: List[Tuple[float, int]], buffer: GenomeBuffer,
+              best_slot: int, stagnation: int, duplicates: int, elapsed: float) -> None:
+        s = self.scheduler
+        rows = [buffer.read(slot) for _, slot in scored]
+        total = sum(len(r) for r in rows)
+        # Course/day/start/room placements (the genome's identity per gene)
+        placements = {tuple(gene) for r in rows for gene in r[:, :5].tolist()}
+        s.telemetry.emit(
+            "generation",
+            engine="parallel",
+            generation=generation,
+            elapsed_sec=round(elapsed, 4),
+            fitness=population_stats([f for f, _ in scored]),
+            conflicts=s.detect_conflicts(self.codec.decode(buffer.read(best_slot))),
+            diversity={"distinct_placements": len(placements) / total if total else 0.0,
+                       "duplicates_replaced": duplicates},
+            sessions=int(buffer.lengths[best_slot]),
+            mutation_rate=s.mutation_rate,
+            stagnation=stagnation,
+            phase_sec={phase: round(t, 5) for phase, t in s.timer.take().items()}
+        )
+
+
+# ----------------------------------------------------------------------
+# Island model
+# ----------------------------------------------------------------------
+TOPOLOGIES = ('ring', 'complete', 'random')
+
+
+def migration_targets(topology: str, islands: int, rng: random.Random) -> Dict[int, List[int]]:
+    """Islands each island sends its emigrants to"""
+    if islands < 2:
+        return {0: []}
+    if topology == 'complete':
+        return {i: [j for j in range(islands) if j != i] for i in range(islands)}
+    if topology == 'random':
+        return {i: [rng.choice([j for j in range(islands) if j != i])] for i in range(islands)}
+    return {i: [(i + 1) % islands] for i in range(islands)}
+
+
+def island_rates(index: int, islands: int, mutation_rate: float, crossover_rate: float) -> Tuple[float, float]:
+    """Spread mutation from 0.5x to 2x the base rate and crossover from 0.9 to 0.6
+    across islands so they explore differently."""
+    if islands < 2:
+        return mutation_rate, crossover_rate
+    t = index / (islands - 1)
+    return min(0.5, mutation_rate * 2 ** (2 * t - 1)), 0.9 - 0.3 * t
+
+
+def _island_main(conn, scheduler_cls, courses, rooms, instructors, instance, time_slots, settings, seed) -> None:
+    """Island process: keeps its population locally and runs epochs on request.
+
+    Messages: ('epoch', generations, deadline, immigrant rows) replies with
+    (best fitness, emigrant rows, generations run, best hard conflicts); ('best',) replies with the
+    best rows; ('stop',) exits.
+    """
+    random.seed(seed)
+    scheduler = scheduler_cls(courses, rooms, instructors, instance)
+    scheduler.time_slots = time_slots
+    scheduler.build_candidate_index()
+    for key, value in settings.items():
+        setattr(scheduler, key, value)
+    codec = GenomeCodec(scheduler)
+    capacity = 6 * len(courses) + scheduler.fitness_engine.required_sessions + 8
+    buffer = np.zeros((capacity, GENE_FIELDS), dtype=np.int32)
+
+    def rows(individual):
+        n = codec.encode(individual, buffer)
+        return buffer[:n].copy()
+
+    population = [scheduler.create_individual() for _ in range(scheduler.population_size)]
+    best_fitness, best_individual = float('inf'), None
+    stagnation_count = 0
+    # An epoch ends early on a conflict-free best only when the run's policy stops there
+    stop_at_zero = any(isinstance(p, ZeroHardConflicts) for p in scheduler.termination_policy().policies)
+    best_hard = None
+
+    while True:
+        message = conn.recv()
+        if message[0] == 'stop':
+            break
+        if message[0] == 'best':
+            conn.send(rows(best_individual) if best_individual is not None else None)
+            continue
+
+        _, generations, deadline, immigrants = message
+        fitness_scores = sorted(((scheduler.cached_fitness(ind), ind) for ind in population), key=lambda x: x[0])
+        # Immigrants replace the worst individuals
+        for k, genome in enumerate(immigrants[:len(fitness_scores) - 1]):
+            individual = codec.decode(genome)
+            fitness_scores[-1 - k] = (scheduler.cached_fitness(individual), individual)
+        fitness_scores.sort(key=lambda x: x[0])
+        population = [ind for _, ind in fitness_scores]
+
+        ran = 0
+        generation_sec = 0.0
+        for _ in range(generations):
+            if ran and time.time() + generation_sec > deadline:
+                break
+            generation_start = time.time()
+            current_best_fitness, current_best = fitness_scores[0]
+            if current_best_fitness < best_fitness:
+                best_fitness, best_individual = current_best_fitness, current_best.copy()
+                best_hard = scheduler.hard_conflicts(best_individual) if stop_at_zero else None
+                stagnation_count = 0
+            else:
+                stagnation_count += 1
+            if scheduler.adaptive_mutation:
+                if stagnation_count > 10:
+                    scheduler.mutation_rate = min(0.3, scheduler.mutation_rate * 1.1)
+                elif stagnation_count < 5:
+                    scheduler.mutation_rate = max(0.05, scheduler.mutation_rate * 0.95)
+            if best_hard == 0:
+                break
+            population = scheduler.next_generation(population, fitness_scores, deadline)
+            fitness_scores = sorted(((scheduler.cached_fitness(ind), ind) for ind in population), key=lambda x: x[0])
+            generation_sec = time.time() - generation_start
+            ran += 1
+
+        if fitness_scores[0][0] < best_fitness:
+            best_fitness, best_individual = fitness_scores[0][0], fitness_scores[0][1].copy()
+        emigrants = [rows(ind) for _, ind in fitness_scores[:settings.get('migration_size', 0)]]
+        conn.send((best_fitness, emigrants, ran, scheduler.hard_conflicts(best_individual)))
+
+
+class IslandEvolution:
+    """Island-model GA: independent sub-populations in separate processes.
+
+    Each island evolves migration_interval generations on its own with its own
+    mutation/crossover rates, then sends copies of its migration_size best
+    individuals to its neighbours on the migration topology, where they replace
+    the worst. Only migrants cross process boundaries.
+    """
+
+    def __init__(self, scheduler: Any, islands: int, seed: Optional[int] = None):
+        self.scheduler = scheduler
+        self.islands = max(1, islands)
+        self.seed = seed if seed is not None else random.randrange(1 << 30)
+        self.rng = random.Random(self.seed)
+        self.topology = scheduler.migration_topology if scheduler.migration_topology in TOPOLOGIES else 'ring'
+        self.codec = GenomeCodec(scheduler)
+
+    def _settings(self, index: int) -> Dict[str, Any]:
+        s = self.scheduler
+        mutation_rate, crossover_rate = island_rates(index, self.islands, s.mutation_rate, s.crossover_rate)
+        return {
+            'population_size': s.population_size,
+            'elite_size': s.elite_size,
+            'tournament_size': s.tournament_size,
+            'adaptive_mutation': s.adaptive_mutation,
+            'max_repair_passes': s.max_repair_passes,
+            'repair_candidates': s.repair_candidates,
+            'mutation_rate': mutation_rate,
+            'crossover_rate': crossover_rate,
+            'migration_size': s.migration_size,
+            'termination_config': s.termination_config,
+        }
+
+    def run(self) -> List[Any]:
+        import multiprocessing
+        s = self.scheduler
+        print(f"Island evolution: {self.islands} islands, {self.topology} topology, "
+              f"migrating {s.migration_size} every {s.migration_interval} generations (seed {self.seed})", file=sys.stderr)
+        start_time = time.time()
+        policy = s.termination_policy()
+        deadline = start_time + (policy.budget() or s.max_runtime)
+        if s.population_scaling:
+            # Islands run concurrently, so each gets the whole budget
+            s.scale_population(policy.budget() or s.max_runtime)
+
+        connections, processes = [], []
+        for i in range(self.islands):
+            parent_conn, child_conn = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_island_main,
+                args=(child_conn, type(s), s.courses, s.rooms, s.instructors, s.instance, s.time_slots,
+                      self._settings(i), task_seed(self.seed, -1, TASK_ISLAND, i)),
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            connections.append(parent_conn)
+            processes.append(process)
+
+        best_fitness, best_island = float('inf'), 0
+        epoch_start = start_time
+        # Seed individuals reach every island as first-epoch immigrants
+        seed_rows = []
+        for seed in s.seed_individuals:
+            rows = np.zeros((6 * len(s.courses) + s.fitness_engine.required_sessions + 8, GENE_FIELDS), dtype=np.int32)
+            seed_rows.append(rows[:self.codec.encode(seed, rows)])
+        inbox: Dict[int, List[np.ndarray]] = {i: list(seed_rows) for i in range(self.islands)}
+        generation = 0
+        try:
+            while True:
+                epoch = s.migration_interval
+                for i, conn in enumerate(connections):
+                    conn.send(('epoch', epoch, deadline, inbox[i]))
+                replies = [conn.recv() for conn in connections]
+                generation += max(reply[2] for reply in replies)
+
+                for i, (fitness, _, _, _) in enumerate(replies):
+                    if fitness < best_fitness:
+                        best_fitness, best_island = fitness, i
+                s.best_fitness_history.append(best_fitness)
+                print(f"Generation {generation}: Best fitness = {best_fitness:.2f} "
+                      f"(islands: {', '.join(f'{reply[0]:.0f}' for reply in replies)})", file=sys.stderr)
+                if s.telemetry is not None:
+                    s.telemetry.emit("epoch", engine="islands", generation=generation,
+                                     elapsed_sec=round(time.time() - start_time, 4), best=best_fitness,
+                                     island_best=[reply[0] for reply in replies],
+                                     island_generations=[reply[2] for reply in replies],
+                                     phase_sec={"epoch": round(time.time() - epoch_start, 5)})
+
+                now = time.time()
+                # Epoch granularity: generation_sec is the epoch duration
+                reason = policy.check(Progress(
+                    generation=generation,
+                    elapsed=now - start_time,
+                    best_fitness=best_fitness,
+                    history=s.best_fitness_history,
+                    generation_sec=now - epoch_start,
+                    hard_conflicts=lambda: replies[best_island][3]
+                ))
+                if reason:
+                    print(f"Stopping: {reason}", file=sys.stderr)
+                    break
+                epoch_start = now
+
+                inbox = {i: [] for i in range(self.islands)}
+                for source, targets in migration_targets(self.topology, self.islands, self.rng).items():
+                    for target in targets:
+                        inbox[target].extend(replies[source][1])
+
+            connections[best_island].send(('best',))
+            best_rows = connections[best_island].recv()
+        finally:
+            for conn in connections:
+                try:
+                    conn.send(('stop',))
+                except (BrokenPipeError, OSError):
+                    pass
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+
+        print(f"Evolution completed. Best fitness: {best_fitness:.2f}", file=sys.stderr)
+        if s.telemetry is not None:
+            s.telemetry.emit("summary", engine="islands", islands=self.islands, best=best_fitness,
+                             generations=generation, elapsed_sec=round(time.time() - start_time, 4))
+        return self.codec.decode(best_rows) if best_rows is not None else []
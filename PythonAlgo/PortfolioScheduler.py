@@ -0,0 +1,250 @@
+import os
+import sys
+import json
+import time
+import signal
+import multiprocessing
+from multiprocessing.connection import wait
+from typing import List, Dict, Any, Tuple, Optional
+
+try:
+    from .GeneticScheduler import build_scheduler, read_input
+    from .export import apply_output_mode
+    from .check import apply_post_check, check_schedules
+    from .Profiling import profile_run
+except ImportError:
+    from GeneticScheduler import build_scheduler, read_input
+    from export import apply_output_mode
+    from check import apply_post_check, check_schedules
+    from Profiling import profile_run
+
+
+# Engines a portfolio entrant can run
+ENGINES = ('cp_sat', 'ga', 'tabu', 'annealing', 'hybrid')
+
+# Seconds entrants may overrun the shared deadline before they are killed
+MAX_GRACE_SEC = 5.0
+
+# Seconds cancelled entrants get to clean up (worker pools, shared memory) before SIGKILL
+CANCEL_GRACE_SEC = 2.0
+
+
+def solve_engine(engine: str, payload: Dict[str, Any], budget: float,
+                 parameters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Solve a payload with one engine (ENGINES) within budget seconds; parameters apply to CP-SAT"""
+    if engine == 'cp_sat':
+        try:
+            from .Scheduler import solve_with_cp_sat
+        except ImportError:
+            from Scheduler import solve_with_cp_sat
+        return solve_with_cp_sat(payload, time_limit=budget, parameters=parameters)
+    if engine == 'hybrid':
+        try:
+            from .HybridScheduler import solve_hybrid
+        except ImportError:
+            from HybridScheduler import solve_hybrid
+        return solve_hybrid(dict(payload, timeLimitSec=budget))
+    # GA and local search stop a little early; they finish the generation or round in flight
+    termination = dict(payload.get("termination") or {}, timeBudgetSec=budget * 0.9)
+    scheduler = build_scheduler(dict(payload, engine=engine, termination=termination))
+    try:
+        return scheduler.solve()
+    finally:
+        if scheduler.telemetry is not None:
+            scheduler.telemetry.close()
+
+
+def _run_entrant(conn, engine: str, payload: Dict[str, Any], deadline: float,
+                 parameters: Optional[Dict[str, Any]]) -> None:
+    """Entrant process: solve within the deadline and send the result dict"""
+    # stdout carries only the portfolio's result
+    sys.stdout = sys.stderr
+    # Own process group, so cancelling also stops worker/island processes
+    os.setsid()
+    entrant_pid = os.getpid()
+
+    def on_sigterm(signum, frame):
+        if os.getpid() != entrant_pid:
+            # Forked worker or island: exit as the default handler would
+            os._exit(128 + signum)
+        # Unwind, so pools shut down and shared memory is unlinked
+        raise SystemExit(128 + signum)
+
+    signal.signal(signal.SIGTERM, on_sigterm)
+    try:
+        result = solve_engine(engine, payload, max(1.0, deadline - time.time()), parameters)
+    except Exception as e:
+        result = {"success": False, "message": f"{engine} error: {e}", "schedules": [], "errors": [str(e)]}
+    try:
+        conn.send(result)
+    finally:
+        conn.close()
+
+
+def _signal_entrant(process: multiprocessing.Process, sig: int) -> None:
+    """Signal an entrant's process group, or the entrant alone if it has not started its group yet"""
+    try:
+        os.killpg(process.pid, sig)
+    except (ProcessLookupError, PermissionError):
+        if process.exitcode is None:
+            try:
+                os.kill(process.pid, sig)
+            except ProcessLookupError:
+                pass
+
+
+def portfolio_entrants(options: Dict[str, Any]) -> List[Tuple[str, str, Optional[Dict[str, Any]]]]:
+    """(name, engine, CP-SAT parameters) per entrant.
+
+    options["engines"] lists engines (default cp_sat and ga); each of
+    options["profiles"] ({"name", "parameters"}) adds a CP-SAT entrant with
+    those solver parameters.
+    """
+    entrants = []
+    for engine in options.get("engines") or ['cp_sat', 'ga']:
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown portfolio engine: {engine}")
+        entrants.append((engine, engine, None))
+    for i, profile in enumerate(options.get("profiles") or []):
+        entrants.append((str(profile.get("name") or f"cp_sat_{i + 1}"), 'cp_sat', dict(profile.get("parameters") or {})))
+    return entrants
+
+
+def score_result(result: Dict[str, Any], scheduler: Any) -> Tuple[float, float]:
+    """(hard conflicts, objective) of a result; lower is better.
+
+    Hard conflicts are instructor/room/section overlaps counted by the
+    checker, the same way for every engine. The objective is the GA fitness
+    of the schedule.
+    """
+    schedules = result.get("schedules") or []
+    if not result.get("success") or not schedules:
+        return float('inf'), float('inf')
+    hard = check_schedules(schedules)["total_conflicts"]
+    try:
+        try:
+            from .HybridScheduler import schedules_to_individual
+        except ImportError:
+            from HybridScheduler import schedules_to_individual
+        objective = scheduler.calculate_fitness(schedules_to_individual(scheduler, schedules))
+    except Exception as e:
+        print(f"Portfolio: objective unavailable: {e}", file=sys.stderr)
+        objective = float('inf')
+    return float(hard), objective
+
+
+def solve_portfolio(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Race several engines on one payload under a shared deadline.
+
+    Options under "portfolio": engines, profiles, timeLimitSec (default the
+    payload's timeLimitSec, else 60) and acceptHardConflicts (default 0).
+    The first result at or below the acceptance threshold wins and the other
+    entrants are terminated. Otherwise the best result by (hard conflicts,
+    objective) at the deadline wins.
+    """
+    options = payload.get("portfolio") if isinstance(payload.get("portfolio"), dict) else {}
+    total_time = float(options.get("timeLimitSec", payload.get("timeLimitSec", 60)))
+    accept = float(options.get("acceptHardConflicts", 0))
+    entrants = portfolio_entrants(options)
+    entrant_payload = {key: value for key, value in payload.items() if key not in ("portfolio", "check", "telemetry")}
+
+    start = time.time()
+    deadline = start + total_time
+    running: Dict[Any, Tuple[str, multiprocessing.Process]] = {}
+    for name, engine, parameters in entrants:
+        parent_conn, child_conn = multiprocessing.Pipe(duplex=False)
+        # Not daemonic: GA entrants may start worker or island processes
+        process = multiprocessing.Process(target=_run_entrant,
+                                          args=(child_conn, engine, entrant_payload, deadline, parameters))
+        process.start()
+        child_conn.close()
+        running[parent_conn] = (name, process)
+
+    # Scoring model; built while the entrants start up
+    scheduler = build_scheduler(entrant_payload)
+
+    report: Dict[str, Dict[str, Any]] = {name: {"engine": engine, "status": "running"} for name, engine, _ in entrants}
+    results: Dict[str, Tuple[Tuple[float, float], Dict[str, Any]]] = {}
+    winner = None
+    grace = min(MAX_GRACE_SEC, 0.1 * total_time)
+    while running and winner is None:
+        remaining = deadline + grace - time.time()
+        if remaining <= 0:
+            break
+        for conn in wait(list(running), timeout=remaining):
+            name, process = running.pop(conn)
+            try:
+                result = conn.recv()
+            except EOFError:
+                result = {"success": False, "message": f"{name} exited with code {process.exitcode}", "schedules": []}
+            conn.close()
+            score = score_result(result, scheduler)
+            results[name] = (score, result)
+            report[name].update(status="finished", success=bool(result.get("success")),
+                                hard_conflicts=score[0] if score[0] != float('inf') else None,
+                                objective=score[1] if score[1] != float('inf') else None,
+                                elapsed_sec=round(time.time() - start, 2))
+            print(f"Portfolio: {name} finished after {time.time() - start:.1f}s "
+                  f"(hard conflicts {score[0]}, objective {score[1]:.2f})", file=sys.stderr)
+            if result.get("success") and score[0] <= accept and winner is None:
+                winner = name
+
+    # Cancel the losers: SIGTERM their process groups, then SIGKILL whatever is left
+    for conn, (name, process) in running.items():
+        _signal_entrant(process, signal.SIGTERM)
+        report[name]["status"] = "cancelled" if winner is not None else "timed out"
+    kill_at = time.time() + CANCEL_GRACE_SEC
+    for conn, (name, process) in running.items():
+        process.join(max(0.0, kill_at - time.time()))
+        _signal_entrant(process, signal.SIGKILL)
+        process.join(1.0)
+        conn.close()
+
+    if winner is None and results:
+        winner = min(results, key=lambda name: results[name][0])
+    if winner is None or not results[winner][1].get("success"):
+        return {
+            "success": False,
+            "message": "No portfolio entrant produced a schedule",
+            "schedules": [],
+            "errors": ["No solution found"],
+            "portfolio": {"winner": None, "entrants": report, "elapsed_sec": round(time.time() - start, 2)}
+        }
+    result = results[winner][1]
+    result["portfolio"] = {"winner": winner, "entrants": report, "elapsed_sec": round(time.time() - start, 2)}
+    return result
+
+
+def main() -> None:
+    try:
+        payload = read_input()
+        if not payload:
+            print(json.dumps({"success": False, "message": "Empty input"}))
+            return
+        if not payload.get("instructorData") or not payload.get("rooms"):
+            print(json.dumps({
+                "success": False,
+                "message": "Missing instructorData or rooms",
+                "schedules": [],
+                "errors": ["Invalid input"]
+            }))
+            return
+
+        with profile_run(payload, "portfolio") as profiler:
+            result = solve_portfolio(payload)
+        result = apply_post_check(profiler.attach(result), payload.get("check"), payload.get("rooms"))
+        result = apply_output_mode(result, payload)
+        print(json.dumps(result), flush=True)
+
+    except Exception as e:
+        error_result = {
+            "success": False,
+            "message": f"Portfolio error: {str(e)}",
+            "schedules": [],
+            "errors": [str(e)]
+        }
+        print(json.dumps(error_result), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+import numpy as np
+from typing import List, Dict, Any, Optional, Tuple
+
+try:
+    from .DayScheduler import DAYS, day_indices, clock_minutes
+    from .RoomScheduler import RoomCompatibility
+    from .TimeScheduler import (generate_comprehensive_time_slots, filter_time_slots_by_employment,
+                                generate_randomized_sessions, is_lunch_break_violation, time_to_minutes)
+except ImportError:
+    from DayScheduler import DAYS, day_indices, clock_minutes
+    from RoomScheduler import RoomCompatibility
+    from TimeScheduler import (generate_comprehensive_time_slots, filter_time_slots_by_employment,
+                               generate_randomized_sessions, is_lunch_break_violation, time_to_minutes)
+
+
+# Employment codes shared with FitnessEngine (anything else is 2)
+EMPLOYMENT_CODES = {'FULL-TIME': 0, 'PART-TIME': 1}
+
+
+def expand_blocks(raw_block: Any) -> List[str]:
+    """Split a block field such as "A & B" or "A, C" into individual blocks"""
+    raw_block = (raw_block or "").strip()
+    if raw_block.upper() in ("A & B", "A&B"):
+        return ["A", "B"]
+    if "," in raw_block:
+        return [b.strip() for b in raw_block.split(",") if b.strip()]
+    if raw_block:
+        return [raw_block]
+    # Default to "A" if empty
+    return ["A"]
+
+
+def section_key(dept: str, year_level: str, block: str) -> str:
+    """Section identifier used by the GA ("<dept>-<year level> <block>")"""
+    return f"{dept}-{year_level} {block}"
+
+
+def parse_course(course_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize one instructorData row (defaults as the solvers have always applied them)"""
+    session_type = str(course_data.get("sessionType", "Non-Lab session") or "").strip().lower()
+    return {
+        "name": course_data.get("name", ""),
+        "courseCode": course_data.get("courseCode", ""),
+        "subject": course_data.get("subject", ""),
+        "unit": int(course_data.get("unit", 3)),
+        "yearLevel": course_data.get("yearLevel", "1st Year"),
+        "block": course_data.get("block", "A"),
+        "employmentType": course_data.get("employmentType", "FULL-TIME"),
+        "dept": course_data.get("dept", "General"),
+        "requires_lab": session_type == "lab session",
+    }
+
+
+class ProblemInstance:
+    """A payload compiled once for every engine.
+
+    Strings are interned to dense integer ids (instructors, subjects,
+    sections, rooms) and per-course, per-session, per-room and per-slot data
+    is kept as parallel NumPy arrays indexed by those ids. Session durations
+    are fixed here, so all engines schedule the same sessions. Room
+    compatibility (capacity, lab match, active) comes from one
+    RoomScheduler.RoomCompatibility: course types x rooms, with rooms grouped
+    into equivalence classes, expanded to a courses x rooms boolean matrix.
+    Slot fit for a session length is a boolean mask over slots.
+    """
+
+    __slots__ = (
+        'courses', 'rooms', 'time_slots',
+        'instructor_names', 'instructor_employment', 'instructor_index',
+        'subject_codes', 'subject_index', 'section_keys', 'section_index', 'room_index',
+        'course_instructor', 'course_subject', 'course_section', 'course_units',
+        'course_employment', 'course_students', 'course_lab',
+        'session_offsets', 'session_course', 'session_hours', 'session_minutes',
+        'room_capacity', 'room_is_lab', 'room_active', 'room_compatibility', 'course_type', 'room_compat',
+        'slot_day', 'slot_start', 'slot_end', 'slot_minutes', 'slot_lunch',
+        'employment_slots', 'reserved_rooms', '_fit_masks',
+    )
+
+    def __init__(self, courses: List[Dict[str, Any]], rooms: List[Dict[str, Any]], time_slots: List[Dict[str, Any]],
+                 reserved_rooms: Optional[List[Dict[str, Any]]] = None):
+        self.courses = courses
+        self.rooms = rooms
+        self.time_slots = time_slots
+
+        # Interned ids (first-seen order)
+        self.instructor_names: List[str] = []
+        self.instructor_employment: List[str] = []
+        self.instructor_index: Dict[str, int] = {}
+        self.subject_codes: List[str] = []
+        self.subject_index: Dict[str, int] = {}
+        self.section_keys: List[str] = []
+        self.section_index: Dict[str, int] = {}
+        self.room_index: Dict[Any, int] = {}
+        for r, room in enumerate(rooms):
+            self.room_index.setdefault(room.get("room_id", 0), r)
+
+        n = len(courses)
+        instructor = np.empty(n, dtype=np.int32)
+        subject = np.empty(n, dtype=np.int32)
+        section = np.empty(n, dtype=np.int32)
+        offsets = [0]
+        session_hours: List[float] = []
+        for c, course in enumerate(courses):
+            name = course["name"]
+            if name not in self.instructor_index:
+                self.instructor_index[name] = len(self.instructor_names)
+                self.instructor_names.append(name)
+                self.instructor_employment.append(course["employmentType"])
+            instructor[c] = self.instructor_index[name]
+            subject[c] = self._intern(self.subject_index, self.subject_codes, course["courseCode"])
+            section[c] = self._intern(self.section_index, self.section_keys,
+                                      section_key(course["dept"], course["yearLevel"], course["block"]))
+            session_hours.extend(generate_randomized_sessions(course["unit"], course["employmentType"]))
+            offsets.append(len(session_hours))
+
+        self.course_instructor = instructor
+        self.course_subject = subject
+        self.course_section = section
+        self.course_units = np.array([course["unit"] for course in courses], dtype=np.int32)
+        self.course_employment = np.array([EMPLOYMENT_CODES.get(course["employmentType"], 2) for course in courses],
+                                          dtype=np.int8)
+        self.course_students = np.clip(self.course_units * 10, 20, 50).astype(np.int32)
+        self.course_lab = np.array([course["requires_lab"] for course in courses], dtype=bool)
+
+        # Sessions in CSR layout: course c owns rows session_offsets[c]:session_offsets[c + 1]
+        self.session_offsets = np.array(offsets, dtype=np.int32)
+        self.session_hours = np.array(session_hours, dtype=np.float64)
+        self.session_minutes = np.rint(self.session_hours * 60).astype(np.int32)
+        self.session_course = np.repeat(np.arange(n, dtype=np.int32), np.diff(self.session_offsets))
+
+        self.room_compatibility = RoomCompatibility(rooms, [(course["unit"], course["requires_lab"]) for course in courses])
+        self.room_capacity = self.room_compatibility.capacity.astype(np.int32)
+        self.room_is_lab = self.room_compatibility.is_lab
+        self.room_active = self.room_compatibility.is_active
+        self.course_type = np.array([self.room_compatibility.course_type(course["unit"], course["requires_lab"])
+                                     for course in courses], dtype=np.int32)
+        # RoomScheduler.is_room_suitable_for_course_* over every (course, room) pair
+        self.room_compat = self.room_compatibility.matrix[self.course_type]
+
+        day_index = {day: i for i, day in enumerate(DAYS)}
+        self.slot_day = np.array([day_index.get(slot["day"], -1) for slot in time_slots], dtype=np.int8)
+        self.slot_start = np.array([time_to_minutes(slot["start"]) for slot in time_slots], dtype=np.int32)
+        self.slot_end = np.array([time_to_minutes(slot["end"]) for slot in time_slots], dtype=np.int32)
+        self.slot_minutes = self.slot_end - self.slot_start
+        self.slot_lunch = np.array([is_lunch_break_violation(slot["start"], slot["end"]) for slot in time_slots],
+                                   dtype=bool)
+
+        # Slot ids allowed per employment type, in TimeScheduler's preference order
+        position = {id(slot): s for s, slot in enumerate(time_slots)}
+        self.employment_slots: Dict[str, np.ndarray] = {}
+        for employment in dict.fromkeys(course["employmentType"] for course in courses):
+            allowed = filter_time_slots_by_employment(time_slots, employment)
+            self.employment_slots[employment] = np.array([position[id(slot)] for slot in allowed], dtype=np.int32)
+        self._fit_masks: Dict[int, np.ndarray] = {}
+
+        # Room-time blocks booked elsewhere (payload "reservedRooms"):
+        # (room_id, day index, start minute, end minute), combined days split
+        self.reserved_rooms: List[Tuple[Any, int, int, int]] = []
+        for block in reserved_rooms or []:
+            start, end = clock_minutes(block.get("start_time") or ""), clock_minutes(block.get("end_time") or "")
+            if start is None or end is None or block.get("room_id") is None:
+                continue
+            for d in day_indices(block.get("day") or ""):
+                self.reserved_rooms.append((block["room_id"], d, min(start, end), max(start, end)))
+
+    @staticmethod
+    def _intern(index: Dict[str, int], values: List[str], value: str) -> int:
+        i = index.get(value)
+        if i is None:
+            i = index[value] = len(values)
+            values.append(value)
+        return i
+
+    def durations(self, c: int) -> List[float]:
+        """Session lengths of course c in hours"""
+        return self.session_hours[self.session_offsets[c]:self.session_offsets[c + 1]].tolist()
+
+    def fit_mask(self, minutes: int) -> np.ndarray:
+        """Slots long enough to hold a session of the given length"""
+        mask = self._fit_masks.get(minutes)
+        if mask is None:
+            mask = self._fit_masks[minutes] = self.slot_minutes >= minutes
+        return mask
+
+    def course_slots(self, c: int, minutes: Optional[int] = None) -> np.ndarray:
+        """Slot ids course c may use (employment policy order), optionally only those fitting `minutes`"""
+        slots = self.employment_slots[self.courses[c]["employmentType"]]
+        if minutes is None:
+            return slots
+        return slots[self.fit_mask(minutes)[slots]]
+
+    def compatible_rooms(self, c: int) -> np.ndarray:
+        return np.flatnonzero(self.room_compat[c])
+
+    def expanded_courses(self) -> List[Dict[str, Any]]:
+        """One course record per block ("A & B" becomes A and B), as CP-SAT models them.
+
+        Each carries "index" (the compiled course it came from) and "sessions"
+        (its session hours).
+        """
+        expanded = []
+        for c, course in enumerate(self.courses):
+            base = {
+                "index": c,
+                "name": course["name"],
+                "courseCode": course["courseCode"],
+                "courseDescription": course["subject"],
+                "unit": course["unit"],
+                "yearLevel": course["yearLevel"],
+                "employment_type": course["employmentType"],
+                "dept": course["dept"],
+                "requires_lab": course["requires_lab"],
+                "sessions": self.durations(c),
+            }
+            for block in expand_blocks(course["block"]):
+                expanded.append(dict(base, block=block))
+        return expanded
+
+
+def compile_instance(payload: Dict[str, Any], time_slots: Optional[List[Dict[str, Any]]] = None) -> ProblemInstance:
+    """Parse a solver payload (instructorData, rooms, optional reservedRooms) into a ProblemInstance"""
+    courses = [parse_course(course_data) for course_data in payload.get("instructorData", [])]
+    rooms = list(payload.get("rooms", []))
+    if time_slots is None:
+        time_slots = generate_comprehensive_time_slots()
+    return ProblemInstance(courses, rooms, time_slots, payload.get("reservedRooms"))
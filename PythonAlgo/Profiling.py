@@ -0,0 +1,166 @@
+import os
+import sys
+import time
+import pstats
+import cProfile
+import tempfile
+import threading
+from typing import Dict, Any, Optional, List
+
+
+# Environment switch for runs launched without a payload field: "1"/"true"
+# profiles into the default directory, any other value is the directory
+PROFILE_ENV = "SCHEDULER_PROFILE"
+
+DEFAULT_PROFILE_DIR = os.path.join(tempfile.gettempdir(), "scheduler-profiles")
+
+# Functions listed in the result's profile block
+DEFAULT_TOP = 15
+
+# Stack sampling period for the collapsed-stack file
+DEFAULT_INTERVAL_MS = 5.0
+
+
+def profile_config(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Profiling options from payload "profile" (true, a directory or {"dir", "top", "intervalMs"}) or the environment"""
+    config = payload.get("profile")
+    if config is None:
+        config = os.environ.get(PROFILE_ENV, "")
+        if config.strip().lower() in ("", "0", "false", "no", "off"):
+            return None
+        if config.strip().lower() in ("1", "true", "yes", "on"):
+            config = True
+    if not config:
+        return None
+    if isinstance(config, dict):
+        options = dict(config)
+    elif isinstance(config, str):
+        options = {"dir": config}
+    else:
+        options = {}
+    options["dir"] = options.get("dir") or DEFAULT_PROFILE_DIR
+    options["top"] = int(options.get("top", DEFAULT_TOP))
+    options["intervalMs"] = float(options.get("intervalMs", DEFAULT_INTERVAL_MS))
+    return options
+
+
+class StackSampler:
+    """Samples one thread's Python stack at a fixed period into collapsed-stack counts"""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts: Dict[str, int] = {}
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if self._stop.is_set():
+                # The profiled thread is already stopping the sampler
+                break
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                key = ";".join(reversed(stack))
+                self.counts[key] = self.counts.get(key, 0) + 1
+                self.samples += 1
+
+    def write(self, path: str) -> None:
+        """Collapsed stacks ("root;...;leaf count"), the input of flamegraph.pl and speedscope"""
+        with open(path, "w") as handle:
+            for stack, count in sorted(self.counts.items()):
+                handle.write(f"{stack} {count}\n")
+
+
+class RunProfiler:
+    """Context manager profiling the enclosed run when enabled.
+
+    The run is traced with cProfile and its stack is sampled for a
+    collapsed-stack file; both are written to the configured directory as
+    <label>-<run id>.pstats and .folded. Only this process is profiled:
+    worker/island processes and CP-SAT's native search threads are not.
+    attach() adds the file paths and the top functions by cumulative time
+    to a result as "profile". Nothing is written to stdout.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]], label: str):
+        self.config = config
+        self.label = label
+        self.report: Optional[Dict[str, Any]] = None
+        self._profiler: Optional[cProfile.Profile] = None
+        self._sampler: Optional[StackSampler] = None
+        self._started = 0.0
+
+    def __enter__(self) -> "RunProfiler":
+        if self.config is not None:
+            self._started = time.perf_counter()
+            self._sampler = StackSampler(threading.get_ident(), self.config["intervalMs"] / 1000.0)
+            self._sampler.start()
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self
+
+    def __exit__(self, *exc: Any) -> bool:
+        if self._profiler is None:
+            return False
+        self._profiler.disable()
+        self._sampler.stop()
+        elapsed = time.perf_counter() - self._started
+        try:
+            self.report = self._write(elapsed)
+            print(f"Profile written to {self.report['pstats']}", file=sys.stderr)
+        except OSError as e:
+            print(f"WARNING: cannot write profile: {e}", file=sys.stderr)
+            self.report = {"error": str(e), "elapsed_sec": round(elapsed, 3)}
+        return False
+
+    def _write(self, elapsed: float) -> Dict[str, Any]:
+        directory = self.config["dir"]
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, f"{self.label}-{int(time.time() * 1000):x}-{os.getpid()}")
+        self._profiler.dump_stats(base + ".pstats")
+        self._sampler.write(base + ".folded")
+        return {
+            "pstats": base + ".pstats",
+            "folded": base + ".folded",
+            "elapsed_sec": round(elapsed, 3),
+            "samples": self._sampler.samples,
+            "top": top_functions(pstats.Stats(self._profiler), self.config["top"]),
+        }
+
+    def attach(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        if self.report is not None and isinstance(result, dict):
+            result["profile"] = self.report
+        return result
+
+
+def top_functions(stats: pstats.Stats, limit: int) -> List[Dict[str, Any]]:
+    """The limit functions with the most cumulative time"""
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+    return [
+        {
+            "function": f"{name} ({os.path.basename(filename)}:{line})" if line else name,
+            "calls": calls,
+            "total_sec": round(total, 4),
+            "cumulative_sec": round(cumulative, 4),
+        }
+        for (filename, line, name), (_, calls, total, cumulative, _) in rows
+    ]
+
+
+def profile_run(payload: Dict[str, Any], label: str) -> RunProfiler:
+    """RunProfiler for a solver entry point, enabled by the payload or PROFILE_ENV"""
+    return RunProfiler(profile_config(payload), label)
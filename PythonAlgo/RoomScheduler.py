@@ -1,4 +1,10 @@
-from typing import Dict, Any
+import numpy as np
+from typing import Dict, Any, List, Tuple, Iterable
+
+
+# Enrolment estimates the units heuristic can produce; their 80% marks are the
+# capacity bands that separate otherwise identical rooms
+STUDENT_ESTIMATES = (20, 30, 40, 50)
 
 
 def get_room_capacity(room: Dict[str, Any]) -> int:
@@ -46,3 +52,109 @@ def is_room_suitable_for_course_obj(room: Any, course: Any) -> bool:
 	return True
 
 
+
+
+def estimate_students(units: Any) -> int:
+	"""Expected enrolment from course units (20..50), as the suitability checks assume."""
+	return min(50, max(20, units * 10))
+
+
+def _room_attr(room: Any, key: str, default: Any) -> Any:
+	if isinstance(room, dict):
+		return room.get(key, default)
+	return getattr(room, key, default)
+
+
+class RoomCompatibility:
+	"""Room suitability precomputed once per room list.
+
+	A course type is (estimated students, requires lab); `matrix` is a
+	course types x rooms boolean matrix equal to is_room_suitable_for_course_*
+	for every pair, so lookups are O(1). Rooms with the same lab flag, active
+	flag and capacity band (the estimate thresholds they meet) are
+	interchangeable for every known course type and form one equivalence
+	class; `class_matrix` is course types x classes and `class_size` counts
+	the rooms per class, so solvers can reason about room pools.
+	Rooms may be dicts or objects with capacity/is_lab/is_active.
+	"""
+
+	def __init__(self, rooms: List[Any], course_types: Iterable[Tuple[Any, bool]] = ()):
+		self.rooms = rooms
+		self.capacity = np.array([_room_attr(room, 'capacity', 30) for room in rooms], dtype=np.float64)
+		self.is_lab = np.array([bool(_room_attr(room, 'is_lab', False)) for room in rooms], dtype=bool)
+		self.is_active = np.array([bool(_room_attr(room, 'is_active', True)) for room in rooms], dtype=bool)
+		self.type_index: Dict[Tuple[Any, bool], int] = {}
+		self.course_types: List[Tuple[Any, bool]] = []
+		rows = []
+		for units, requires_lab in course_types:
+			key = (estimate_students(units), bool(requires_lab))
+			if key not in self.type_index:
+				self.type_index[key] = len(self.course_types)
+				self.course_types.append(key)
+				rows.append(self._suitability(*key))
+		self.matrix = np.array(rows, dtype=bool).reshape(len(rows), len(rooms))
+
+		# Equivalence classes: same (lab, active, capacity band) for every threshold in use
+		thresholds = np.array(sorted({students * 0.8 for students in STUDENT_ESTIMATES}
+		                             | {students * 0.8 for students, _ in self.course_types}))
+		band = np.searchsorted(thresholds, self.capacity, side='right')
+		class_index: Dict[Tuple[bool, bool, int], int] = {}
+		self.room_class = np.empty(len(rooms), dtype=np.int32)
+		self.class_signature: List[Tuple[bool, bool, int]] = []
+		for r in range(len(rooms)):
+			signature = (bool(self.is_lab[r]), bool(self.is_active[r]), int(band[r]))
+			if signature not in class_index:
+				class_index[signature] = len(self.class_signature)
+				self.class_signature.append(signature)
+			self.room_class[r] = class_index[signature]
+		self.class_rooms: List[np.ndarray] = [np.flatnonzero(self.room_class == k) for k in range(len(self.class_signature))]
+		self.class_size = np.array([len(members) for members in self.class_rooms], dtype=np.int32)
+		# A class is compatible with a type when its rooms are (they all agree)
+		representative = np.array([members[0] for members in self.class_rooms], dtype=np.int64)
+		self.class_matrix = self.matrix[:, representative]
+		self._room_lists: Dict[int, np.ndarray] = {}
+
+	def _suitability(self, students: Any, requires_lab: bool) -> np.ndarray:
+		return (self.capacity >= students * 0.8) & (self.is_lab == requires_lab) & self.is_active
+
+	def course_type(self, units: Any, requires_lab: bool) -> int:
+		"""Course type id; types not seen at construction get a row on demand (no class data)."""
+		key = (estimate_students(units), bool(requires_lab))
+		t = self.type_index.get(key)
+		if t is None:
+			t = self.type_index[key] = len(self.course_types)
+			self.course_types.append(key)
+			self.matrix = np.vstack([self.matrix, self._suitability(*key)[None, :]])
+			self.class_matrix = np.vstack([self.class_matrix, np.zeros((1, self.class_matrix.shape[1]), dtype=bool)])
+		return t
+
+	def suitable(self, units: Any, requires_lab: bool, r: int) -> bool:
+		return bool(self.matrix[self.course_type(units, requires_lab), r])
+
+	def rooms_for(self, units: Any, requires_lab: bool) -> np.ndarray:
+		"""Indices of the suitable rooms, in room order"""
+		t = self.course_type(units, requires_lab)
+		rooms = self._room_lists.get(t)
+		if rooms is None:
+			rooms = self._room_lists[t] = np.flatnonzero(self.matrix[t])
+		return rooms
+
+	def classes_for(self, units: Any, requires_lab: bool) -> np.ndarray:
+		"""Ids of the room classes suitable for the course type"""
+		return np.flatnonzero(self.class_matrix[self.course_type(units, requires_lab)])
+
+	def summary(self) -> List[Dict[str, Any]]:
+		"""One record per room class: flags, capacity range, room count and room ids"""
+		summary = []
+		for k, (is_lab, is_active, band) in enumerate(self.class_signature):
+			members = self.class_rooms[k]
+			summary.append({
+				"class": k,
+				"is_lab": is_lab,
+				"is_active": is_active,
+				"min_capacity": float(self.capacity[members].min()),
+				"max_capacity": float(self.capacity[members].max()),
+				"count": int(self.class_size[k]),
+				"room_ids": [_room_attr(self.rooms[r], 'room_id', None) for r in members],
+			})
+		return summary
@@ -0,0 +1,189 @@
+import sys
+import json
+import time
+from typing import List, Dict, Any, Tuple
+
+from ortools.sat.python import cp_model
+
+try:
+    from .Scheduler import build_cp_sat_model, make_cp_sat_solver, extract_cp_sat_schedules, decision_vars, read_input
+    from .DayScheduler import DAYS, normalize_day
+    from .export import apply_output_mode
+    from .check import apply_post_check
+    from .Profiling import profile_run
+except ImportError:
+    from Scheduler import build_cp_sat_model, make_cp_sat_solver, extract_cp_sat_schedules, decision_vars, read_input
+    from DayScheduler import DAYS, normalize_day
+    from export import apply_output_mode
+    from check import apply_post_check
+    from Profiling import profile_run
+
+
+# Minimum default seconds per scenario solve; scenarios start from the base solution
+MIN_SCENARIO_TIME_SEC = 2.0
+
+
+def scenario_toggles(scenario: Dict[str, Any]) -> List[Tuple[str, Any]]:
+    """(kind, value) toggles a scenario switches on.
+
+    closeRooms lists room ids, closeDays day names ("Sat", "Saturday"),
+    dropInstructors instructor names and dropCourses course codes or
+    {"courseCode", "instructor"} (one instructor's course only).
+    """
+    toggles = [("room", room_id) for room_id in scenario.get("closeRooms") or []]
+    toggles += [("day", normalize_day(day)) for day in scenario.get("closeDays") or []]
+    toggles += [("instructor", name) for name in scenario.get("dropInstructors") or []]
+    for course in scenario.get("dropCourses") or []:
+        if isinstance(course, dict):
+            toggles.append(("course", (course.get("courseCode"), course.get("instructor"))))
+        else:
+            toggles.append(("course", (course, None)))
+    for kind, value in toggles:
+        if kind == "day" and value not in DAYS:
+            raise ValueError(f"Unknown day: {value}")
+    return toggles
+
+
+def _assignment(problem: Dict[str, Any], solver: Any) -> Dict[Tuple[int, int], int]:
+    """(course index, session index) -> chosen slot"""
+    return {(idx, slot_idx): s for (idx, slot_idx, s), var in problem["x_slot"].items() if solver.BooleanValue(var)}
+
+
+def solve_scenarios(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Solve a base schedule and what-if scenarios on one CP-SAT model.
+
+    payload "scenarios" lists {"name", "closeRooms", "closeDays",
+    "dropInstructors", "dropCourses"} (see scenario_toggles). The model is
+    built once with a literal per toggle any scenario uses; each solve fixes
+    the literals with assumptions, and scenario solves are hinted with the
+    base solution. "timeLimitSec" bounds the base solve and
+    "scenarioTimeLimitSec" each scenario (default: timeLimitSec shared by
+    all scenarios, at least 2s each); "scenarioSchedules" adds each
+    scenario's schedule to its report.
+
+    Per scenario: feasibility, objective and its delta to the base, sessions
+    dropped and sessions moved to another slot. Infeasible scenarios name
+    the toggles that together cause the infeasibility when the solver can
+    tell.
+    """
+    scenarios = payload.get("scenarios") or []
+    time_limit = float(payload.get("timeLimitSec", 60))
+    scenario_time = float(payload.get("scenarioTimeLimitSec",
+                                      max(MIN_SCENARIO_TIME_SEC, time_limit / max(1, len(scenarios)))))
+    with_schedules = bool(payload.get("scenarioSchedules", False))
+    scenario_keys = [scenario_toggles(scenario) for scenario in scenarios]
+    used = {key for keys in scenario_keys for key in keys}
+    toggles = {
+        "rooms": sorted({value for kind, value in used if kind == "room"}, key=str),
+        "days": sorted({value for kind, value in used if kind == "day"}, key=DAYS.index),
+        "instructors": sorted({value for kind, value in used if kind == "instructor"}),
+        "courses": sorted({value for kind, value in used if kind == "course"}, key=str),
+    }
+
+    start = time.time()
+    problem = build_cp_sat_model(payload, toggles=toggles)
+    model, lits = problem["model"], problem["toggles"]
+    build_sec = time.time() - start
+    print(f"Scenarios: model with {len(lits)} toggles built in {build_sec:.2f}s", file=sys.stderr)
+
+    def solve(on: set, time_limit: float) -> Tuple[Any, int]:
+        model.ClearAssumptions()
+        model.AddAssumptions([lit if key in on else lit.Not() for key, lit in lits.items()])
+        solver = make_cp_sat_solver(payload, time_limit)
+        return solver, solver.Solve(model)
+
+    solver, status = solve(set(), time_limit)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return {
+            "success": False,
+            "message": f"No feasible base assignment found (status: {solver.StatusName(status)})",
+            "schedules": [],
+            "errors": ["Infeasible"],
+            "scenarios": [],
+        }
+    base_objective = solver.ObjectiveValue()
+    base = _assignment(problem, solver)
+    schedules = extract_cp_sat_schedules(problem, solver)
+    model.ClearHints()
+    for var in decision_vars(problem):
+        model.AddHint(var, solver.BooleanValue(var))
+
+    reports = []
+    for i, (scenario, keys) in enumerate(zip(scenarios, scenario_keys)):
+        scenario_start = time.time()
+        on = set(keys)
+        solver, status = solve(on, scenario_time)
+        report: Dict[str, Any] = {
+            "name": scenario.get("name") or f"scenario_{i + 1}",
+            "status": solver.StatusName(status),
+            "feasible": status in (cp_model.OPTIMAL, cp_model.FEASIBLE),
+        }
+        if report["feasible"]:
+            assignment = _assignment(problem, solver)
+            dropped = [key for key in base if key not in assignment]
+            report.update(
+                objective=solver.ObjectiveValue(),
+                objective_delta=solver.ObjectiveValue() - base_objective,
+                dropped_sessions=len(dropped),
+                moved_sessions=sum(1 for key, s in assignment.items() if base.get(key) != s),
+            )
+            if with_schedules:
+                closed = {value for kind, value in on if kind == "room"}
+                # Closed rooms are booked all day for the room assignment
+                closures = [(day, r, 0, 24 * 60) for r, room in enumerate(problem["rooms"])
+                            if room["room_id"] in closed for day in DAYS]
+                report["schedules"] = extract_cp_sat_schedules(
+                    dict(problem, reserved_rooms=(problem["reserved_rooms"] or []) + closures, closed_rooms=closed), solver)
+        elif status == cp_model.INFEASIBLE:
+            core = set(solver.SufficientAssumptionsForInfeasibility())
+            report["conflicting"] = [{"kind": kind, "value": value} for (kind, value), lit in lits.items()
+                                     if (kind, value) in on and lit.Index() in core]
+        report["elapsed_sec"] = round(time.time() - scenario_start, 3)
+        reports.append(report)
+        print(f"Scenarios: {report['name']} {report['status']} in {report['elapsed_sec']:.2f}s", file=sys.stderr)
+
+    feasible = sum(1 for report in reports if report["feasible"])
+    return {
+        "success": True,
+        "message": f"Solved base and {feasible} of {len(reports)} scenarios feasible",
+        "schedules": schedules,
+        "errors": [],
+        "base": {"objective": base_objective, "build_sec": round(build_sec, 3)},
+        "scenarios": reports,
+        "elapsed_sec": round(time.time() - start, 3),
+    }
+
+
+def main() -> None:
+    try:
+        payload = read_input()
+        if not payload:
+            print(json.dumps({"success": False, "message": "Empty input"}))
+            return
+        if not payload.get("instructorData") or not payload.get("rooms"):
+            print(json.dumps({
+                "success": False,
+                "message": "Missing instructorData or rooms",
+                "schedules": [],
+                "errors": ["Invalid input"]
+            }))
+            return
+
+        with profile_run(payload, "scenarios") as profiler:
+            result = solve_scenarios(payload)
+        result = apply_post_check(profiler.attach(result), payload.get("check"), payload.get("rooms"))
+        result = apply_output_mode(result, payload)
+        print(json.dumps(result), flush=True)
+
+    except Exception as e:
+        error_result = {
+            "success": False,
+            "message": f"Scenario error: {str(e)}",
+            "schedules": [],
+            "errors": [str(e)]
+        }
+        print(json.dumps(error_result), flush=True)
+
+
+if __name__ == "__main__":
+    main()
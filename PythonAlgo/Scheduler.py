@@ -1,7 +1,9 @@
 import sys
 import json
 import math
-from typing import List, Dict, Any
+import time
+import threading
+from typing import List, Dict, Any, Optional, FrozenSet, Tuple
 from datetime import datetime, timedelta
 import random
 
@@ -9,9 +11,64 @@ from ortools.sat.python import cp_model
 
 # Import DAYS constant for day diversity
 try:
-    from .DayScheduler import DAYS
+    from .DayScheduler import DAYS, meeting_patterns
 except ImportError:
-    from DayScheduler import DAYS
+    from DayScheduler import DAYS, meeting_patterns
+try:
+    from .export import apply_output_mode
+    from .check import apply_post_check
+    from .Profiling import profile_run
+except ImportError:
+    from export import apply_output_mode
+    from check import apply_post_check
+    from Profiling import profile_run
+try:
+    from .ProblemInstance import ProblemInstance, compile_instance, expand_blocks
+    from .Telemetry import open_sink
+except ImportError:
+    from ProblemInstance import ProblemInstance, compile_instance, expand_blocks
+    from Telemetry import open_sink
+
+
+# Soft objective families in staged-solve order, most important first
+STAGE_ORDER = ('lunch', 'employment', 'day_diversity')
+
+# Share of the time limit a meeting-pattern model gets to find any schedule
+PATTERN_PROBE_SHARE = 0.5
+
+
+class IncumbentCallback(cp_model.CpSolverSolutionCallback):
+    """Emits a telemetry record for every improving solution (objective and bound).
+
+    With no_improvement_sec the search stops once that long passes without a
+    new incumbent; call cancel() after the solve.
+    """
+
+    def __init__(self, sink: Any, stage: Optional[str] = None, no_improvement_sec: Optional[float] = None):
+        super().__init__()
+        self.sink = sink
+        self.stage = stage
+        self.no_improvement_sec = no_improvement_sec
+        self.solutions = 0
+        self._timer: Optional[threading.Timer] = None
+
+    def on_solution_callback(self) -> None:
+        self.solutions += 1
+        if self.sink is not None:
+            fields = {"stage": self.stage} if self.stage else {}
+            self.sink.emit("incumbent", engine="cp_sat", solutions=self.solutions,
+                           objective=self.ObjectiveValue(), bound=self.BestObjectiveBound(),
+                           elapsed_sec=round(self.WallTime(), 4), **fields)
+        if self.no_improvement_sec:
+            self.cancel()
+            self._timer = threading.Timer(self.no_improvement_sec, self.StopSearch)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def cancel(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
 
 
 def read_input() -> Dict[str, Any]:
@@ -107,10 +164,21 @@ def is_lunch_break_violation(start_time: str, end_time: str) -> bool:
     return _lunch(start_time, end_time)
 
 
-def select_optimal_room_dynamic(rooms, course, slot, used_room_times, room_usage_count, room_day_usage, rr_pointer):
+def _room_free(used_room_times, slot, room_id) -> bool:
+    """Whether no booking of room_id overlaps the slot's day, start and end minutes"""
+    return all(end <= slot["start"] or start >= slot["end"]
+               for start, end in used_room_times.get((slot["day"], room_id), ()))
+
+
+def select_optimal_room_dynamic(rooms, course, slot, used_room_times, room_usage_count, room_day_usage, rr_pointer,
+                                compatibility=None):
     """
     Select optimal room using dynamic distribution algorithm
     Considers room capacity, lab requirements, unavailability, and balances usage
+    compatibility (RoomScheduler.RoomCompatibility over rooms) replaces the per-room suitability checks
+    slot is the session's {"day", "start", "end"} (minutes); used_room_times maps (day, room_id)
+    to booked (start, end) minutes, so a room is taken when any booking overlaps the session.
+    Returns None rather than a room that is already booked.
     """
     if not rooms:
         return None
@@ -122,14 +190,13 @@ def select_optimal_room_dynamic(rooms, course, slot, used_room_times, room_usage
     
     # Get suitable and available rooms
     suitable_rooms = []
-    for room in rooms:
-        # Check if room is suitable for course
-        if not is_room_suitable_for_course(room, course):
-            continue
-            
+    if compatibility is not None and compatibility.rooms is rooms:
+        candidates = [rooms[r] for r in compatibility.rooms_for(course.get('unit', 3), course.get('requires_lab', False))]
+    else:
+        candidates = [room for room in rooms if is_room_suitable_for_course(room, course)]
+    for room in candidates:
         # Check if room is available at this time
-        key = (slot["day"], slot["start"], slot["end"], room["room_id"])
-        if key in used_room_times:
+        if not _room_free(used_room_times, slot, room["room_id"]):
             continue
             
         suitable_rooms.append(room)
@@ -137,23 +204,21 @@ def select_optimal_room_dynamic(rooms, course, slot, used_room_times, room_usage
     # Debug: Log lab room selection
     if requires_lab:
         lab_rooms = [r for r in suitable_rooms if r.get("is_lab", False)]
-        print(f"DEBUG: Lab session {course.get('courseCode', 'Unknown')} - Found {len(lab_rooms)} lab rooms out of {len(suitable_rooms)} suitable rooms")
+        print(f"DEBUG: Lab session {course.get('courseCode', 'Unknown')} - Found {len(lab_rooms)} lab rooms out of {len(suitable_rooms)} suitable rooms", file=sys.stderr)
     
     if not suitable_rooms:
         # For lab sessions, only fallback to lab rooms
         if requires_lab:
             for room in rooms:
                 if room.get("is_lab", False):
-                    key = (slot["day"], slot["start"], slot["end"], room["room_id"])
-                    if key not in used_room_times:
+                    if _room_free(used_room_times, slot, room["room_id"]):
                         suitable_rooms.append(room)
                         break
         else:
             # For non-lab sessions, fallback to any available NON-LAB room
             for room in rooms:
                 if not room.get("is_lab", False):  # Only use non-lab rooms for non-lab sessions
-                    key = (slot["day"], slot["start"], slot["end"], room["room_id"])
-                    if key not in used_room_times:
+                    if _room_free(used_room_times, slot, room["room_id"]):
                         suitable_rooms.append(room)
                         break
     
@@ -195,8 +260,7 @@ def select_optimal_room_dynamic(rooms, course, slot, used_room_times, room_usage
     day_key = slot["day"]
     
     # Add to used room times
-    key = (slot["day"], slot["start"], slot["end"], room_id)
-    used_room_times.add(key)
+    used_room_times.setdefault((day_key, room_id), []).append((slot["start"], slot["end"]))
     
     # Update usage counts
     room_usage_count[room_id] = room_usage_count.get(room_id, 0) + 1
@@ -207,12 +271,29 @@ def select_optimal_room_dynamic(rooms, course, slot, used_room_times, room_usage
     return selected_room
 
 
-def solve_with_cp_sat(payload: Dict[str, Any]) -> Dict[str, Any]:
+def _time_to_minutes(t: str) -> int:
+    return int(t.split(':')[0]) * 60 + int(t.split(':')[1])
+
+
+def solve_with_cp_sat(payload: Dict[str, Any], hint_schedules: Optional[List[Dict[str, Any]]] = None,
+                      time_limit: Optional[float] = None, objective: bool = True,
+                      instance: Optional[ProblemInstance] = None,
+                      parameters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Solve with CP-SAT.
+
+    hint_schedules (schedule dicts, e.g. a GA result) are passed to the solver
+    as AddHint; objective=False solves for feasibility only. instance is the
+    payload's ProblemInstance if the caller already compiled it. parameters
+    override CpSolver parameters by name (e.g. {"num_search_workers": 1,
+    "random_seed": 7}), on top of the payload's "cpSatParameters". With a
+    payload "telemetry" sink, every incumbent is reported as it is found.
+    A "meetingPatterns" model that yields no schedule within
+    PATTERN_PROBE_SHARE of the time limit is solved again with a slot per
+    session in the time that remains.
+    """
+    started = time.time()
     instructor_data: List[Dict[str, Any]] = payload.get("instructorData", [])
     rooms: List[Dict[str, Any]] = payload.get("rooms", [])
-    
-    # Generate comprehensive time slots via shared TimeScheduler
-    time_slots = generate_comprehensive_time_slots()
 
     # Basic validation
     if not instructor_data:
@@ -231,6 +312,11 @@ def solve_with_cp_sat(payload: Dict[str, Any]) -> Dict[str, Any]:
             "errors": ["No room data provided"]
         }
     
+    problem = build_cp_sat_model(payload, objective=objective, instance=instance)
+    time_slots = problem["time_slots"]
+    courses = problem["courses"]
+    model = problem["model"]
+
     # Reduced debug output to prevent pipe overflow
     if len(instructor_data) <= 10:  # Only debug for small datasets
         print(f"DEBUG: Processing {len(instructor_data)} courses with {len(rooms)} rooms and {len(time_slots)} time slots", file=sys.stderr)
@@ -251,6 +337,193 @@ def solve_with_cp_sat(payload: Dict[str, Any]) -> Dict[str, Any]:
     except Exception:
         pass
 
+    if hint_schedules:
+        hinted = add_schedule_hints(problem, hint_schedules)
+        print(f"CP-SAT: hinted {hinted} session assignments", file=sys.stderr)
+
+    if problem["pattern_vars"]:
+        # One pattern and start per course is stricter than a slot per session,
+        # and proving it infeasible can take the whole time limit: look for any
+        # pattern schedule in a share of it, keeping the rest for per-session slots
+        total = float(time_limit if time_limit is not None else payload.get("timeLimitSec", 60))
+        probe = make_cp_sat_solver(payload, total * PATTERN_PROBE_SHARE,
+                                   dict(parameters or {}, stop_after_first_solution=True))
+        status = probe.Solve(model)
+        remaining = max(1.0, total - (time.time() - started))
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            print(f"CP-SAT: no meeting pattern schedule ({probe.StatusName(status)}); "
+                  f"retrying with per-session slots", file=sys.stderr)
+            result = solve_with_cp_sat(dict(payload, meetingPatterns=False), hint_schedules, remaining,
+                                       objective, problem["instance"], parameters)
+            result["message"] += " (without meeting patterns)"
+            return result
+        # The search goes on from the probe's schedule
+        model.ClearHints()
+        for var in decision_vars(problem):
+            model.AddHint(var, probe.BooleanValue(var))
+        time_limit = remaining
+
+    solver = make_cp_sat_solver(payload, time_limit, parameters)
+
+    # Reduced debug output to prevent pipe overflow
+    if len(courses) <= 10:
+        print(f"DEBUG: Starting solver with {len(courses)} courses", file=sys.stderr)
+    sink = open_sink(payload.get("telemetry"))
+    staged = payload.get("staged")
+    stages = None
+    try:
+        if staged and objective:
+            solver, status, stages = solve_staged(problem, payload, staged if isinstance(staged, dict) else {},
+                                                  time_limit, parameters, sink)
+        else:
+            status = solver.Solve(model, IncumbentCallback(sink) if sink is not None else None)
+        if sink is not None:
+            sink.emit("summary", engine="cp_sat", status=solver.StatusName(status),
+                      objective=solver.ObjectiveValue(), bound=solver.BestObjectiveBound(),
+                      elapsed_sec=round(solver.WallTime(), 4))
+    finally:
+        if sink is not None:
+            sink.close()
+    if len(courses) <= 10:
+        print(f"DEBUG: Solver status: {status}", file=sys.stderr)
+
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        print(f"DEBUG: Solver failed with status: {status}", file=sys.stderr)
+        return {
+            "success": False,
+            "message": f"No feasible assignment found (status: {status})",
+            "schedules": [],
+            "errors": ["Infeasible"]
+        }
+
+    schedules = extract_cp_sat_schedules(problem, solver)
+
+    # Validate units coverage
+    course_units = {course["courseCode"]: course["unit"] for course in courses}
+    units_valid = validate_units_coverage(schedules, course_units)
+    
+    if not units_valid:
+        print("WARNING: Units coverage validation failed", file=sys.stderr)
+
+    return {
+        "success": True,
+        "message": "Solved" + (" (with units validation warnings)" if not units_valid else ""),
+        "schedules": schedules,
+        "errors": [] if units_valid else ["Units coverage validation failed"],
+        **({"stages": stages} if stages is not None else {})
+    }
+
+
+def solve_staged(problem: Dict[str, Any], payload: Dict[str, Any], config: Dict[str, Any],
+                 time_limit: Optional[float] = None, parameters: Optional[Dict[str, Any]] = None,
+                 sink: Any = None) -> Tuple[Any, int, List[Dict[str, Any]]]:
+    """Lexicographic solve: feasibility first, then one soft family at a time.
+
+    The "feasible" stage drops the objective and stops at the first solution.
+    Each family of config "order" (default STAGE_ORDER) is then minimized,
+    hinted with the incumbent, and its value bounds the later stages. A stage
+    ends at config "relativeGap", after "noImprovementSec" without a new
+    incumbent, or when its share of the remaining time runs out. Once less
+    than "minStageSec" (default 1) remains, the incumbent is returned as is.
+
+    Returns (solver holding the incumbent, its status, one report per stage).
+    """
+    model, terms = problem["model"], problem["objective_terms"]
+    order = list(config.get("order") or STAGE_ORDER)
+    unknown = [name for name in order if name not in STAGE_ORDER]
+    if unknown:
+        raise ValueError(f"Unknown objective families: {', '.join(map(str, unknown))}")
+    order = [name for name in order if name in terms]
+    total = float(time_limit if time_limit is not None else payload.get("timeLimitSec", 60))
+    deadline = time.time() + total
+    min_stage = float(config.get("minStageSec", 1.0))
+    window = float(config["noImprovementSec"]) if config.get("noImprovementSec") else None
+    stage_parameters = dict(parameters or {})
+    if config.get("relativeGap") is not None:
+        stage_parameters["relative_gap_limit"] = float(config["relativeGap"])
+
+    def record(name: str, solver: Any, status: int, started: float) -> Dict[str, Any]:
+        solved = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+        return {"stage": name, "status": solver.StatusName(status),
+                "objective": solver.ObjectiveValue() if solved and name != "feasible" else None,
+                "bound": solver.BestObjectiveBound() if solved and name != "feasible" else None,
+                "elapsed_sec": round(time.time() - started, 3)}
+
+    started = time.time()
+    model.ClearObjective()
+    solver = make_cp_sat_solver(payload, total, dict(parameters or {}, stop_after_first_solution=True))
+    status = solver.Solve(model, IncumbentCallback(sink, "feasible") if sink is not None else None)
+    stages = [record("feasible", solver, status, started)]
+    print(f"CP-SAT staged: first feasible after {stages[0]['elapsed_sec']:.2f}s", file=sys.stderr)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return solver, status, stages
+
+    best, best_status = solver, status
+    for k, name in enumerate(order):
+        remaining = deadline - time.time()
+        if remaining < min_stage:
+            stages.append({"stage": name, "status": "SKIPPED", "objective": None, "bound": None, "elapsed_sec": 0.0})
+            continue
+        started = time.time()
+        model.ClearHints()
+        for var in decision_vars(problem):
+            model.AddHint(var, best.BooleanValue(var))
+        model.Minimize(terms[name])
+        solver = make_cp_sat_solver(payload, remaining / (len(order) - k), stage_parameters)
+        callback = IncumbentCallback(sink, name, window)
+        try:
+            status = solver.Solve(model, callback)
+        finally:
+            callback.cancel()
+        stages.append(record(name, solver, status, started))
+        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            model.Add(terms[name] <= int(round(solver.ObjectiveValue())))
+            best, best_status = solver, status
+        print(f"CP-SAT staged: {name} {solver.StatusName(status)} at {solver.ObjectiveValue():.0f} "
+              f"after {stages[-1]['elapsed_sec']:.2f}s", file=sys.stderr)
+    return best, best_status, stages
+
+
+def make_cp_sat_solver(payload: Dict[str, Any], time_limit: Optional[float] = None,
+                       parameters: Optional[Dict[str, Any]] = None) -> Any:
+    """CpSolver with the scheduler's defaults, the payload's "cpSatParameters" and parameters"""
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = float(time_limit if time_limit is not None else payload.get("timeLimitSec", 60))  # Increased timeout to 60 seconds
+    solver.parameters.num_search_workers = 4  # Increased workers for better performance
+    # Use default search branching (AUTOMATIC is not available in newer OR-Tools versions)
+    # solver.parameters.search_branching = cp_model.AUTOMATIC  # Removed - not available
+    solver.parameters.cp_model_presolve = True  # Enable presolve
+    solver.parameters.cp_model_probing_level = 0  # Reduced probing to speed up
+    for name, value in dict(payload.get("cpSatParameters") or {}, **(parameters or {})).items():
+        setattr(solver.parameters, name, value)
+    return solver
+
+
+def build_cp_sat_model(payload: Dict[str, Any], time_slots: Optional[List[Dict[str, Any]]] = None,
+                       objective: bool = True, instance: Optional[ProblemInstance] = None,
+                       toggles: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Build the CP-SAT model; returns the model with its variables and index data.
+
+    Rooms are pooled by equivalence class (payload "roomPools", default on;
+    see add_room_pool_constraints) and assigned after solving.
+
+    toggles adds a Boolean per listed room id ("rooms"), day ("days"),
+    instructor name ("instructors") and (course code, instructor or None)
+    pair ("courses"); set true, it closes the room or day or drops the
+    matching courses. They are returned as problem["toggles"] keyed by
+    (kind, value), to be fixed per solve with assumptions.
+
+    With payload "meetingPatterns", a course of several sessions picks one
+    day pattern (DayScheduler.meeting_patterns) and one start time for all
+    its sessions instead of a slot per session; see add_meeting_patterns.
+    Its x_slot entries then exist only where some pattern places a session.
+    """
+    if instance is None:
+        # Comprehensive time slots come from the shared TimeScheduler
+        instance = compile_instance(payload, time_slots)
+    time_slots = instance.time_slots
+    rooms: List[Dict[str, Any]] = instance.rooms
+
     model = cp_model.CpModel()
 
     # Index helpers
@@ -258,71 +531,47 @@ def solve_with_cp_sat(payload: Dict[str, Any]) -> Dict[str, Any]:
     slot_ids = list(range(len(time_slots)))
 
     # Precompute slot metadata
-    def _time_to_minutes(t: str) -> int:
-        return int(t.split(':')[0]) * 60 + int(t.split(':')[1])
-
-    slot_start_min = [_time_to_minutes(ts["start"]) for ts in time_slots]
-    slot_end_min = [_time_to_minutes(ts["end"]) for ts in time_slots]
+    slot_start_min = instance.slot_start.tolist()
+    slot_end_min = instance.slot_end.tolist()
     slot_day = [ts["day"] for ts in time_slots]
 
-    # For each slot, list of slot indices on the same day that overlap with it (including itself)
-    overlapping_slots: Dict[int, List[int]] = {}
-    for s in slot_ids:
-        overlaps: List[int] = []
-        for t in slot_ids:
-            if slot_day[s] != slot_day[t]:
-                continue
-            # overlap if not (end1 <= start2 or end2 <= start1)
-            if not (slot_end_min[s] <= slot_start_min[t] or slot_end_min[t] <= slot_start_min[s]):
-                overlaps.append(t)
-        overlapping_slots[s] = overlaps
-
-    # Build course list with proper data mapping and expand multi-block entries
-    courses: List[Dict[str, Any]] = []
-    for course_data in instructor_data:
-        # Map frontend sessionType to room requirement
-        session_type = str(course_data.get("sessionType", "Non-Lab session") or "").strip().lower()
-        requires_lab_flag = (session_type == "lab session")
-
-        base_course = {
-            "name": course_data.get("name", ""),
-            "courseCode": course_data.get("courseCode", ""),
-            "courseDescription": course_data.get("subject", ""),
-            "unit": int(course_data.get("unit", 3)),
-            "yearLevel": course_data.get("yearLevel", "1st Year"),
-            "employment_type": course_data.get("employmentType", "FULL-TIME"),
-            "dept": course_data.get("dept", "General"),
-            "requires_lab": requires_lab_flag,
-        }
-
-        raw_block = (course_data.get("block") or "").strip()
-        multi_blocks: List[str] = []
-        if raw_block.upper() in ("A & B", "A&B"):
-            multi_blocks = ["A", "B"]
-        elif "," in raw_block:
-            multi_blocks = [b.strip() for b in raw_block.split(",") if b.strip()]
-        elif raw_block:
-            multi_blocks = [raw_block]
-        else:
-            # Use the original block from the data, default to "A" if empty
-            original_block = course_data.get("block", "A")
-            multi_blocks = [original_block] if original_block else ["A"]
+    # One course per block of multi-block entries, sessions fixed by the instance
+    courses: List[Dict[str, Any]] = instance.expanded_courses()
 
-        for b in multi_blocks:
-            course = dict(base_course)
-            course["block"] = b
-            courses.append(course)
+    # Scenario toggles; dropped[idx] is true when course idx is dropped
+    toggles = toggles or {}
+    toggle_lits: Dict[Tuple[str, Any], Any] = {}
+    for kind, key in (("room", "rooms"), ("day", "days"), ("instructor", "instructors"), ("course", "courses")):
+        for value in toggles.get(key) or ():
+            toggle_lits[(kind, value)] = model.NewBoolVar(f"{kind}_{value}_off")
+    dropped: Dict[int, Any] = {}
+    for idx, course in enumerate(courses):
+        lits = [lit for (kind, value), lit in toggle_lits.items()
+                if (kind == "instructor" and value == course.get("name", ""))
+                or (kind == "course" and value[0] == course["courseCode"] and value[1] in (None, course.get("name", "")))]
+        if len(lits) == 1:
+            dropped[idx] = lits[0]
+        elif lits:
+            dropped[idx] = model.NewBoolVar(f"c{idx}_dropped")
+            model.AddMaxEquality(dropped[idx], lits)
 
     # Create decision variables for each course
     # Each course can be assigned to multiple time slots based on units
     x_slot = {}
     course_sessions = {}  # Store session durations for each course
     
+    pattern_vars: Dict[Tuple[int, Tuple[str, ...], Tuple[int, ...], int], Any] = {}
+    use_patterns = bool(payload.get("meetingPatterns", False))
+    # (day, start minute) -> slots starting then, shortest first
+    slots_at: Dict[Tuple[str, int], List[int]] = {}
+    for s in sorted(slot_ids, key=lambda s: slot_end_min[s] - slot_start_min[s]):
+        slots_at.setdefault((slot_day[s], slot_start_min[s]), []).append(s)
     for idx, course in enumerate(courses):
-        # Generate randomized sessions for this course
-        sessions = generate_randomized_sessions(course["unit"], course["employment_type"])
+        sessions = course["sessions"]
         course_sessions[idx] = sessions
         required_slots = len(sessions)
+        if use_patterns and add_meeting_patterns(model, idx, sessions, slots_at, slot_end_min, x_slot, pattern_vars):
+            continue
         
         # Create variables for each possible slot assignment
         for slot_idx in range(required_slots):
@@ -337,17 +586,38 @@ def solve_with_cp_sat(payload: Dict[str, Any]) -> Dict[str, Any]:
                     model.Add(var == 0)
             # Room selection simplified: assign later to first available room
 
+    if use_patterns:
+        print(f"CP-SAT: {len(pattern_vars)} meeting pattern choices for "
+              f"{len({key[0] for key in pattern_vars})} courses, {len(x_slot)} session slot variables", file=sys.stderr)
+    patterned: Dict[int, List[Any]] = {}
+    for (idx, _, _, _), var in pattern_vars.items():
+        patterned.setdefault(idx, []).append(var)
+
     # Constraints for each course
     for idx, course in enumerate(courses):
         sessions = course_sessions[idx]
         required_slots = len(sessions)
+        if idx in patterned:
+            # Exactly one pattern and start (none once dropped); each session follows
+            model.Add(sum(patterned[idx]) + (dropped[idx] if idx in dropped else 0) == 1)
+            continue
         
         # Each course must use exactly the required number of slots
         for slot_idx in range(required_slots):
-            # Exactly one time slot per slot position
-            model.Add(sum(x_slot[(idx, slot_idx, s)] for s in slot_ids) == 1)
+            # Exactly one time slot per slot position (none once dropped)
+            if idx in dropped:
+                model.Add(sum(x_slot[(idx, slot_idx, s)] for s in slot_ids) + dropped[idx] == 1)
+            else:
+                model.Add(sum(x_slot[(idx, slot_idx, s)] for s in slot_ids) == 1)
             # Room decision removed (single-room/simple assignment handled at output time)
 
+    # Closed days
+    for (kind, day), lit in toggle_lits.items():
+        if kind == "day":
+            for (idx, slot_idx, s), var in x_slot.items():
+                if slot_day[s] == day:
+                    model.AddImplication(lit, var.Not())
+
     # Hard constraints: no instructor overlap, no room overlap
     instructor_to_courses: Dict[str, List[int]] = {}
     for idx, course in enumerate(courses):
@@ -362,7 +632,8 @@ def solve_with_cp_sat(payload: Dict[str, Any]) -> Dict[str, Any]:
                 sessions = course_sessions[course_idx]
                 required_slots = len(sessions)
                 for slot_idx in range(required_slots):
-                    total_assignments += x_slot[(course_idx, slot_idx, s)]
+                    if (course_idx, slot_idx, s) in x_slot:
+                        total_assignments += x_slot[(course_idx, slot_idx, s)]
             model.Add(total_assignments <= 1)
 
     # No section (yearLevel + block) can attend two courses in the same or overlapping time slots (same day)
@@ -371,19 +642,43 @@ def solve_with_cp_sat(payload: Dict[str, Any]) -> Dict[str, Any]:
         section_key = f"{course.get('yearLevel', '')} {course.get('block', '')}".strip()
         section_to_courses.setdefault(section_key, []).append(idx)
 
+    # Sessions run from their slot's start for their own length, not to the
+    # slot's end. Two sessions overlap exactly when the later start falls
+    # inside both, so at most one session per section may run at each slot start
+    day_starts: Dict[str, List[int]] = {}
+    for s in slot_ids:
+        day_starts.setdefault(slot_day[s], []).append(slot_start_min[s])
+    day_starts = {day: sorted(set(points)) for day, points in day_starts.items()}
     for section, course_indices in section_to_courses.items():
-        for s in slot_ids:
-            total_assignments = []
-            for course_idx in course_indices:
-                sessions = course_sessions[course_idx]
-                required_slots = len(sessions)
-                for slot_idx in range(required_slots):
-                    for t in overlapping_slots[s]:
-                        total_assignments.append(x_slot[(course_idx, slot_idx, t)])
-            if total_assignments:
+        running: Dict[Tuple[str, int], List[Any]] = {}
+        for course_idx in course_indices:
+            for slot_idx, hours in enumerate(course_sessions[course_idx]):
+                minutes = int(round(hours * 60))
+                for s in slot_ids:
+                    if (course_idx, slot_idx, s) not in x_slot or minutes > slot_end_min[s] - slot_start_min[s]:
+                        continue
+                    for point in day_starts[slot_day[s]]:
+                        if point >= slot_start_min[s] + minutes:
+                            break
+                        if point >= slot_start_min[s]:
+                            running.setdefault((slot_day[s], point), []).append(x_slot[(course_idx, slot_idx, s)])
+        for total_assignments in running.values():
+            if len(total_assignments) > 1:
                 model.Add(sum(total_assignments) <= 1)
 
-    # Room conflict constraints removed for simplified single-room assignment
+    # Rooms: no per-room variables; overlapping sessions must fit the room pools they can use
+    room_pools = bool(payload.get("roomPools", True))
+    # Room blocks booked elsewhere (campus ledger) as (day, room index, start, end)
+    reserved = [(DAYS[d], instance.room_index[room_id], start, end)
+                for room_id, d, start, end in instance.reserved_rooms if room_id in instance.room_index]
+    if room_pools:
+        closable = {instance.room_index[value]: lit for (kind, value), lit in toggle_lits.items()
+                    if kind == "room" and value in instance.room_index}
+        pool_constraints = add_room_pool_constraints(model, x_slot, courses, course_sessions, slot_day,
+                                                     slot_start_min, slot_end_min, instance.room_compatibility,
+                                                     reserved, closable)
+        if len(courses) <= 10:
+            print(f"DEBUG: Added {pool_constraints} room pool constraints", file=sys.stderr)
 
     # Soft constraint: Prefer no classes during lunch break (12:00 PM - 12:59 PM)
     lunch_penalty_terms = []
@@ -392,6 +687,8 @@ def solve_with_cp_sat(payload: Dict[str, Any]) -> Dict[str, Any]:
         required_slots = len(sessions)
         for slot_idx in range(required_slots):
             for s in slot_ids:
+                if (idx, slot_idx, s) not in x_slot:
+                    continue
                 slot = time_slots[s]
                 # Check if slot violates lunch break
                 if is_lunch_break_violation(slot["start"], slot["end"]):
@@ -408,6 +705,8 @@ def solve_with_cp_sat(payload: Dict[str, Any]) -> Dict[str, Any]:
         
         for slot_idx in range(required_slots):
             for s in slot_ids:
+                if (idx, slot_idx, s) not in x_slot:
+                    continue
                 slot = time_slots[s]
                 
                 # Reduced penalty for wrong employment type time slots
@@ -434,43 +733,287 @@ def solve_with_cp_sat(payload: Dict[str, Any]) -> Dict[str, Any]:
         required_slots = len(sessions)
         for slot_idx in range(required_slots):
             for s in slot_ids:
+                if (idx, slot_idx, s) not in x_slot:
+                    continue
                 day = slot_day[s]
                 # Reduced penalty for overusing any single day
                 day_diversity_penalties.append(1 * x_slot[(idx, slot_idx, s)])  # Reduced from 5 to 1
 
     # Minimize penalties (including lunch break penalties and day diversity)
     all_penalties = penalty_terms + lunch_penalty_terms + day_diversity_penalties
-    if all_penalties:
+    if all_penalties and objective:
         model.Minimize(sum(all_penalties))
+    # Per family, for the staged solve (STAGE_ORDER)
+    objective_terms = {name: sum(terms) for name, terms in (("lunch", lunch_penalty_terms),
+                                                            ("employment", penalty_terms),
+                                                            ("day_diversity", day_diversity_penalties)) if terms}
 
-    solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = float(payload.get("timeLimitSec", 60))  # Increased timeout to 60 seconds
-    solver.parameters.num_search_workers = 4  # Increased workers for better performance
-    # Use default search branching (AUTOMATIC is not available in newer OR-Tools versions)
-    # solver.parameters.search_branching = cp_model.AUTOMATIC  # Removed - not available
-    solver.parameters.cp_model_presolve = True  # Enable presolve
-    solver.parameters.cp_model_probing_level = 0  # Reduced probing to speed up
+    return {
+        "model": model,
+        "x_slot": x_slot,
+        "courses": courses,
+        "course_sessions": course_sessions,
+        "time_slots": time_slots,
+        "slot_ids": slot_ids,
+        "slot_start_min": slot_start_min,
+        "slot_end_min": slot_end_min,
+        "rooms": rooms,
+        "room_compatibility": instance.room_compatibility,
+        "room_pools": room_pools,
+        "reserved_rooms": reserved,
+        "toggles": toggle_lits,
+        "dropped": dropped,
+        "objective_terms": objective_terms,
+        "pattern_vars": pattern_vars,
+        "instance": instance,
+    }
+
+
+def add_meeting_patterns(model: Any, idx: int, sessions: List[float], slots_at: Dict[Tuple[str, int], List[int]],
+                         slot_end_min: List[int], x_slot: Dict[Any, Any],
+                         pattern_vars: Dict[Tuple[int, Tuple[str, ...], Tuple[int, ...], int], Any]) -> bool:
+    """Pattern and start choices for course idx; False (nothing added) if no pattern fits.
+
+    A choice (idx, days, order, start) meets session order[i] on days[i] at
+    start, in the shortest slot starting then that fits the session; a
+    two-session course with sessions of different lengths may take its days
+    in either order. A session's x_slot entry is the choice variable itself
+    when only one choice puts it in that slot, else a variable equal to the
+    sum of those choices (at most one of them is true).
+    """
+    patterns = meeting_patterns(len(sessions))
+    if not patterns:
+        return False
+    minutes = [int(round(hours * 60)) for hours in sessions]
+    starts = sorted({start for _, start in slots_at})
+    orders = [tuple(range(len(sessions)))]
+    if len(sessions) == 2 and minutes[0] != minutes[1]:
+        orders.append((1, 0))
+
+    choices = []
+    for days in patterns:
+        for order in orders:
+            for start in starts:
+                placement = []
+                for i, day in zip(order, days):
+                    s = next((s for s in slots_at.get((day, start), ()) if slot_end_min[s] - start >= minutes[i]), None)
+                    if s is None:
+                        break
+                    placement.append((i, s))
+                else:
+                    choices.append(((idx, days, order, start), placement))
+    if not choices:
+        return False
+
+    covering: Dict[Tuple[int, int, int], List[Any]] = {}
+    for key, placement in choices:
+        var = pattern_vars[key] = model.NewBoolVar(f"c{idx}_{''.join(day[:2] for day in key[1])}_{key[3]}")
+        for i, s in placement:
+            covering.setdefault((idx, i, s), []).append(var)
+    for key, choice_vars in covering.items():
+        if len(choice_vars) == 1:
+            x_slot[key] = choice_vars[0]
+        else:
+            x_slot[key] = model.NewBoolVar(f"c{idx}_slot{key[1]}_{key[2]}")
+            model.Add(x_slot[key] == sum(choice_vars))
+    return True
 
-    # Reduced debug output to prevent pipe overflow
-    if len(courses) <= 10:
-        print(f"DEBUG: Starting solver with {len(courses)} courses", file=sys.stderr)
-    status = solver.Solve(model)
-    if len(courses) <= 10:
-        print(f"DEBUG: Solver status: {status}", file=sys.stderr)
 
+def decision_vars(problem: Dict[str, Any]) -> List[Any]:
+    """Distinct session slot and meeting pattern variables of a built model, e.g. to hint a full solution"""
+    distinct: Dict[int, Any] = {}
+    for var in list(problem["x_slot"].values()) + list(problem["pattern_vars"].values()):
+        distinct.setdefault(var.Index(), var)
+    return list(distinct.values())
+
+
+def add_room_pool_constraints(model: Any, x_slot: Dict[Any, Any], courses: List[Dict[str, Any]],
+                              course_sessions: Dict[int, List[float]], slot_day: List[str], slot_start_min: List[int],
+                              slot_end_min: List[int], compatibility: Any,
+                              reserved: Optional[List[Tuple[str, int, int, int]]] = None,
+                              closable: Optional[Dict[int, Any]] = None) -> int:
+    """Room capacity by class inside the model.
+
+    Every minute where some slot starts is a clique of overlapping sessions
+    (sessions run from their slot's start for their own length). For each
+    compatible room-class set S of a course type, the sessions at that point
+    whose own compatible set lies within S must not outnumber the rooms of S.
+    Per lab flag the compatible sets are nested, so these are all the Hall
+    sets a per-clique room matching needs. Courses with no compatible room
+    are left to the fallback room selection. reserved lists (day, room index,
+    start, end) blocks booked elsewhere; they start cliques too and take their
+    room out of its pools while they run. closable maps room indices to
+    literals that take the room out of its pools everywhere when true.
+    Returns the number of constraints.
+    """
+    reserved = reserved or []
+    closable = closable or {}
+    course_pool: Dict[int, FrozenSet[int]] = {}
+    pool_rooms: Dict[FrozenSet[int], int] = {}
+    for idx, course in enumerate(courses):
+        classes = frozenset(compatibility.classes_for(course["unit"], course["requires_lab"]).tolist())
+        if classes:
+            course_pool[idx] = classes
+            pool_rooms[classes] = int(compatibility.class_size[sorted(classes)].sum())
+    contained = {pool: [other for other in pool_rooms if other <= pool] for pool in pool_rooms}
+
+    starts: Dict[str, List[int]] = {}
+    for s in range(len(slot_day)):
+        starts.setdefault(slot_day[s], []).append(slot_start_min[s])
+    for day, _, start, _ in reserved:
+        if day in starts:
+            starts[day].append(start)
+    starts = {day: sorted(set(points)) for day, points in starts.items()}
+
+    # (day, minute) -> pool -> variables of sessions running at that minute
+    cliques: Dict[Tuple[str, int], Dict[FrozenSet[int], List[Any]]] = {}
+    for idx, pool in course_pool.items():
+        for slot_idx, hours in enumerate(course_sessions[idx]):
+            minutes = int(round(hours * 60))
+            for s in range(len(slot_day)):
+                start = slot_start_min[s]
+                if minutes > slot_end_min[s] - start or (idx, slot_idx, s) not in x_slot:
+                    continue
+                for point in starts[slot_day[s]]:
+                    if point >= start + minutes:
+                        break
+                    if point >= start:
+                        cliques.setdefault((slot_day[s], point), {}).setdefault(pool, []).append(x_slot[(idx, slot_idx, s)])
+
+    added = 0
+    for (day, point), running in cliques.items():
+        taken = {}
+        for block_day, r, start, end in reserved:
+            if block_day == day and start <= point < end:
+                taken[r] = compatibility.room_class[r]
+        for pool, inner in contained.items():
+            rooms = pool_rooms[pool] - sum(1 for k in taken.values() if k in pool)
+            terms = [var for other in inner for var in running.get(other, ())]
+            closing = [lit for r, lit in closable.items() if r not in taken and compatibility.room_class[r] in pool]
+            if len(terms) > rooms - len(closing):
+                model.Add(sum(terms) + sum(closing) <= max(0, rooms))
+                added += 1
+    return added
+
+
+def assign_rooms(sessions: List[Dict[str, Any]], compatibility: Any, time_limit: float = 10.0,
+                 reserved: Optional[List[Tuple[str, int, int, int]]] = None) -> List[Optional[int]]:
+    """Room index per fixed session (day, start, end minutes, unit, requires_lab) without overlaps.
+
+    reserved (day, room index, start, end) blocks are occupied from the start.
+
+    Greedy by start time into the smallest free suitable room, least used
+    first. If that strands a session that has suitable rooms, an exact CP-SAT
+    assignment hinted with the greedy one is solved instead. Sessions
+    without a suitable room (or without any feasible assignment) get None.
+    """
+    candidates = [compatibility.rooms_for(session["unit"], session["requires_lab"]).tolist() for session in sessions]
+    result: List[Optional[int]] = [None] * len(sessions)
+    busy: Dict[Tuple[str, int], List[Tuple[int, int]]] = {}
+    for day, r, start, end in reserved or []:
+        busy.setdefault((day, r), []).append((start, end))
+    usage = [0] * len(compatibility.rooms)
+    for i in sorted(range(len(sessions)), key=lambda i: (sessions[i]["day"], sessions[i]["start"], sessions[i]["end"])):
+        day, start, end = sessions[i]["day"], sessions[i]["start"], sessions[i]["end"]
+        free = [r for r in candidates[i] if all(e <= start or b >= end for b, e in busy.get((day, r), ()))]
+        if free:
+            r = min(free, key=lambda r: (compatibility.capacity[r], usage[r], r))
+            busy.setdefault((day, r), []).append((start, end))
+            usage[r] += 1
+            result[i] = r
+    if all(result[i] is not None for i in range(len(sessions)) if candidates[i]):
+        return result
+
+    day_offset = {day: d * 24 * 60 for d, day in enumerate(DAYS)}
+    model = cp_model.CpModel()
+    intervals: Dict[int, List[Any]] = {}
+    choice: Dict[Tuple[int, int], Any] = {}
+    for i, session in enumerate(sessions):
+        if not candidates[i]:
+            continue
+        offset = day_offset.get(session["day"], len(DAYS) * 24 * 60)
+        for r in candidates[i]:
+            var = choice[(i, r)] = model.NewBoolVar(f"s{i}_r{r}")
+            intervals.setdefault(r, []).append(model.NewOptionalFixedSizeIntervalVar(
+                offset + session["start"], session["end"] - session["start"], var, f"s{i}_r{r}_iv"))
+            if result[i] == r:
+                model.AddHint(var, 1)
+        model.AddExactlyOne(choice[(i, r)] for r in candidates[i])
+    for day, r, start, end in reserved or []:
+        if r in intervals and day in day_offset:
+            intervals[r].append(model.NewFixedSizeIntervalVar(day_offset[day] + start, end - start, f"reserved_r{r}"))
+    for room_intervals in intervals.values():
+        model.AddNoOverlap(room_intervals)
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = float(time_limit)
+    status = solver.Solve(model)
     if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
-        print(f"DEBUG: Solver failed with status: {status}", file=sys.stderr)
-        return {
-            "success": False,
-            "message": f"No feasible assignment found (status: {status})",
-            "schedules": [],
-            "errors": ["Infeasible"]
-        }
+        print(f"WARNING: Exact room assignment failed (status: {status}); keeping greedy rooms", file=sys.stderr)
+        return result
+    for (i, r), var in choice.items():
+        if solver.BooleanValue(var):
+            result[i] = r
+    return result
+
+
+def add_schedule_hints(problem: Dict[str, Any], schedules: List[Dict[str, Any]]) -> int:
+    """Hint CP-SAT with an existing schedule (e.g. the GA's best individual).
+
+    Sessions are matched to model courses by instructor, course code, year
+    level and block, and to base slots by day and start time. Returns the
+    number of hinted session variables.
+    """
+    model, x_slot = problem["model"], problem["x_slot"]
+    time_slots = problem["time_slots"]
+    slot_minutes = [e - s for s, e in zip(problem["slot_start_min"], problem["slot_end_min"])]
+    slots_by_start: Dict[Any, List[int]] = {}
+    for s in problem["slot_ids"]:
+        slots_by_start.setdefault((time_slots[s]["day"], time_slots[s]["start"]), []).append(s)
+
+    sessions_by_course: Dict[Any, List[Dict[str, Any]]] = {}
+    for entry in schedules:
+        for b in expand_blocks(entry.get("block")):
+            key = (entry.get("instructor", ""), entry.get("subject_code", ""), entry.get("year_level", ""), b)
+            sessions_by_course.setdefault(key, []).append(entry)
+
+    hinted = 0
+    # Pattern variables can stand for several sessions; hint each once
+    seen = set()
+    for idx, course in enumerate(problem["courses"]):
+        key = (course.get("name", ""), course["courseCode"], course["yearLevel"], course["block"])
+        entries = sessions_by_course.get(key, [])
+        # Longest scheduled sessions go to the longest required sessions
+        entries = sorted(entries, key=lambda e: _time_to_minutes(e["start_time"]) - _time_to_minutes(e["end_time"]))
+        order = sorted(range(len(problem["course_sessions"][idx])), key=lambda k: -problem["course_sessions"][idx][k])
+        for slot_idx, entry in zip(order, entries):
+            session_minutes = int(round(problem["course_sessions"][idx][slot_idx] * 60))
+            fitting = [s for s in slots_by_start.get((entry["day"], entry["start_time"]), [])
+                       if slot_minutes[s] >= session_minutes and (idx, slot_idx, s) in x_slot]
+            if fitting:
+                var = x_slot[(idx, slot_idx, min(fitting, key=lambda s: slot_minutes[s]))]
+                if var.Index() not in seen:
+                    seen.add(var.Index())
+                    model.AddHint(var, 1)
+                    hinted += 1
+    return hinted
+
+
+def extract_cp_sat_schedules(problem: Dict[str, Any], solver: Any) -> List[Dict[str, Any]]:
+    """Read the solved slot assignment and attach rooms greedily"""
+    courses = problem["courses"]
+    course_sessions = problem["course_sessions"]
+    x_slot = problem["x_slot"]
+    slot_ids = problem["slot_ids"]
+    time_slots = problem["time_slots"]
+    rooms = problem["rooms"]
 
     # Build schedule output
     schedules = []
-    # Track used (day, start, end, room_id) to avoid room conflicts
-    used_room_times: set = set()
+    # Track booked (start, end) minutes per (day, room_id) to avoid room conflicts;
+    # reserved blocks (campus ledger, closed rooms) are booked from the start
+    used_room_times: Dict[Tuple[str, Any], List[Tuple[int, int]]] = {}
+    for day, r, start, end in problem.get("reserved_rooms") or []:
+        used_room_times.setdefault((day, rooms[r]["room_id"]), []).append((start, end))
     # Track per-room usage to balance assignments across existing rooms
     room_usage_count = {r["room_id"]: 0 for r in rooms}
     # Track per-day usage per room to diversify rooms within the same day
@@ -481,6 +1024,8 @@ def solve_with_cp_sat(payload: Dict[str, Any]) -> Dict[str, Any]:
     if len(courses) <= 10:
         print(f"DEBUG: Building schedules for {len(courses)} courses", file=sys.stderr)
     
+    # (course index, slot index, start time, end time, session hours) per solved session
+    solved = []
     for idx, course in enumerate(courses):
         sessions = course_sessions[idx]
         required_slots = len(sessions)
@@ -494,7 +1039,7 @@ def solve_with_cp_sat(payload: Dict[str, Any]) -> Dict[str, Any]:
             
             # Find assigned time slot
             for s in slot_ids:
-                if solver.BooleanValue(x_slot[(idx, slot_idx, s)]):
+                if (idx, slot_idx, s) in x_slot and solver.BooleanValue(x_slot[(idx, slot_idx, s)]):
                     chosen_slot = s
                     break
             
@@ -502,9 +1047,7 @@ def solve_with_cp_sat(payload: Dict[str, Any]) -> Dict[str, Any]:
 
             if chosen_slot is not None:
                 slot = time_slots[chosen_slot]
-                # Greedy room assignment from provided rooms (DB) avoiding conflicts
-                assigned_room = None
-                
+
                 # Calculate actual start and end times based on session duration
                 session_duration = sessions[slot_idx]
                 start_time = slot["start"]
@@ -517,36 +1060,67 @@ def solve_with_cp_sat(payload: Dict[str, Any]) -> Dict[str, Any]:
                 end_hour = end_minutes // 60
                 end_min = end_minutes % 60
                 end_time = f"{end_hour:02d}:{end_min:02d}:00"
-
-                # Dynamic room selection with intelligent distribution
-                assigned_room = select_optimal_room_dynamic(rooms, course, slot, used_room_times, room_usage_count, room_day_usage, rr_pointer)
-                if assigned_room:
-                    rr_pointer += 1
-                
-                section_str = f"{course['yearLevel']} {course['block']}".strip()
-                schedule_entry = {
-                    "instructor": course["name"],
-                    "subject_code": course["courseCode"],
-                    "subject_description": course["courseDescription"],
-                    "unit": course["unit"],
-                    "day": slot["day"],
-                    "start_time": start_time,
-                    "end_time": end_time,
-                    "block": course["block"],
-                    "year_level": course["yearLevel"],
-                    "section": section_str,
-                    "dept": course.get("dept", "General"),
-                    "employment_type": course["employment_type"],
-                    "sessionType": course.get("sessionType", "Non-Lab session"),
-                    "room_id": assigned_room["room_id"] if assigned_room else None
-                }
-                
-                schedules.append(schedule_entry)
-                # Reduced debug output to prevent pipe overflow
-                if len(courses) <= 10:
-                    print(f"DEBUG: Created schedule: {course['courseCode']} on {slot['day']} {start_time}-{end_time} ({session_duration}h) in room {schedule_entry['room_id']}", file=sys.stderr)
+                solved.append((idx, chosen_slot, start_time, end_time, session_duration))
             else:
                 print(f"DEBUG: Failed to find slot/room for course {idx} slot {slot_idx}", file=sys.stderr)
+
+    # Pooled rooms: the model kept every clique within its room pools, so assign exactly
+    pooled: List[Optional[int]] = [None] * len(solved)
+    if problem.get("room_pools") and solved:
+        pooled = assign_rooms([
+            {
+                "day": time_slots[chosen_slot]["day"],
+                "start": _time_to_minutes(start_time),
+                "end": _time_to_minutes(end_time),
+                "unit": courses[idx]["unit"],
+                "requires_lab": courses[idx]["requires_lab"],
+            }
+            for idx, chosen_slot, start_time, end_time, _ in solved
+        ], problem["room_compatibility"], reserved=problem.get("reserved_rooms"))
+        for room_index, (idx, chosen_slot, start_time, end_time, _) in zip(pooled, solved):
+            if room_index is not None:
+                used_room_times.setdefault((time_slots[chosen_slot]["day"], rooms[room_index]["room_id"]), []).append(
+                    (_time_to_minutes(start_time), _time_to_minutes(end_time)))
+
+    for room_index, (idx, chosen_slot, start_time, end_time, session_duration) in zip(pooled, solved):
+        course = courses[idx]
+        slot = time_slots[chosen_slot]
+        session = {"day": slot["day"], "start": _time_to_minutes(start_time), "end": _time_to_minutes(end_time)}
+        if room_index is not None:
+            assigned_room = rooms[room_index]
+            room_usage_count[assigned_room["room_id"]] = room_usage_count.get(assigned_room["room_id"], 0) + 1
+        else:
+            # Dynamic room selection with intelligent distribution
+            closed = problem.get("closed_rooms")
+            open_rooms = [r for r in rooms if r["room_id"] not in closed] if closed else rooms
+            assigned_room = select_optimal_room_dynamic(open_rooms, course, session,
+                                                        used_room_times, room_usage_count, room_day_usage, rr_pointer,
+                                                        problem.get("room_compatibility"))
+        if assigned_room:
+            rr_pointer += 1
+        
+        section_str = f"{course['yearLevel']} {course['block']}".strip()
+        schedule_entry = {
+            "instructor": course["name"],
+            "subject_code": course["courseCode"],
+            "subject_description": course["courseDescription"],
+            "unit": course["unit"],
+            "day": slot["day"],
+            "start_time": start_time,
+            "end_time": end_time,
+            "block": course["block"],
+            "year_level": course["yearLevel"],
+            "section": section_str,
+            "dept": course.get("dept", "General"),
+            "employment_type": course["employment_type"],
+            "sessionType": course.get("sessionType", "Non-Lab session"),
+            "room_id": assigned_room["room_id"] if assigned_room else None
+        }
+        
+        schedules.append(schedule_entry)
+        # Reduced debug output to prevent pipe overflow
+        if len(courses) <= 10:
+            print(f"DEBUG: Created schedule: {course['courseCode']} on {slot['day']} {start_time}-{end_time} ({session_duration}h) in room {schedule_entry['room_id']}", file=sys.stderr)
     
     # Reduced debug output to prevent pipe overflow
     if len(courses) <= 10:
@@ -566,19 +1140,7 @@ def solve_with_cp_sat(payload: Dict[str, Any]) -> Dict[str, Any]:
     except Exception:
         pass
 
-    # Validate units coverage
-    course_units = {course["courseCode"]: course["unit"] for course in courses}
-    units_valid = validate_units_coverage(schedules, course_units)
-    
-    if not units_valid:
-        print("WARNING: Units coverage validation failed", file=sys.stderr)
-
-    return {
-        "success": True,
-        "message": "Solved" + (" (with units validation warnings)" if not units_valid else ""),
-        "schedules": schedules,
-        "errors": [] if units_valid else ["Units coverage validation failed"]
-    }
+    return schedules
 
 
 def format_time_12hour(time_24: str) -> str:
@@ -594,7 +1156,10 @@ def main() -> None:
             print(json.dumps({"success": False, "message": "Empty input"}))
             return
 
-        result = solve_with_cp_sat(payload)
+        with profile_run(payload, "cp_sat") as profiler:
+            result = solve_with_cp_sat(payload)
+        result = apply_post_check(profiler.attach(result), payload.get("check"), payload.get("rooms"))
+        result = apply_output_mode(result, payload)
         print(json.dumps(result), flush=True)
         
     except Exception as e:
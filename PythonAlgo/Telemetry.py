@@ -0,0 +1,102 @@
+import sys
+import json
+import time
+from typing import Dict, Any, Optional, IO, List
+
+
+class PhaseTimer:
+    """Accumulates exclusive wall time per phase.
+
+    Phases nest: entering a phase pauses the enclosing one, so repair time
+    spent inside crossover is charged to repair only.
+    """
+
+    def __init__(self):
+        self.totals: Dict[str, float] = {}
+        self._stack: List[str] = []
+        self._since = 0.0
+
+    def start(self, phase: str) -> None:
+        now = time.perf_counter()
+        if self._stack:
+            outer = self._stack[-1]
+            self.totals[outer] = self.totals.get(outer, 0.0) + now - self._since
+        self._stack.append(phase)
+        self._since = now
+
+    def stop(self) -> None:
+        now = time.perf_counter()
+        phase = self._stack.pop()
+        self.totals[phase] = self.totals.get(phase, 0.0) + now - self._since
+        self._since = now
+
+    def take(self) -> Dict[str, float]:
+        """Totals since the last call, then reset"""
+        totals, self.totals = self.totals, {}
+        return totals
+
+
+class TelemetrySink:
+    """Newline-delimited JSON records, one per call to emit.
+
+    target is a file path (appended to) or "stderr"; stdout is reserved for
+    the solver result. Write errors disable the sink instead of failing the
+    solve.
+    """
+
+    def __init__(self, target: str, run_id: Optional[str] = None):
+        self.run_id = run_id or f"{int(time.time() * 1000):x}"
+        self._owned = target not in ("stderr", "-")
+        self._stream: Optional[IO[str]] = open(target, "a", buffering=1) if self._owned else sys.stderr
+
+    def emit(self, event: str, **fields: Any) -> None:
+        if self._stream is None:
+            return
+        record = {"event": event, "run_id": self.run_id, "ts": round(time.time(), 3)}
+        record.update(fields)
+        try:
+            self._stream.write(json.dumps(record, default=_json_default) + "\n")
+        except (OSError, ValueError) as e:
+            print(f"WARNING: telemetry disabled: {e}", file=sys.stderr)
+            self._stream = None
+
+    def close(self) -> None:
+        if self._stream is not None and self._owned:
+            self._stream.close()
+        self._stream = None
+
+
+def open_sink(config: Any) -> Optional[TelemetrySink]:
+    """Sink from a payload "telemetry" value: a path/"stderr" or {"path", "runId"}"""
+    if not config:
+        return None
+    if isinstance(config, dict):
+        target = config.get("path")
+        run_id = config.get("runId")
+    else:
+        target, run_id = str(config), None
+    if not target:
+        return None
+    try:
+        return TelemetrySink(target, run_id)
+    except OSError as e:
+        print(f"WARNING: cannot open telemetry sink {target}: {e}", file=sys.stderr)
+        return None
+
+
+def population_stats(values: List[float]) -> Dict[str, float]:
+    """best/mean/worst/std of a fitness list (lower is better)"""
+    if not values:
+        return {}
+    n = len(values)
+    mean = sum(values) / n
+    variance = sum((v - mean) ** 2 for v in values) / n
+    return {"best": min(values), "mean": mean, "worst": max(values), "std": variance ** 0.5}
+
+
+def _json_default(value: Any) -> Any:
+    # numpy scalars and other number-likes
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return str(value)
@@ -0,0 +1,159 @@
+from typing import List, Dict, Any, Optional, Callable
+
+
+class Progress:
+    """Search state handed to termination policies after each scored generation"""
+
+    def __init__(self, generation: int, elapsed: float, best_fitness: float, history: List[float],
+                 generation_sec: float, hard_conflicts: Callable[[], int]):
+        self.generation = generation          # generations scored so far
+        self.elapsed = elapsed                # seconds since the search started
+        self.best_fitness = best_fitness      # best seen so far
+        self.history = history                # best fitness per generation
+        self.generation_sec = generation_sec  # duration of the last generation
+        self._hard_conflicts = hard_conflicts
+        self._hard = None
+
+    def hard_conflicts(self) -> int:
+        """Hard conflicts of the best individual (computed on first use)"""
+        if self._hard is None:
+            self._hard = self._hard_conflicts()
+        return self._hard
+
+
+class TerminationPolicy:
+    """Decides when a search stops; check returns a reason string to stop, else None"""
+
+    def check(self, progress: Progress) -> Optional[str]:
+        raise NotImplementedError
+
+
+class TimeBudget(TerminationPolicy):
+    """Stop when another generation would not finish inside the budget"""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    def check(self, progress: Progress) -> Optional[str]:
+        if progress.elapsed + progress.generation_sec > self.seconds:
+            return f"time budget of {self.seconds:.1f}s reached after {progress.elapsed:.1f}s"
+        return None
+
+
+class MaxGenerations(TerminationPolicy):
+    def __init__(self, generations: int):
+        self.generations = generations
+
+    def check(self, progress: Progress) -> Optional[str]:
+        if progress.generation >= self.generations:
+            return f"{self.generations} generations run"
+        return None
+
+
+class ZeroHardConflicts(TerminationPolicy):
+    def check(self, progress: Progress) -> Optional[str]:
+        if progress.hard_conflicts() == 0:
+            return "best schedule has no hard conflicts"
+        return None
+
+
+class TargetFitness(TerminationPolicy):
+    def __init__(self, target: float):
+        self.target = target
+
+    def check(self, progress: Progress) -> Optional[str]:
+        if progress.best_fitness <= self.target:
+            return f"target fitness {self.target:.2f} reached"
+        return None
+
+
+class Plateau(TerminationPolicy):
+    """Stop after a number of generations without improving the best fitness"""
+
+    def __init__(self, generations: int):
+        self.generations = generations
+
+    def check(self, progress: Progress) -> Optional[str]:
+        history = progress.history
+        if len(history) > self.generations and min(history[-self.generations:]) >= min(history[:-self.generations]):
+            return f"no improvement in {self.generations} generations"
+        return None
+
+
+class ImprovementRate(TerminationPolicy):
+    """Stop when the best fitness improved by less than min_rate (relative) over the last window generations"""
+
+    def __init__(self, window: int, min_rate: float):
+        self.window = window
+        self.min_rate = min_rate
+
+    def check(self, progress: Progress) -> Optional[str]:
+        history = progress.history
+        if len(history) <= self.window:
+            return None
+        before = min(history[:-self.window])
+        now = min(history)
+        rate = (before - now) / abs(before) if before else 0.0
+        if rate < self.min_rate:
+            return f"improvement {rate:.4%} over {self.window} generations below {self.min_rate:.4%}"
+        return None
+
+
+class AnyOf(TerminationPolicy):
+    """Stops when any member policy does"""
+
+    def __init__(self, policies: List[TerminationPolicy]):
+        self.policies = policies
+
+    def check(self, progress: Progress) -> Optional[str]:
+        for policy in self.policies:
+            reason = policy.check(progress)
+            if reason:
+                return reason
+        return None
+
+    def budget(self) -> Optional[float]:
+        budgets = [p.seconds for p in self.policies if isinstance(p, TimeBudget)]
+        return min(budgets) if budgets else None
+
+
+def build_termination(config: Optional[Dict[str, Any]], default_budget: float, default_generations: int) -> AnyOf:
+    """Policies from a payload "termination" object.
+
+    Keys: timeBudgetSec, maxGenerations, zeroHardConflicts, targetFitness,
+    plateauGenerations, minImprovement {window, rate}. Without a config the
+    search runs default_generations within default_budget seconds. A time
+    budget without maxGenerations lifts the generation cap so the whole
+    budget is used.
+    """
+    if not config:
+        return AnyOf([TimeBudget(default_budget), MaxGenerations(default_generations)])
+
+    policies: List[TerminationPolicy] = []
+    budget = config.get("timeBudgetSec")
+    policies.append(TimeBudget(float(budget) if budget is not None else default_budget))
+    if config.get("maxGenerations") is not None:
+        policies.append(MaxGenerations(int(config["maxGenerations"])))
+    elif budget is None:
+        policies.append(MaxGenerations(default_generations))
+    if config.get("zeroHardConflicts"):
+        policies.append(ZeroHardConflicts())
+    if config.get("targetFitness") is not None:
+        policies.append(TargetFitness(float(config["targetFitness"])))
+    if config.get("plateauGenerations"):
+        policies.append(Plateau(int(config["plateauGenerations"])))
+    improvement = config.get("minImprovement")
+    if isinstance(improvement, dict):
+        policies.append(ImprovementRate(int(improvement.get("window", 10)), float(improvement.get("rate", 0.001))))
+    return AnyOf(policies)
+
+
+def scaled_population_size(offspring_sec: float, budget: float, target_generations: int = 30,
+                           minimum: int = 20, maximum: int = 200) -> int:
+    """Population that lets target_generations fit in the budget, given the measured
+    cost of producing one offspring (create/repair scales with instance size)"""
+    if offspring_sec <= 0:
+        return maximum
+    size = int(budget / (target_generations * offspring_sec))
+    size = max(minimum, min(maximum, size))
+    return size + (size % 2)
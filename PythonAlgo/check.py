@@ -0,0 +1,298 @@
+"""Conflict checker for saved or freshly generated schedules.
+
+    python -m PythonAlgo.check [--repair] [--drop-unresolved] [file]
+
+Input (file or stdin) is a list of schedule dicts, {"schedules": [...],
+"rooms": [...]}, or {"groups": [{"group_id": ..., "schedules": [...]}, ...]}
+to check whole schedule groups separately. Schedules carry instructor,
+section (or year_level + block), room_id, day, start_time and end_time, or
+a "meetings" list of day/start_time/end_time/room_id. Combined days such as
+"MonWed" are split. The report goes to stdout as JSON.
+"""
+import sys
+import json
+import time
+import argparse
+from typing import List, Dict, Any, Tuple, Optional
+
+import numpy as np
+
+try:
+    from .DayScheduler import DAYS, split_combined_days, schedule_section, minutes_to_clock
+    from .TimeScheduler import generate_comprehensive_time_slots, is_lunch_break_violation, time_to_minutes
+except ImportError:
+    from DayScheduler import DAYS, split_combined_days, schedule_section, minutes_to_clock
+    from TimeScheduler import generate_comprehensive_time_slots, is_lunch_break_violation, time_to_minutes
+
+
+RESOURCE_KINDS = ('instructor', 'room', 'section')
+
+# Minutes per day; resource-day keys are laid out on one line in steps of this
+_DAY_SPAN = 24 * 60
+
+
+def expand_meetings(schedules: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """One meeting dict per schedule, nested meeting and day.
+
+    Each meeting has instructor, section, room_id, day, start_time, end_time,
+    start/end minutes and "schedule" (index of the schedule it came from).
+    Reversed times are swapped, as the PHP checker does.
+    """
+    meetings = []
+    for index, schedule in enumerate(schedules):
+        for meeting in schedule.get("meetings") or [schedule]:
+            start = meeting.get("start_time") or ""
+            end = meeting.get("end_time") or ""
+            if not start or not end:
+                continue
+            start_min, end_min = time_to_minutes(start), time_to_minutes(end)
+            if start_min > end_min:
+                start, end, start_min, end_min = end, start, end_min, start_min
+            room_id = meeting.get("room_id", schedule.get("room_id"))
+            for day in split_combined_days(meeting.get("day") or ""):
+                meetings.append({
+                    "schedule": index,
+                    "instructor": schedule.get("instructor") or schedule.get("instructor_name") or "",
+                    "section": schedule_section(schedule),
+                    "room_id": room_id,
+                    "day": day,
+                    "start_time": start,
+                    "end_time": end,
+                    "start": start_min,
+                    "end": end_min,
+                })
+    return meetings
+
+
+def _resource(meeting: Dict[str, Any], kind: str) -> Any:
+    return meeting["room_id"] if kind == 'room' else meeting[kind]
+
+
+def find_overlaps(meetings: List[Dict[str, Any]], kind: str) -> Tuple[int, List[List[int]]]:
+    """Overlapping pairs and conflict groups for one resource kind.
+
+    Meetings are sorted by (resource, day, start) and swept: a meeting joins
+    the current group while it starts before the group's latest end. Pairs
+    are counted by binary search for the meetings starting before each end.
+    O(n log n) overall. Groups are lists of meeting indices with two or more
+    members; meetings without the resource (no room, empty name) are skipped.
+    """
+    keys: Dict[Any, int] = {}
+    rows, key_ids, starts, ends = [], [], [], []
+    day_ids = {day: i for i, day in enumerate(DAYS)}
+    for i, meeting in enumerate(meetings):
+        resource = _resource(meeting, kind)
+        if resource is None or resource == "" or meeting["end"] <= meeting["start"]:
+            continue
+        day = day_ids.get(meeting["day"])
+        if day is None:
+            day = day_ids[meeting["day"]] = len(day_ids)
+        key = keys.setdefault((resource, day), len(keys))
+        rows.append(i)
+        key_ids.append(key)
+        starts.append(meeting["start"])
+        ends.append(meeting["end"])
+    if len(rows) < 2:
+        return 0, []
+
+    # Put every resource-day on its own stretch of one line
+    offset = np.array(key_ids, dtype=np.int64) * _DAY_SPAN
+    start = np.array(starts, dtype=np.int64) + offset
+    end = np.array(ends, dtype=np.int64) + offset
+    order = np.argsort(start, kind='stable')
+    start, end = start[order], end[order]
+
+    # Pairs: meetings after i (in start order) that start before i ends
+    pairs = int((np.searchsorted(start, end, side='left') - np.arange(len(start)) - 1).sum())
+
+    # Groups: a new group starts where a meeting starts at or after every earlier end
+    reach = np.maximum.accumulate(end)
+    breaks = np.flatnonzero(start[1:] >= reach[:-1]) + 1
+    bounds = np.concatenate(([0], breaks, [len(start)]))
+    sizes = np.diff(bounds)
+    rows = np.array(rows)[order]
+    groups = [rows[bounds[g]:bounds[g + 1]].tolist() for g in np.flatnonzero(sizes > 1)]
+    return pairs, groups
+
+
+def check_schedules(schedules: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Instructor, room and section overlaps of a schedule list"""
+    started = time.perf_counter()
+    meetings = expand_meetings(schedules)
+    report: Dict[str, Any] = {"meetings": len(meetings)}
+    total = 0
+    for kind in RESOURCE_KINDS:
+        pairs, groups = find_overlaps(meetings, kind)
+        total += pairs
+        report[kind] = {
+            "pairs": pairs,
+            "groups": [[_describe(meetings[i]) for i in group] for group in groups],
+        }
+    report["total_conflicts"] = total
+    report["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return report
+
+
+def _describe(meeting: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: meeting[key] for key in ("schedule", "instructor", "section", "room_id", "day", "start_time", "end_time")}
+
+
+class _Ledger:
+    """Busy intervals per (kind, resource, day); lists are a handful of meetings long"""
+
+    def __init__(self):
+        self.busy: Dict[Tuple[str, Any, str], List[Tuple[int, int]]] = {}
+
+    def free(self, kind: str, resource: Any, day: str, start: int, end: int) -> bool:
+        if resource is None or resource == "":
+            return True
+        return not any(s < end and start < e for s, e in self.busy.get((kind, resource, day), ()))
+
+    def reserve(self, kind: str, resource: Any, day: str, start: int, end: int) -> None:
+        if resource is not None and resource != "":
+            self.busy.setdefault((kind, resource, day), []).append((start, end))
+
+    def fits(self, meeting: Dict[str, Any], room_id: Any, day: str, start: int, end: int) -> bool:
+        return (self.free('instructor', meeting["instructor"], day, start, end)
+                and self.free('section', meeting["section"], day, start, end)
+                and self.free('room', room_id, day, start, end))
+
+    def place(self, meeting: Dict[str, Any]) -> None:
+        for kind in RESOURCE_KINDS:
+            self.reserve(kind, _resource(meeting, kind), meeting["day"], meeting["start"], meeting["end"])
+
+
+def _candidate_starts(time_slots: List[Dict[str, Any]]) -> Tuple[List[Tuple[str, int]], Dict[str, int]]:
+    """Distinct (day, start minute) of the base slots and the latest end per day"""
+    starts = {}
+    latest: Dict[str, int] = {}
+    for slot in time_slots:
+        starts[(slot["day"], time_to_minutes(slot["start"]))] = True
+        latest[slot["day"]] = max(latest.get(slot["day"], 0), time_to_minutes(slot["end"]))
+    return sorted(starts, key=lambda k: (DAYS.index(k[0]) if k[0] in DAYS else len(DAYS), k[1])), latest
+
+
+def repair_schedules(schedules: List[Dict[str, Any]], rooms: Optional[List[Dict[str, Any]]] = None,
+                     drop_unresolved: bool = False,
+                     time_slots: Optional[List[Dict[str, Any]]] = None) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Greedy repair: meetings are kept in schedule order and each one that
+    collides with an already kept meeting is moved to the first base slot start
+    (same duration, no lunch overlap) where its instructor, section and room
+    are free, trying its own room first and then rooms of the same lab type.
+    A meeting without a room is only moved into one of the given rooms.
+
+    Returns one schedule dict per meeting (day split, "meetings" flattened)
+    and a summary of moved and unresolved meetings. Unresolved meetings stay
+    in place unless drop_unresolved is set, mirroring the controller's
+    filterSchedulesByConflicts.
+    """
+    if time_slots is None:
+        time_slots = generate_comprehensive_time_slots()
+    candidate_starts, latest_end = _candidate_starts(time_slots)
+    room_list = rooms or []
+    room_by_id = {room.get("room_id"): room for room in room_list}
+
+    ledger = _Ledger()
+    repaired, moved, unresolved = [], 0, []
+    for meeting in expand_meetings(schedules):
+        schedule = schedules[meeting["schedule"]]
+        if not ledger.fits(meeting, meeting["room_id"], meeting["day"], meeting["start"], meeting["end"]):
+            placement = _find_placement(ledger, meeting, schedule, room_list, room_by_id, candidate_starts, latest_end)
+            if placement is None:
+                unresolved.append(_describe(meeting))
+                if drop_unresolved:
+                    continue
+            else:
+                meeting["day"], meeting["start"], meeting["room_id"] = placement
+                meeting["end"] = meeting["start"] + (time_to_minutes(meeting["end_time"]) - time_to_minutes(meeting["start_time"]))
+                meeting["start_time"], meeting["end_time"] = minutes_to_clock(meeting["start"]), minutes_to_clock(meeting["end"])
+                moved += 1
+        ledger.place(meeting)
+        out = {key: value for key, value in schedule.items() if key != "meetings"}
+        out.update(day=meeting["day"], start_time=meeting["start_time"], end_time=meeting["end_time"],
+                   room_id=meeting["room_id"])
+        repaired.append(out)
+    return repaired, {"moved": moved, "unresolved": unresolved, "dropped": len(unresolved) if drop_unresolved else 0}
+
+
+def _find_placement(ledger: _Ledger, meeting: Dict[str, Any], schedule: Dict[str, Any], rooms: List[Dict[str, Any]],
+                    room_by_id: Dict[Any, Dict[str, Any]], candidate_starts: List[Tuple[str, int]],
+                    latest_end: Dict[str, int]) -> Optional[Tuple[str, int, Any]]:
+    duration = meeting["end"] - meeting["start"]
+    current = room_by_id.get(meeting["room_id"])
+    is_lab = bool(current.get("is_lab", False)) if current else schedule.get("sessionType", "").lower() == "lab session"
+    # A meeting is only placed into a real room; None would pass every room check
+    room_ids = [meeting["room_id"]] if meeting["room_id"] is not None else []
+    room_ids += [
+        room.get("room_id") for room in rooms
+        if room.get("room_id") is not None and room.get("room_id") != meeting["room_id"]
+        and room.get("is_active", True) and bool(room.get("is_lab", False)) == is_lab
+    ]
+    for day, start in candidate_starts:
+        end = start + duration
+        if end > latest_end.get(day, 0) or is_lunch_break_violation(minutes_to_clock(start), minutes_to_clock(end)):
+            continue
+        for room_id in room_ids:
+            if ledger.fits(meeting, room_id, day, start, end):
+                return day, start, room_id
+    return None
+
+
+def check_payload(data: Any, repair: bool = False, drop_unresolved: bool = False) -> Dict[str, Any]:
+    """Check (and optionally repair) a schedule list, a {"schedules"} object or {"groups"}"""
+    if isinstance(data, dict) and isinstance(data.get("groups"), list):
+        return {"groups": [
+            dict(check_payload(group, repair, drop_unresolved), group_id=group.get("group_id"))
+            for group in data["groups"]
+        ]}
+    schedules = data if isinstance(data, list) else data.get("schedules", [])
+    rooms = data.get("rooms") if isinstance(data, dict) else None
+    result = {"success": True, "report": check_schedules(schedules)}
+    if repair:
+        repaired, summary = repair_schedules(schedules, rooms, drop_unresolved)
+        result["repair"] = summary
+        result["schedules"] = repaired
+        result["report_after_repair"] = check_schedules(repaired)
+    return result
+
+
+def apply_post_check(result: Dict[str, Any], mode: Any, rooms: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """In-pipeline check of a solver result before it is returned.
+
+    mode "report" attaches the overlap report as result["check"]; "repair"
+    also replaces result["schedules"] with the repaired schedules. Anything
+    else leaves the result untouched.
+    """
+    if mode not in ("report", "repair") or not result.get("schedules"):
+        return result
+    if mode == "repair":
+        checked = check_payload({"schedules": result["schedules"], "rooms": rooms}, repair=True)
+        result["schedules"] = checked["schedules"]
+        result["check"] = dict(checked["report_after_repair"], repair=checked["repair"],
+                               conflicts_before_repair=checked["report"]["total_conflicts"])
+    else:
+        result["check"] = check_schedules(result["schedules"])
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m PythonAlgo.check", description="Report schedule overlaps")
+    parser.add_argument("file", nargs="?", help="JSON input (default: stdin)")
+    parser.add_argument("--repair", action="store_true", help="move conflicting meetings to free slots")
+    parser.add_argument("--drop-unresolved", action="store_true", help="with --repair, drop meetings that cannot be placed")
+    args = parser.parse_args(argv)
+    try:
+        if args.file:
+            with open(args.file) as handle:
+                data = json.load(handle)
+        else:
+            raw = sys.stdin.read()
+            data = json.loads(raw) if raw else []
+        result = check_payload(data, args.repair, args.drop_unresolved)
+    except Exception as e:
+        result = {"success": False, "message": f"Conflict check error: {e}", "errors": [str(e)]}
+    print(json.dumps(result), flush=True)
+
+
+if __name__ == "__main__":
+    main()
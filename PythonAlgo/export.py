@@ -0,0 +1,369 @@
+"""Normalized schedule output for bulk database insert.
+
+    python -m PythonAlgo.export [--format json|sql|csv] [--group-id N] [--out FILE] [file]
+
+Solvers emit one flat row per session. normalize_schedules regroups them the
+way AutomateScheduleController::saveSchedulesToDatabase stores them: one
+entry per (subject, section, instructor) with its meetings (Mon..Sat enum
+days, meeting type, room) and a compact day label, plus the subjects,
+sections and instructors those entries reference. write_sql renders that
+as a few multi-row MySQL statements keyed by natural keys (subject code,
+section code, instructor name), so a department's schedule is saved without
+per-row round trips; write_csv writes one denormalized row per meeting for
+LOAD DATA. schedule_meetings.room_id is NOT NULL, so meetings without a room
+are left out of the SQL and reported by unroomed_meetings instead.
+"""
+import re
+import io
+import sys
+import csv
+import json
+import argparse
+from typing import List, Dict, Any, Optional, Tuple
+
+try:
+    from .DayScheduler import DAYS, day_indices, clock_minutes, minutes_to_clock, to_compact_day_label
+except ImportError:
+    from DayScheduler import DAYS, day_indices, clock_minutes, minutes_to_clock, to_compact_day_label
+
+
+# schedule_meetings.day enum values, by canonical day index
+MEETING_DAYS = tuple(day[:3] for day in DAYS)
+
+# Rows per INSERT statement
+SQL_BATCH_ROWS = 500
+
+CSV_COLUMNS = (
+    "group_id", "subject_code", "subject_description", "units", "section_code", "year_level", "department",
+    "instructor", "employment_type", "day", "start_time", "end_time", "room_id", "meeting_type",
+)
+
+
+def section_code(schedule: Dict[str, Any]) -> str:
+    """sections.code as the controller builds it: "<dept>-<year level> <block>" """
+    year_block = " ".join(f"{schedule.get('year_level', '')} {schedule.get('block', '')}".split())
+    if year_block:
+        return f"{str(schedule.get('dept') or 'General').strip()}-{year_block}"
+    return str(schedule.get("section") or "")
+
+
+def section_year_level(code: str) -> int:
+    """Numeric year level of a section code ("1st Year", roman numerals or a plain number), else 0"""
+    match = re.search(r"(\d+)(?:st|nd|rd|th)\s+Year", code, re.IGNORECASE)
+    if match:
+        return int(match.group(1))
+    match = re.search(r"\b(I{1,3}|IV|V)\b", code, re.IGNORECASE)
+    if match:
+        return {"I": 1, "II": 2, "III": 3, "IV": 4, "V": 5}[match.group(1).upper()]
+    match = re.search(r"(\d+)", code)
+    return int(match.group(1)) if match else 0
+
+
+def meeting_type(schedule: Dict[str, Any]) -> str:
+    return "lab" if str(schedule.get("sessionType") or "").strip().lower() == "lab session" else "lecture"
+
+
+def employment_type(value: Any) -> str:
+    return "PART-TIME" if str(value or "").strip().upper().replace("_", "-") == "PART-TIME" else "FULL-TIME"
+
+
+def normalize_schedules(schedules: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Group flat session rows into entries with meeting lists.
+
+    Joint sessions (same subject, instructor and time window) share the room
+    of the first one, as the controller harmonizes them before saving.
+    Duplicate meetings (same day and time) are dropped. Returns {"subjects",
+    "sections", "instructors", "entries"}; entries keep first-seen order.
+    """
+    joint_rooms: Dict[Tuple[str, str, int, int], Any] = {}
+    subjects: Dict[str, Dict[str, Any]] = {}
+    sections: Dict[str, Dict[str, Any]] = {}
+    instructors: Dict[str, Dict[str, Any]] = {}
+    entries: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+    seen: Dict[Tuple[str, str, str], set] = {}
+
+    for schedule in schedules:
+        subject = str(schedule.get("subject_code") or "")
+        instructor = str(schedule.get("instructor") or schedule.get("instructor_name") or "")
+        code = section_code(schedule)
+        if not subject or not code:
+            continue
+        subjects.setdefault(subject, {
+            "code": subject,
+            "description": schedule.get("subject_description") or subject,
+            "units": int(schedule.get("unit") or 0),
+        })
+        sections.setdefault(code, {
+            "code": code,
+            "year_level": section_year_level(code),
+            "department": str(schedule.get("dept") or "General").strip(),
+        })
+        if instructor:
+            instructors.setdefault(instructor, {
+                "name": instructor,
+                "employment_type": employment_type(schedule.get("employment_type")),
+            })
+
+        key = (subject, code, instructor)
+        entry = entries.get(key)
+        if entry is None:
+            entry = entries[key] = {
+                "subject_code": subject,
+                "section_code": code,
+                "instructor": instructor,
+                "year_level": schedule.get("year_level", ""),
+                "block": schedule.get("block", ""),
+                "status": "confirmed",
+                "meetings": [],
+            }
+            seen[key] = set()
+
+        kind = meeting_type(schedule)
+        for meeting in schedule.get("meetings") or [schedule]:
+            start = clock_minutes(meeting.get("start_time") or "")
+            end = clock_minutes(meeting.get("end_time") or "")
+            if start is None or end is None:
+                continue
+            if start > end:
+                start, end = end, start
+            room_id = meeting.get("room_id", schedule.get("room_id"))
+            if instructor and room_id is not None:
+                room_id = joint_rooms.setdefault((subject, instructor, start, end), room_id)
+            for d in day_indices(meeting.get("day") or ""):
+                if (d, start, end) in seen[key]:
+                    continue
+                seen[key].add((d, start, end))
+                entry["meetings"].append({
+                    "day": MEETING_DAYS[d],
+                    "start_time": minutes_to_clock(start),
+                    "end_time": minutes_to_clock(end),
+                    "room_id": room_id,
+                    "meeting_type": kind,
+                })
+
+    normalized = []
+    for entry in entries.values():
+        if not entry["meetings"]:
+            continue
+        entry["meetings"].sort(key=lambda m: (MEETING_DAYS.index(m["day"]), m["start_time"]))
+        entry["day_label"] = to_compact_day_label([m["day"] for m in entry["meetings"]])
+        normalized.append(entry)
+    return {
+        "subjects": list(subjects.values()),
+        "sections": list(sections.values()),
+        "instructors": list(instructors.values()),
+        "entries": normalized,
+    }
+
+
+# ----------------------------------------------------------------------
+# Bulk files
+# ----------------------------------------------------------------------
+
+def sql_literal(value: Any) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, (int, float)):
+        return str(value)
+    return "'" + str(value).replace("\\", "\\\\").replace("'", "''") + "'"
+
+
+def _derived_table(rows: List[Tuple[Any, ...]], columns: Tuple[str, ...]) -> str:
+    """Inline rows as a UNION ALL derived table with named columns"""
+    selects = []
+    for i, row in enumerate(rows):
+        if i == 0:
+            values = ", ".join(f"{sql_literal(v)} AS {c}" for v, c in zip(row, columns))
+        else:
+            values = ", ".join(sql_literal(v) for v in row)
+        selects.append(f"SELECT {values}")
+    return "(" + "\n    UNION ALL ".join(selects) + ") v"
+
+
+def _batches(rows: List[Any]) -> List[List[Any]]:
+    return [rows[i:i + SQL_BATCH_ROWS] for i in range(0, len(rows), SQL_BATCH_ROWS)]
+
+
+def unroomed_meetings(normalized: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Meetings with no room, with their entry's natural keys; sql_statements skips these"""
+    return [
+        dict(m, subject_code=e["subject_code"], section_code=e["section_code"], instructor=e["instructor"])
+        for e in normalized["entries"] for m in e["meetings"] if m["room_id"] is None
+    ]
+
+
+def sql_statements(normalized: Dict[str, Any], group_id: Any) -> List[str]:
+    """Multi-row MySQL statements that save a normalized schedule into group_id.
+
+    Subjects and sections are upserted on their unique codes, missing
+    instructors are inserted by name, entries are upserted on (group,
+    subject, section), and meetings are inserted unless the entry already
+    has one at the same day and time. Ids are resolved with joins, so the
+    statements need no prior lookups. Meetings without a room (see
+    unroomed_meetings) are skipped, and so are entries left with none.
+    """
+    statements = [f"SET @group_id = {sql_literal(group_id)}"]
+    for batch in _batches(normalized["subjects"]):
+        values = ",\n    ".join(
+            f"({sql_literal(s['code'])}, {sql_literal(s['description'])}, {sql_literal(s['units'])}, NOW(), NOW())"
+            for s in batch)
+        statements.append(
+            "INSERT INTO subjects (code, description, units, created_at, updated_at) VALUES\n    "
+            f"{values}\nON DUPLICATE KEY UPDATE description = VALUES(description), units = VALUES(units), "
+            "updated_at = VALUES(updated_at)")
+    for batch in _batches(normalized["sections"]):
+        values = ",\n    ".join(
+            f"({sql_literal(s['code'])}, {sql_literal(s['year_level'])}, {sql_literal(s['department'])}, NOW(), NOW())"
+            for s in batch)
+        statements.append(
+            "INSERT INTO sections (code, year_level, department, created_at, updated_at) VALUES\n    "
+            f"{values}\nON DUPLICATE KEY UPDATE updated_at = VALUES(updated_at)")
+    for batch in _batches(normalized["instructors"]):
+        rows = [(i["name"], i["employment_type"]) for i in batch]
+        statements.append(
+            "INSERT INTO instructors (name, employment_type, is_active, created_at, updated_at)\n"
+            "SELECT v.name, v.employment_type, 1, NOW(), NOW() FROM "
+            f"{_derived_table(rows, ('name', 'employment_type'))}\n"
+            "WHERE NOT EXISTS (SELECT 1 FROM instructors i WHERE i.name = v.name)")
+
+    roomed = [(e, [m for m in e["meetings"] if m["room_id"] is not None]) for e in normalized["entries"]]
+    roomed = [(e, meetings) for e, meetings in roomed if meetings]
+    entry_rows = list(dict.fromkeys((e["subject_code"], e["section_code"]) for e, _ in roomed))
+    for batch in _batches(entry_rows):
+        statements.append(
+            "INSERT INTO schedule_entries (group_id, subject_id, section_id, status, created_at, updated_at)\n"
+            "SELECT @group_id, s.subject_id, sec.section_id, 'confirmed', NOW(), NOW() FROM "
+            f"{_derived_table(batch, ('subject_code', 'section_code'))}\n"
+            "JOIN subjects s ON s.code = v.subject_code\n"
+            "JOIN sections sec ON sec.code = v.section_code\n"
+            "ON DUPLICATE KEY UPDATE updated_at = VALUES(updated_at)")
+
+    meeting_rows = [
+        (e["subject_code"], e["section_code"], e["instructor"], m["day"], m["start_time"], m["end_time"],
+         m["room_id"], m["meeting_type"])
+        for e, meetings in roomed for m in meetings
+    ]
+    columns = ('subject_code', 'section_code', 'instructor', 'day', 'start_time', 'end_time', 'room_id', 'meeting_type')
+    for batch in _batches(meeting_rows):
+        statements.append(
+            "INSERT INTO schedule_meetings (entry_id, instructor_id, day, start_time, end_time, room_id, meeting_type, "
+            "created_at, updated_at)\n"
+            "SELECT e.entry_id, (SELECT MIN(i.instructor_id) FROM instructors i WHERE i.name = v.instructor), "
+            "v.day, v.start_time, v.end_time, v.room_id, v.meeting_type, NOW(), NOW() FROM "
+            f"{_derived_table(batch, columns)}\n"
+            "JOIN subjects s ON s.code = v.subject_code\n"
+            "JOIN sections sec ON sec.code = v.section_code\n"
+            "JOIN schedule_entries e ON e.group_id = @group_id AND e.subject_id = s.subject_id "
+            "AND e.section_id = sec.section_id\n"
+            "WHERE NOT EXISTS (SELECT 1 FROM schedule_meetings m WHERE m.entry_id = e.entry_id AND m.day = v.day "
+            "AND m.start_time = v.start_time AND m.end_time = v.end_time)")
+    return statements
+
+
+def write_sql(normalized: Dict[str, Any], group_id: Any, out) -> int:
+    """Write sql_statements wrapped in one transaction; returns the statement count"""
+    statements = sql_statements(normalized, group_id)
+    skipped = unroomed_meetings(normalized)
+    if skipped:
+        out.write(f"-- {len(skipped)} meeting(s) without a room are not saved\n")
+    out.write("START TRANSACTION;\n")
+    for statement in statements:
+        out.write(statement)
+        out.write(";\n")
+    out.write("COMMIT;\n")
+    return len(statements)
+
+
+def write_csv(normalized: Dict[str, Any], group_id: Any, out) -> int:
+    """One row per meeting with natural keys (CSV_COLUMNS); returns the row count"""
+    subjects = {s["code"]: s for s in normalized["subjects"]}
+    sections = {s["code"]: s for s in normalized["sections"]}
+    instructors = {i["name"]: i for i in normalized["instructors"]}
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(CSV_COLUMNS)
+    rows = 0
+    for entry in normalized["entries"]:
+        subject = subjects[entry["subject_code"]]
+        section = sections[entry["section_code"]]
+        employment = instructors.get(entry["instructor"], {}).get("employment_type", "")
+        for m in entry["meetings"]:
+            writer.writerow((group_id, subject["code"], subject["description"], subject["units"], section["code"],
+                             section["year_level"], section["department"], entry["instructor"], employment,
+                             m["day"], m["start_time"], m["end_time"], m["room_id"], m["meeting_type"]))
+            rows += 1
+    return rows
+
+
+BULK_WRITERS = {"sql": write_sql, "csv": write_csv}
+
+
+def apply_output_mode(result: Dict[str, Any], payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Solver-result hook for the payload keys "output" and "bulkFile".
+
+    "output": "normalized" attaches normalize_schedules(result["schedules"])
+    as result["normalized"]; the flat schedules are kept. "bulkFile":
+    {"path", "format" (sql or csv), "groupId"} also writes a bulk-load file
+    and reports it as result["bulk_file"]; for sql the meetings it could
+    not save for lack of a room are listed under "unroomed".
+    """
+    bulk = payload.get("bulkFile") if isinstance(payload.get("bulkFile"), dict) else None
+    if (payload.get("output") != "normalized" and bulk is None) or not result.get("schedules"):
+        return result
+    normalized = normalize_schedules(result["schedules"])
+    if payload.get("output") == "normalized":
+        result["normalized"] = normalized
+    if bulk is not None:
+        fmt = bulk.get("format", "sql")
+        if fmt not in BULK_WRITERS or not bulk.get("path"):
+            raise ValueError(f"bulkFile needs a path and a format of {', '.join(BULK_WRITERS)}")
+        with open(bulk["path"], "w", newline="") as handle:
+            count = BULK_WRITERS[fmt](normalized, bulk.get("groupId"), handle)
+        result["bulk_file"] = {"path": bulk["path"], "format": fmt,
+                               ("statements" if fmt == "sql" else "rows"): count,
+                               "entries": len(normalized["entries"])}
+        if fmt == "sql":
+            result["bulk_file"]["unroomed"] = unroomed_meetings(normalized)
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m PythonAlgo.export", description="Normalize schedules for bulk insert")
+    parser.add_argument("file", nargs="?", help="JSON input: schedule list or {\"schedules\": [...]} (default: stdin)")
+    parser.add_argument("--format", choices=("json",) + tuple(BULK_WRITERS), default="json")
+    parser.add_argument("--group-id", default=None, help="schedule_groups.group_id for sql/csv output")
+    parser.add_argument("--out", help="output file (default: stdout)")
+    args = parser.parse_args(argv)
+    try:
+        if args.file:
+            with open(args.file) as handle:
+                data = json.load(handle)
+        else:
+            raw = sys.stdin.read()
+            data = json.loads(raw) if raw else []
+        schedules = data if isinstance(data, list) else data.get("schedules", [])
+        normalized = normalize_schedules(schedules)
+        group_id = int(args.group_id) if args.group_id is not None and args.group_id.isdigit() else args.group_id
+        buffer = io.StringIO()
+        if args.format == "json":
+            buffer.write(json.dumps(dict(normalized, success=True)))
+            buffer.write("\n")
+        else:
+            BULK_WRITERS[args.format](normalized, group_id, buffer)
+            if args.format == "sql":
+                for m in unroomed_meetings(normalized):
+                    print(f"Skipped meeting without a room: {m['subject_code']} {m['section_code']} "
+                          f"{m['day']} {m['start_time']}-{m['end_time']}", file=sys.stderr)
+        if args.out:
+            with open(args.out, "w", newline="") as handle:
+                handle.write(buffer.getvalue())
+        else:
+            sys.stdout.write(buffer.getvalue())
+            sys.stdout.flush()
+    except Exception as e:
+        print(json.dumps({"success": False, "message": f"Export error: {e}", "errors": [str(e)]}), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import random
+from itertools import combinations
+
+from PythonAlgo.check import RESOURCE_KINDS, check_schedules, find_overlaps, repair_schedules
+
+
+def meeting(instructor: str, section: str, room_id, day: str = "Monday",
+            start: str = "08:00:00", end: str = "09:30:00") -> dict:
+    return {"instructor": instructor, "section": section, "room_id": room_id,
+            "day": day, "start_time": start, "end_time": end}
+
+
+def test_repair_moves_roomless_meetings_into_a_room():
+    schedules = [meeting("Ana", "BSIT-1st Year A", 1), meeting("Ana", "BSIT-1st Year B", None)]
+    rooms = [{"room_id": 1, "is_lab": False}, {"room_id": 2, "is_lab": False}]
+    repaired, summary = repair_schedules(schedules, rooms)
+    assert summary["moved"] == 1 and not summary["unresolved"]
+    assert repaired[1]["room_id"] in (1, 2)
+    assert check_schedules(repaired)["total_conflicts"] == 0
+
+    # Without rooms to choose from it is reported, not moved into "no room"
+    repaired, summary = repair_schedules(schedules, [])
+    assert summary["moved"] == 0
+    assert [m["section"] for m in summary["unresolved"]] == ["BSIT-1st Year B"]
+    assert repaired[1]["room_id"] is None
+
+
+def brute_force_overlaps(meetings, kind):
+    """Pairs by checking every pair; groups by merging each resource-day's chains of overlaps"""
+    key = lambda m: m["room_id"] if kind == "room" else m[kind]
+    live = [i for i, m in enumerate(meetings) if key(m) not in (None, "") and m["end"] > m["start"]]
+    pairs = sum(1 for i, j in combinations(live, 2)
+                if key(meetings[i]) == key(meetings[j]) and meetings[i]["day"] == meetings[j]["day"]
+                and meetings[i]["start"] < meetings[j]["end"] and meetings[j]["start"] < meetings[i]["end"])
+    rows = {}
+    for i in live:
+        rows.setdefault((key(meetings[i]), meetings[i]["day"]), []).append(i)
+    groups = []
+    for row in rows.values():
+        row.sort(key=lambda i: meetings[i]["start"])
+        group, reach = [], None
+        for i in row:
+            if group and meetings[i]["start"] >= reach:
+                groups.append(group)
+                group = []
+            reach = max(reach, meetings[i]["end"]) if group else meetings[i]["end"]
+            group.append(i)
+        groups.append(group)
+    return pairs, sorted(sorted(g) for g in groups if len(g) > 1)
+
+
+def test_find_overlaps_matches_brute_force():
+    rng = random.Random(4)
+    for _ in range(20):
+        meetings = []
+        for _ in range(rng.randrange(2, 60)):
+            start = rng.randrange(7 * 6, 20 * 6) * 10
+            meetings.append({
+                "instructor": rng.choice(["Ana", "Ben", "Cy", ""]),
+                "section": rng.choice(["A", "B", "C"]),
+                "room_id": rng.choice([1, 2, 3, None]),
+                "day": rng.choice(["Monday", "Tuesday", "Wednesday"]),
+                "start": start,
+                "end": start + rng.choice([0, 30, 60, 90, 180]),
+            })
+        for kind in RESOURCE_KINDS:
+            pairs, groups = find_overlaps(meetings, kind)
+            assert (pairs, sorted(sorted(g) for g in groups)) == brute_force_overlaps(meetings, kind)
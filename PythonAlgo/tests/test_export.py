@@ -0,0 +1,40 @@
+import io
+
+from PythonAlgo.export import normalize_schedules, unroomed_meetings, write_sql
+
+
+def session(subject: str, day: str, start: str, end: str, room_id) -> dict:
+    return {
+        "subject_code": subject,
+        "subject_description": f"{subject} description",
+        "unit": 3,
+        "instructor": "Instr 1",
+        "employment_type": "FULL-TIME",
+        "year_level": "1st Year",
+        "block": "A",
+        "dept": "BSIT",
+        "day": day,
+        "start_time": start,
+        "end_time": end,
+        "room_id": room_id,
+        "sessionType": "Non-Lab session",
+    }
+
+
+def test_sql_skips_meetings_without_a_room():
+    normalized = normalize_schedules([
+        session("CS101", "Mon", "08:00:00", "09:30:00", 4),
+        session("CS101", "Wed", "08:00:00", "09:30:00", None),
+        session("CS102", "Tue", "10:00:00", "11:00:00", None),
+    ])
+    skipped = unroomed_meetings(normalized)
+    assert [(m["subject_code"], m["day"]) for m in skipped] == [("CS101", "Wed"), ("CS102", "Tue")]
+
+    out = io.StringIO()
+    write_sql(normalized, 7, out)
+    sql = out.getvalue()
+    assert "NULL AS room_id" not in sql and ", NULL, 'lecture'" not in sql
+    assert "'Mon'" in sql and "'Wed'" not in sql
+    # CS102 has no roomed meeting left, so no entry is created for it
+    entries = sql.split("INSERT INTO schedule_entries")[1].split(";\n")[0]
+    assert "'CS101'" in entries and "'CS102'" not in entries
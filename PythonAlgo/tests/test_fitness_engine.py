@@ -0,0 +1,73 @@
+import random
+from dataclasses import replace
+from collections import defaultdict
+from itertools import combinations
+
+import pytest
+
+from PythonAlgo.GeneticScheduler import build_scheduler
+from PythonAlgo.TimeScheduler import times_overlap
+from PythonAlgo.tests.test_reproducibility import small_payload
+
+
+def scheduler_and_individuals(count: int = 8):
+    # More courses than the rooms and instructors comfortably hold, so random
+    # individuals carry every kind of overlap
+    scheduler = build_scheduler(dict(small_payload(courses=16), seed=5))
+    random.seed(5)
+    return scheduler, [scheduler.create_individual() for _ in range(count)]
+
+
+def pairwise_conflicts(individual) -> dict:
+    """The pre-vectorization checks: every same-day overlapping pair per resource"""
+    counts = {"instructor_conflicts": 0, "room_conflicts": 0, "section_time_overlaps": 0}
+    for a, b in combinations(individual, 2):
+        ta, tb = a.time_slot, b.time_slot
+        if ta.day != tb.day or not times_overlap(ta.start_time, ta.end_time, tb.start_time, tb.end_time):
+            continue
+        counts["instructor_conflicts"] += a.instructor.instructor_id == b.instructor.instructor_id
+        counts["room_conflicts"] += a.room.room_id == b.room.room_id
+        counts["section_time_overlaps"] += a.section == b.section
+
+    slot = lambda e: (e.time_slot.day, e.time_slot.start_time, e.time_slot.end_time)
+    counts["student_conflicts"] = len(individual) - len({(e.section,) + slot(e) for e in individual})
+    subject_slots = defaultdict(list)
+    for entry in individual:
+        subject_slots[(entry.course.course_code,) + slot(entry)].append(entry.section)
+    counts["cross_section_conflicts"] = sum(len(s) - 1 for s in subject_slots.values() if len(set(s)) > 1)
+    return counts
+
+
+def test_vectorized_conflicts_match_pairwise_detection():
+    scheduler, individuals = scheduler_and_individuals()
+    # Every session doubled, in the same section and in a second one
+    individuals.append(individuals[0] + individuals[0])
+    individuals.append(individuals[1] + [replace(e, section=e.section + " 2") for e in individuals[1]])
+    seen = defaultdict(int)
+    for individual in individuals:
+        conflicts = scheduler.detect_conflicts(individual)
+        expected = pairwise_conflicts(individual)
+        assert {key: conflicts[key] for key in expected} == expected
+        for key, value in expected.items():
+            seen[key] += value
+    assert all(seen[key] > 0 for key in seen)
+
+
+def test_fitness_state_deltas_match_full_evaluation():
+    scheduler, individuals = scheduler_and_individuals(count=2)
+    engine = scheduler.fitness_engine
+    operators = [scheduler.mutate_time, scheduler.mutate_room, scheduler.mutate_swap_time,
+                 scheduler.mutate_swap_room, scheduler.mutate_add_session, scheduler.mutate_remove_session,
+                 scheduler.mutate_relocate_conflict]
+    rng = random.Random(9)
+    for individual in individuals:
+        state = scheduler.fitness_state(individual)
+        for step in range(300):
+            rng.choice(operators)(state)
+            if step % 10 == 0:
+                state = state.copy()
+            fitness, conflicts, penalties = engine.evaluate(state.entries)
+            assert state.conflicts == conflicts
+            assert state.penalties() == pytest.approx(penalties)
+            assert state.fitness() == pytest.approx(fitness)
+            assert state.hard_conflicts() == scheduler.hard_conflicts(state.entries)
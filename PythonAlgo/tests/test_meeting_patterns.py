@@ -0,0 +1,50 @@
+from PythonAlgo.Scheduler import solve_with_cp_sat
+from PythonAlgo.check import check_schedules
+
+
+def one_section_payload(courses: int, unit: int) -> dict:
+    return {
+        "instructorData": [
+            {
+                "name": f"Instr {i}",
+                "courseCode": f"CS{109 + i}",
+                "subject": f"Subject {i}",
+                "unit": unit,
+                "yearLevel": "4th Year",
+                "block": "B",
+                "employmentType": "FULL-TIME",
+                "dept": "BSIT",
+                "sessionType": "Non-Lab session",
+            }
+            for i in range(courses)
+        ],
+        "rooms": [
+            {"room_id": i, "room_name": f"R{i}", "capacity": 50, "is_lab": False, "is_active": True}
+            for i in range(1, 5)
+        ],
+    }
+
+
+def test_section_with_four_two_session_courses():
+    # 4 units are two 2h sessions; no 2h slot starts at 13:00, so they sit in
+    # longer slots that must not block the section's later starts
+    for staged in (False, True):
+        payload = dict(one_section_payload(4, 4), meetingPatterns=True, staged=staged)
+        result = solve_with_cp_sat(payload, time_limit=10)
+        assert result["success"], result["message"]
+        assert "without meeting patterns" not in result["message"]
+        assert len(result["schedules"]) == 8
+        assert check_schedules(result["schedules"])["section"]["pairs"] == 0
+        days = {}
+        for entry in result["schedules"]:
+            days.setdefault(entry["subject_code"], []).append(entry["day"])
+        assert all(len(set(d)) == len(d) for d in days.values())
+
+
+def test_infeasible_patterns_fall_back_to_session_slots():
+    # Eight 2h + 1h courses in one section fit only with a slot per session
+    result = solve_with_cp_sat(dict(one_section_payload(8, 3), meetingPatterns=True), time_limit=10)
+    assert result["success"], result["message"]
+    assert result["message"].endswith("(without meeting patterns)")
+    assert len(result["schedules"]) == 16
+    assert check_schedules(result["schedules"])["section"]["pairs"] == 0
@@ -0,0 +1,34 @@
+from PythonAlgo.Scheduler import solve_with_cp_sat
+from PythonAlgo.check import check_schedules
+
+
+def payload_with_unroomable_courses() -> dict:
+    # 4+ unit non-lab courses expect 40 students, more than any non-lab room
+    # holds, so the pooled assignment leaves them to the fallback
+    return {
+        "instructorData": [
+            {
+                "name": f"Instr {i % 6}",
+                "courseCode": f"CS{100 + i}",
+                "subject": f"Subject {i}",
+                "unit": (3, 6, 3, 4)[i % 4],
+                "yearLevel": ("1st Year", "2nd Year", "3rd Year")[i % 3],
+                "block": "AB"[(i // 3) % 2],
+                "employmentType": "FULL-TIME",
+                "dept": "BSIT",
+                "sessionType": "Lab session" if i % 5 == 0 else "Non-Lab session",
+            }
+            for i in range(18)
+        ],
+        "rooms": [{"room_id": 1, "room_name": "R1", "capacity": 50, "is_lab": True, "is_active": True}] + [
+            {"room_id": i, "room_name": f"R{i}", "capacity": 30, "is_lab": False, "is_active": True}
+            for i in (2, 3, 4)
+        ],
+    }
+
+
+def test_fallback_rooms_never_double_book():
+    for room_pools in (True, False):
+        result = solve_with_cp_sat(dict(payload_with_unroomable_courses(), roomPools=room_pools), time_limit=5)
+        assert result["success"]
+        assert check_schedules(result["schedules"])["room"]["pairs"] == 0